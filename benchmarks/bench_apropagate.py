@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark for driving many analyses from one event loop with ainvoke.
+
+Runs the full graph for N tickers with a stub chat model that answers after a
+fixed delay (standing in for LLM latency) and stub tools, once as a loop of
+graph.invoke calls and once as asyncio.gather over graph.ainvoke, and checks
+that both leave the same decisions behind.
+
+Usage:
+    python benchmarks/bench_apropagate.py [--tickers 8] [--llm-delay 0.05] [--tool-delay 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import StructuredTool
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.tool_node import ConcurrentToolNode
+
+# first tool each analyst binds with online_tools on
+ANALYST_TOOLS = {
+    "market": "get_YFin_data_online",
+    "social": "get_stock_news_openai",
+    "news": "get_global_news_openai",
+    "fundamentals": "get_fundamentals_openai",
+}
+
+
+class DelayedLLM:
+    """Chat model stand-in: analysts call one tool then report, every call takes delay seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    @staticmethod
+    def _analyst_reply(prompt, tool_name):
+        last = prompt.to_messages()[-1]
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"report on {last.content}")
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": tool_name, "args": {}, "id": f"call_{tool_name}"}],
+        )
+
+    def bind_tools(self, tools):
+        tool_name = tools[0].name
+
+        def respond(prompt):
+            time.sleep(self.delay)
+            return self._analyst_reply(prompt, tool_name)
+
+        async def arespond(prompt):
+            await asyncio.sleep(self.delay)
+            return self._analyst_reply(prompt, tool_name)
+
+        return RunnableLambda(respond, afunc=arespond)
+
+    def invoke(self, prompt):
+        time.sleep(self.delay)
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+
+class NoMemory:
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+    async def aget_memories(self, current_situation, n_matches=1):
+        return []
+
+
+def delayed_tool(name, delay):
+    def run():
+        time.sleep(delay)
+        return f"{name} data"
+
+    async def arun():
+        await asyncio.sleep(delay)
+        return f"{name} data"
+
+    return StructuredTool.from_function(
+        run, coroutine=arun, name=name, description=f"stub for {name}"
+    )
+
+
+def build_graph(llm_delay, tool_delay):
+    llm = DelayedLLM(llm_delay)
+    tool_nodes = {
+        analyst: ConcurrentToolNode([delayed_tool(name, tool_delay)])
+        for analyst, name in ANALYST_TOOLS.items()
+    }
+    memory = NoMemory()
+    setup = GraphSetup(
+        llm, llm, Toolkit(config={"online_tools": True}), tool_nodes,
+        memory, memory, memory, memory, memory, ConditionalLogic(),
+    )
+    return setup.setup_graph(list(ANALYST_TOOLS))
+
+
+def run_sync(graph, tickers, trade_date):
+    propagator = Propagator()
+    return [
+        graph.invoke(
+            propagator.create_initial_state(ticker, trade_date), **propagator.get_graph_args()
+        )
+        for ticker in tickers
+    ]
+
+
+async def run_async(graph, tickers, trade_date):
+    propagator = Propagator()
+    return await asyncio.gather(
+        *(
+            graph.ainvoke(
+                propagator.create_initial_state(ticker, trade_date),
+                **propagator.get_graph_args(),
+            )
+            for ticker in tickers
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=8, help="number of analyses to run")
+    parser.add_argument("--llm-delay", type=float, default=0.05, help="seconds per LLM call")
+    parser.add_argument("--tool-delay", type=float, default=0.05, help="seconds per tool call")
+    args = parser.parse_args()
+
+    graph = build_graph(args.llm_delay, args.tool_delay)
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+
+    start = time.perf_counter()
+    sync_states = run_sync(graph, tickers, "2024-05-10")
+    sync_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    async_states = asyncio.run(run_async(graph, tickers, "2024-05-10"))
+    async_time = time.perf_counter() - start
+
+    for sync_state, async_state in zip(sync_states, async_states):
+        assert sync_state["company_of_interest"] == async_state["company_of_interest"]
+        assert sync_state["final_trade_decision"] == async_state["final_trade_decision"]
+
+    print(f"{'mode':<16}{'total (s)':>12}{'per ticker (s)':>16}")
+    print(f"{'invoke loop':<16}{sync_time:>12.3f}{sync_time / len(tickers):>16.3f}")
+    print(f"{'ainvoke gather':<16}{async_time:>12.3f}{async_time / len(tickers):>16.3f}")
+    print(f"speedup: {sync_time / async_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for get_stock_stats_indicators_window.
+
+Compares the old day-by-day path (one get_stockstats_indicator call, i.e. one
+full indicator recomputation, per trading day in the window) against the
+single-pass window, and checks that both produce the same string.
+
+Usage:
+    python benchmarks/bench_indicator_window.py [--data-dir DIR] [--symbol AAPL]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from datetime import datetime
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tradingagents.dataflows.interface as interface
+
+
+def make_synthetic_prices(data_dir, symbol, start="2015-01-01", end="2025-03-25"):
+    """Write a random-walk YFin CSV for symbol under data_dir."""
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+    os.makedirs(price_dir, exist_ok=True)
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start, end)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close * 0.99,
+            "High": close * 1.01,
+            "Low": close * 0.98,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(1_000_000, 5_000_000, len(dates)),
+        }
+    ).to_csv(
+        os.path.join(price_dir, f"{symbol}-YFin-data-{start}-{end}.csv"), index=False
+    )
+
+
+def day_by_day_window(symbol, indicator, curr_date, look_back_days):
+    """The pre-batch window body: one indicator lookup per trading day."""
+    end_date = curr_date
+    curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = curr_date - relativedelta(days=look_back_days)
+    series = interface._price_store().series(symbol)
+
+    ind_string = ""
+    while curr_date >= before:
+        if series.has_date(curr_date.strftime("%Y-%m-%d")):
+            indicator_value = interface.get_stockstats_indicator(
+                symbol, indicator, curr_date.strftime("%Y-%m-%d"), False
+            )
+            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+        curr_date = curr_date - relativedelta(days=1)
+
+    return ind_string
+
+
+def time_call(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-dir", help="existing DATA_DIR; synthetic data if omitted")
+    parser.add_argument("--symbol", default="AAPL")
+    parser.add_argument("--curr-date", default="2024-03-01")
+    parser.add_argument("--look-back-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix="bench_indicator_window_")
+        make_synthetic_prices(data_dir, args.symbol)
+    interface.DATA_DIR = data_dir
+
+    # build the price store outside of the timed region
+    interface._price_store().series(args.symbol)
+
+    print(f"{'indicator':<14}{'day-by-day (s)':>16}{'batch (s)':>12}{'speedup':>10}")
+    for indicator in ["close_50_sma", "macd", "rsi", "boll_ub", "atr", "vwma"]:
+        legacy, legacy_time = time_call(
+            lambda: day_by_day_window(
+                args.symbol, indicator, args.curr_date, args.look_back_days
+            ),
+            args.repeat,
+        )
+        batch, batch_time = time_call(
+            lambda: interface.get_stock_stats_indicators_window(
+                args.symbol, indicator, args.curr_date, args.look_back_days, False
+            ),
+            args.repeat,
+        )
+        assert legacy in batch, f"{indicator}: batch output differs from day-by-day"
+        print(
+            f"{indicator:<14}{legacy_time:>16.4f}{batch_time:>12.4f}{legacy_time / batch_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the parallel analyst topology of GraphSetup.setup_graph.
+
+Runs the full graph with a stub chat model that answers after a fixed delay
+(standing in for LLM latency) and stub tools, once with the analysts in
+sequence and once with each analyst in its own branch, and checks that both
+leave the same reports behind.
+
+Usage:
+    python benchmarks/bench_parallel_analysts.py [--llm-delay 0.2] [--tool-delay 0.1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import ToolNode
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import ANALYST_REPORT_KEYS, GraphSetup
+
+# first tool each analyst binds with online_tools on
+ANALYST_TOOLS = {
+    "market": "get_YFin_data_online",
+    "social": "get_stock_news_openai",
+    "news": "get_global_news_openai",
+    "fundamentals": "get_fundamentals_openai",
+}
+
+
+class DelayedLLM:
+    """Chat model stand-in: analysts call one tool then report, every call takes delay seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def bind_tools(self, tools):
+        tool_name = tools[0].name
+
+        def respond(prompt):
+            time.sleep(self.delay)
+            last = prompt.to_messages()[-1]
+            if isinstance(last, ToolMessage):
+                return AIMessage(content=f"report on {last.content}")
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": tool_name, "args": {}, "id": f"call_{tool_name}"}],
+            )
+
+        return RunnableLambda(respond)
+
+    def invoke(self, prompt):
+        time.sleep(self.delay)
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+
+class NoMemory:
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+
+def delayed_tool(name, delay):
+    def run():
+        time.sleep(delay)
+        return f"{name} data"
+
+    return StructuredTool.from_function(run, name=name, description=f"stub for {name}")
+
+
+def build_graph(parallel_analysts, llm_delay, tool_delay):
+    llm = DelayedLLM(llm_delay)
+    tool_nodes = {
+        analyst: ToolNode([delayed_tool(name, tool_delay)])
+        for analyst, name in ANALYST_TOOLS.items()
+    }
+    memory = NoMemory()
+    setup = GraphSetup(
+        llm, llm, Toolkit(config={"online_tools": True}), tool_nodes,
+        memory, memory, memory, memory, memory, ConditionalLogic(),
+    )
+    return setup.setup_graph(list(ANALYST_TOOLS), parallel_analysts=parallel_analysts)
+
+
+def time_runs(graph, repeat):
+    propagator = Propagator()
+    timings = []
+    state = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        state = graph.invoke(
+            propagator.create_initial_state("NVDA", "2024-05-10"),
+            **propagator.get_graph_args(),
+        )
+        timings.append(time.perf_counter() - start)
+    return state, float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--llm-delay", type=float, default=0.2, help="seconds per LLM call")
+    parser.add_argument("--tool-delay", type=float, default=0.1, help="seconds per tool call")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sequential, sequential_time = time_runs(
+        build_graph(False, args.llm_delay, args.tool_delay), args.repeat
+    )
+    parallel, parallel_time = time_runs(
+        build_graph(True, args.llm_delay, args.tool_delay), args.repeat
+    )
+    for key in ANALYST_REPORT_KEYS.values():
+        assert sequential[key] == parallel[key], f"{key} differs between topologies"
+    assert sequential["final_trade_decision"] == parallel["final_trade_decision"]
+
+    print(f"{'topology':<12}{'propagate (s)':>15}")
+    print(f"{'sequential':<12}{sequential_time:>15.3f}")
+    print(f"{'parallel':<12}{parallel_time:>15.3f}")
+    print(f"speedup: {sequential_time / parallel_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for TradingAgentsGraph.propagate_many over a ticker x date grid.
+
+Builds the real TradingAgentsGraph with a stub chat model that answers after a
+fixed delay (standing in for LLM latency) and no memory lookups, then runs
+the grid once as a propagate loop and once through propagate_many, and prints
+the batch's throughput stats.
+
+Usage:
+    python benchmarks/bench_propagate_many.py [--tickers 4] [--dates 2] [--concurrency 4] [--llm-delay 0.05]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pandas as pd
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tradingagents.graph.trading_graph as trading_graph
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+class DelayedLLM:
+    """Chat model stand-in: every call takes delay seconds and answers without tool calls."""
+
+    delay = 0.05
+
+    def __init__(self, model=None, base_url=None):
+        pass
+
+    def _reply(self, prompt):
+        time.sleep(self.delay)
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **HOLD**")
+
+    def bind_tools(self, tools):
+        return RunnableLambda(self._reply)
+
+    def invoke(self, prompt):
+        text = prompt if isinstance(prompt, str) else str(prompt)
+        if "extract the investment decision" in text:
+            time.sleep(self.delay)
+            return AIMessage(content="HOLD")
+        return self._reply(prompt)
+
+
+class NoMemory:
+    def __init__(self, name=None, config=None):
+        pass
+
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=4)
+    parser.add_argument("--dates", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-delay", type=float, default=0.05, help="seconds per LLM call")
+    args = parser.parse_args()
+
+    DelayedLLM.delay = args.llm_delay
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+    dates = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2024-05-06", periods=args.dates)]
+
+    os.chdir(tempfile.mkdtemp())  # eval_results goes here
+    with patch.object(trading_graph, "ChatOpenAI", DelayedLLM), patch.object(
+        trading_graph, "FinancialSituationMemory", NoMemory
+    ):
+        graph = trading_graph.TradingAgentsGraph(config=DEFAULT_CONFIG.copy())
+
+    start = time.perf_counter()
+    for trade_date in dates:
+        for ticker in tickers:
+            graph.propagate(ticker, trade_date)
+    loop_time = time.perf_counter() - start
+
+    batch = graph.propagate_many(tickers, dates, max_concurrency=args.concurrency)
+    results = list(batch)
+    assert all(result["decision"] == "HOLD" for result in results)
+    stats = batch.stats()
+
+    jobs = len(tickers) * len(dates)
+    print(f"{'mode':<16}{'total (s)':>12}{'jobs/s':>10}")
+    print(f"{'propagate loop':<16}{loop_time:>12.3f}{jobs / loop_time:>10.2f}")
+    print(f"{'propagate_many':<16}{stats['elapsed_seconds']:>12.3f}{stats['jobs_per_second']:>10.2f}")
+    print(f"speedup: {loop_time / stats['elapsed_seconds']:.2f}x "
+          f"(mean job {stats['mean_job_seconds']:.3f}s at concurrency {args.concurrency})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite over a synthetic DATA_DIR.
+
+Generates a synthetic offline dataset (see synthetic_data.py), times every
+public function of dataflows/interface.py on random tickers and dates, then
+runs full propagate calls through TradingAgentsGraph on the offline "fake"
+LLM provider. The functions that go to the network (Google News, online
+Yahoo Finance, OpenAI web search) are listed as skipped.
+
+The report is written as JSON with latency percentiles per function and per
+propagate, per-function call counts of each phase, the peak RSS after each
+phase and the git commit, so two runs can be compared with --compare.
+
+Usage:
+    python benchmarks/bench_suite.py [--tickers 10] [--days 260] [--iterations 50] [--propagate-runs 3]
+        [--data-dir DIR] [--output bench_report.json] [--compare OLD_REPORT.json] [--threshold 0.2]
+
+A comparison exits with status 1 when any p50 got slower by more than
+--threshold (relative) and --min-delta-ms (absolute).
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+from synthetic_data import generate_data_dir
+
+REPORT_VERSION = 1
+
+# interface functions that need the network, never timed here
+ONLINE_FUNCTIONS = {
+    "get_google_news": "scrapes Google News",
+    "get_YFin_data_online": "downloads from Yahoo Finance",
+    "get_stock_news_openai": "OpenAI web search",
+    "get_global_news_openai": "OpenAI web search",
+    "get_fundamentals_openai": "OpenAI web search",
+}
+
+# arguments of one call, from a ticker and a trading date that has a month of history before it
+CASES = {
+    "get_finnhub_news": lambda ticker, date: (ticker, date, 7),
+    "get_finnhub_company_insider_sentiment": lambda ticker, date: (ticker, date, 30),
+    "get_finnhub_company_insider_transactions": lambda ticker, date: (ticker, date, 30),
+    "get_simfin_balance_sheet": lambda ticker, date: (ticker, "quarterly", date),
+    "get_simfin_cashflow": lambda ticker, date: (ticker, "quarterly", date),
+    "get_simfin_income_statements": lambda ticker, date: (ticker, "annual", date),
+    "get_reddit_global_news": lambda ticker, date: (date, 7, 5),
+    "get_reddit_company_news": lambda ticker, date: (ticker, date, 7, 5),
+    "get_stock_stats_indicators_window": lambda ticker, date: (ticker, "rsi", date, 30, False),
+    "get_stockstats_indicator": lambda ticker, date: (ticker, "macd", date, False),
+    "get_stockstats_indicator_window": lambda ticker, date: (ticker, "boll", [date], False),
+    "get_YFin_data_window": lambda ticker, date: (ticker, date, 30),
+    "get_YFin_data": lambda ticker, date: (ticker, "2000-01-01", date),
+}
+
+
+def public_functions():
+    """Names of the functions defined (not imported) in dataflows/interface.py."""
+    return sorted(
+        name
+        for name, func in inspect.getmembers(interface, inspect.isfunction)
+        if func.__module__ == interface.__name__ and not name.startswith("_")
+    )
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def latency_summary(seconds):
+    """Percentiles of a list of call durations, in milliseconds."""
+    if not seconds:
+        return {"calls": 0}
+    ms = np.asarray(seconds) * 1000.0
+    return {
+        "calls": len(ms),
+        "first_ms": float(ms[0]),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def git_revision():
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+class CallRecorder:
+    """Wraps the interface functions to count and time every call, per phase.
+
+    The agents' tools call the functions through the interface module, so
+    the calls made inside propagate are counted as well, and so are calls
+    of one interface function from another.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.phase = None
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def _wrap(self, name, func):
+        @functools.wraps(func)
+        def recorded(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                with self._lock:
+                    self.calls.setdefault(self.phase, {}).setdefault(name, []).append(seconds)
+
+        return recorded
+
+    def patches(self):
+        return [
+            patch.object(interface, name, self._wrap(name, getattr(interface, name)))
+            for name in self.names
+        ]
+
+    def seconds(self, phase, name):
+        with self._lock:
+            return list(self.calls.get(phase, {}).get(name, []))
+
+    def counts(self, phase):
+        with self._lock:
+            return {name: len(seconds) for name, seconds in sorted(self.calls.get(phase, {}).items())}
+
+
+def bench_functions(recorder, tickers, dates, iterations, rng):
+    """Call every offline interface function iterations times on random tickers and dates."""
+    recorder.phase = "functions"
+    results, errors = {}, {}
+    for name in recorder.names:
+        if name in ONLINE_FUNCTIONS:
+            results[name] = {"skipped": ONLINE_FUNCTIONS[name]}
+            continue
+        if name not in CASES:
+            results[name] = {"skipped": "no benchmark case"}
+            continue
+        # timed here rather than by the recorder, which also sees the nested calls
+        seconds, output_bytes = [], 0
+        for _ in range(iterations):
+            args = CASES[name](str(rng.choice(tickers)), str(rng.choice(dates)))
+            started = time.perf_counter()
+            try:
+                output = getattr(interface, name)(*args)
+            except Exception as e:
+                output = ""
+                errors.setdefault(name, repr(e))
+            seconds.append(time.perf_counter() - started)
+            output_bytes += len(str(output))
+        results[name] = latency_summary(seconds)
+        results[name]["mean_output_bytes"] = output_bytes // iterations
+        if name in errors:
+            results[name]["error"] = errors[name]
+    return results
+
+
+def bench_propagate(recorder, config, analysts, tickers, dates, runs, rng):
+    """Full propagate calls on the fake provider; the graph is built once."""
+    recorder.phase = "propagate"
+    started = time.perf_counter()
+    graph = TradingAgentsGraph(analysts, config=config)
+    setup_seconds = time.perf_counter() - started
+
+    seconds, decisions = [], {}
+    for _ in range(runs):
+        ticker, date = str(rng.choice(tickers)), str(rng.choice(dates))
+        started = time.perf_counter()
+        _, decision = graph.propagate(ticker, date)
+        seconds.append(time.perf_counter() - started)
+        decisions[f"{ticker} {date}"] = decision
+
+    llm_calls = graph.deep_thinking_llm.calls + graph.quick_thinking_llm.calls
+    return {
+        "analysts": list(analysts),
+        "graph_setup_seconds": setup_seconds,
+        "latency": latency_summary(seconds),
+        "llm_calls_per_run": llm_calls / max(runs, 1),
+        "tool_calls_per_run": sum(recorder.counts("propagate").values()) / max(runs, 1),
+        "functions": {
+            name: latency_summary(recorder.seconds("propagate", name)) for name in recorder.counts("propagate")
+        },
+        "decisions": decisions,
+    }
+
+
+def compare_reports(old, new, threshold, min_delta_ms):
+    """Print p50 changes between two reports; returns the names that got slower than threshold.
+
+    Slowdowns under min_delta_ms are left out, sub-millisecond p50s are mostly noise.
+    """
+    rows = [
+        (name, old["functions"].get(name, {}).get("p50_ms"), result.get("p50_ms"))
+        for name, result in new["functions"].items()
+    ]
+    rows.append(("propagate", old["propagate"]["latency"].get("p50_ms"), new["propagate"]["latency"].get("p50_ms")))
+
+    print(f"\ncompared with {old['git']['commit']} ({old['created_at']})")
+    scale = ("tickers", "days", "news_per_day", "posts_per_day", "iterations", "analysts", "llm_latency", "seed")
+    changed = [key for key in scale if old["args"].get(key) != new["args"].get(key)]
+    if changed:
+        print(f"warning: the runs differ in {', '.join(changed)}")
+    print(f"{'function':<44}{'old p50 ms':>12}{'new p50 ms':>12}{'change':>9}")
+    regressions = []
+    for name, before, after in rows:
+        if before is None or after is None:
+            continue
+        change = after / before - 1.0 if before > 0 else 0.0
+        flag = ""
+        if change > threshold and after - before > min_delta_ms:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<44}{before:>12.3f}{after:>12.3f}{change:>+9.1%}{flag}")
+    print(f"peak RSS: {old['peak_rss_mb']['total']:.1f} MB -> {new['peak_rss_mb']['total']:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=10)
+    parser.add_argument("--days", type=int, default=260, help="trading days of synthetic history")
+    parser.add_argument("--news-per-day", type=int, default=3)
+    parser.add_argument("--posts-per-day", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=50, help="calls per interface function")
+    parser.add_argument("--propagate-runs", type=int, default=3)
+    parser.add_argument(
+        "--analysts",
+        default="market,social,fundamentals",
+        help="the news analyst's offline tools include Google News, so it is left out by default",
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per fake LLM call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="reuse a generated DATA_DIR instead of a fresh one")
+    parser.add_argument("--output", default="bench_report.json")
+    parser.add_argument("--compare", help="earlier report to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50 slowdown counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="smallest p50 slowdown counted as a regression")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+    compare = os.path.abspath(args.compare) if args.compare else None
+
+    work_dir = tempfile.mkdtemp()
+    os.chdir(work_dir)  # eval_results goes here
+    data_dir = args.data_dir or os.path.join(work_dir, "data")
+    data = generate_data_dir(
+        data_dir, args.tickers, args.days, news_per_day=args.news_per_day,
+        posts_per_day=args.posts_per_day, seed=args.seed,
+    ) if not args.data_dir else {"data_dir": data_dir}
+    if args.data_dir:
+        price_dir = os.path.join(data_dir, "market_data", "price_data")
+        data["tickers"] = sorted(name.split("-YFin-data-")[0] for name in os.listdir(price_dir))
+    print(f"synthetic data in {data_dir}: {data.get('files', '?')} files, {data.get('bytes', 0) / 1e6:.1f} MB")
+
+    # trade dates with a month of price history before them, and a few days after
+    first_date, last_date = interface.get_price_store(
+        os.path.join(data_dir, "market_data", "price_data")
+    ).date_range(data["tickers"][0])
+    trade_dates = [
+        d.strftime("%Y-%m-%d")
+        for d in np.arange(np.datetime64(first_date) + 45, np.datetime64(last_date) - 5).astype("M8[D]").astype(object)
+        if d.weekday() < 5
+    ]
+
+    config = DEFAULT_CONFIG.copy()
+    config.update(
+        llm_provider="fake",
+        online_tools=False,
+        data_dir=data_dir,
+        data_cache_dir=os.path.join(work_dir, "cache"),
+        fake_llm_seed=args.seed,
+        fake_deep_llm_latency={"seconds": args.llm_latency},
+        fake_quick_llm_latency={"seconds": args.llm_latency},
+    )
+    rng = np.random.default_rng(args.seed)
+    recorder = CallRecorder(public_functions())
+    rss = {"start": peak_rss_mb()}
+
+    started = time.perf_counter()
+    # interface binds DATA_DIR at import, set_config does not reach it
+    with patch.object(interface, "DATA_DIR", data_dir):
+        for p in recorder.patches():
+            p.start()
+        try:
+            functions = bench_functions(recorder, data["tickers"], trade_dates, args.iterations, rng)
+            rss["functions"] = peak_rss_mb()
+            propagate = bench_propagate(
+                recorder, config, args.analysts.split(","), data["tickers"], trade_dates, args.propagate_runs, rng
+            )
+            rss["propagate"] = peak_rss_mb()
+        finally:
+            patch.stopall()
+    rss["total"] = peak_rss_mb()
+
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": vars(args),
+        "data": data,
+        "functions": functions,
+        "propagate": propagate,
+        "call_counts": {phase: recorder.counts(phase) for phase in ("functions", "propagate")},
+        "peak_rss_mb": rss,
+        "seconds": time.perf_counter() - started,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'function':<44}{'calls':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, result in functions.items():
+        if "skipped" in result:
+            print(f"{name:<44}{'skipped: ' + result['skipped']:>47}")
+            continue
+        print(
+            f"{name:<44}{result['calls']:>7}{result['p50_ms']:>10.3f}{result['p90_ms']:>10.3f}"
+            f"{result['p99_ms']:>10.3f}{result['max_ms']:>10.3f}" + ("  ERROR" if "error" in result else "")
+        )
+    latency = propagate["latency"]
+    print(
+        f"propagate ({','.join(propagate['analysts'])}): p50 {latency['p50_ms']:.1f} ms, max {latency['max_ms']:.1f} ms, "
+        f"{propagate['tool_calls_per_run']:.0f} tool calls and {propagate['llm_calls_per_run']:.0f} LLM calls per run"
+    )
+    print(f"peak RSS {rss['total']:.1f} MB, report written to {output}")
+
+    if compare:
+        with open(compare) as f:
+            regressions = compare_reports(json.load(f), report, args.threshold, args.min_delta_ms)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Synthetic offline DATA_DIR for the benchmarks.
+
+Writes every dataset the offline tools in dataflows/interface.py read, laid
+out the way the data fetchers lay them out, with seeded random contents:
+
+    market_data/price_data/{SYM}-YFin-data-{start}-{end}.csv
+    finnhub_data/{news_data,insider_senti,insider_trans}/{SYM}_data_formatted.json
+    reddit_data/{global_news,company_news}/{subreddit}.jsonl
+    fundamental_data/simfin_data_all/{statement}/companies/us/us-{kind}-{freq}.csv
+
+Tickers are taken from reddit_utils.ticker_to_company first, so company news
+is matched by company name as in the real dumps, then made up (SYN000, ...).
+
+Usage:
+    python benchmarks/synthetic_data.py DIR [--tickers 10] [--days 260] [--end 2024-06-28]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tradingagents.dataflows.reddit_utils import ticker_to_company
+
+SIMFIN_STATEMENTS = {
+    # statement directory: (file kind, line items)
+    "balance_sheet": ("balance", ["Total Current Assets", "Total Assets", "Total Liabilities", "Total Equity"]),
+    "cash_flow": ("cashflow", ["Net Cash from Operating Activities", "Net Cash from Investing Activities", "Net Change in Cash"]),
+    "income_statements": ("income", ["Revenue", "Cost of Revenue", "Gross Profit", "Operating Income (Loss)", "Net Income"]),
+}
+SUBREDDITS = {
+    "global_news": ["worldnews", "economics"],
+    "company_news": ["stocks", "investing"],
+}
+WORDS = (
+    "earnings guidance demand supply margin outlook upgrade downgrade rally selloff "
+    "inflation rates chips cloud retail consumer regulators merger buyback dividend"
+).split()
+
+
+def synthetic_tickers(n):
+    """n tickers, the known companies first."""
+    known = list(ticker_to_company)[:n]
+    return known + [f"SYN{i:03d}" for i in range(n - len(known))]
+
+
+def company_name(ticker):
+    return ticker_to_company.get(ticker, ticker).split(" OR ")[0].strip()
+
+
+def _sentence(rng, n_words):
+    return " ".join(rng.choice(WORDS, n_words))
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+
+def write_prices(data_dir, ticker, dates, rng):
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+    os.makedirs(price_dir, exist_ok=True)
+    close = rng.uniform(20, 400) * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+    spread = close * rng.uniform(0.002, 0.02, len(dates))
+    frame = pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close + rng.normal(0, 0.5, len(dates)) * spread,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Adj Close": close * 0.99,
+            "Volume": rng.integers(100_000, 50_000_000, len(dates)),
+        }
+    )
+    start, end = dates[0].strftime("%Y-%m-%d"), dates[-1].strftime("%Y-%m-%d")
+    frame.round(4).to_csv(os.path.join(price_dir, f"{ticker}-YFin-data-{start}-{end}.csv"), index=False)
+
+
+def write_finnhub(data_dir, ticker, days, news_per_day, rng):
+    name = company_name(ticker)
+    news, sentiment, transactions = {}, {}, {}
+    for day in days:
+        date = day.strftime("%Y-%m-%d")
+        news[date] = [
+            {
+                "headline": f"{name} {_sentence(rng, 6)}",
+                "summary": f"{name} ({ticker}) {_sentence(rng, 30)}.",
+            }
+            for _ in range(rng.poisson(news_per_day))
+        ]
+        if day.day == 1:
+            sentiment[date] = [
+                {
+                    "symbol": ticker,
+                    "year": day.year,
+                    "month": day.month,
+                    "change": int(rng.integers(-50_000, 50_000)),
+                    "mspr": round(float(rng.uniform(-100, 100)), 4),
+                }
+            ]
+        transactions[date] = [
+            {
+                "filingDate": date,
+                "name": f"Insider {int(rng.integers(1, 20))}",
+                "change": int(rng.integers(-20_000, 20_000)),
+                "share": int(rng.integers(1_000, 500_000)),
+                "transactionPrice": round(float(rng.uniform(10, 400)), 2),
+                "transactionCode": str(rng.choice(["S", "P", "M", "F"])),
+            }
+            for _ in range(int(rng.random() < 0.2))
+        ]
+    for data_type, data in (("news_data", news), ("insider_senti", sentiment), ("insider_trans", transactions)):
+        path = os.path.join(data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json")
+        _write_json(path, data)
+
+
+def write_reddit(data_dir, tickers, days, posts_per_day, rng):
+    for category, subreddits in SUBREDDITS.items():
+        category_dir = os.path.join(data_dir, "reddit_data", category)
+        os.makedirs(category_dir, exist_ok=True)
+        for subreddit in subreddits:
+            with open(os.path.join(category_dir, f"{subreddit}.jsonl"), "w") as f:
+                for day in days:
+                    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+                    for i in range(rng.poisson(posts_per_day)):
+                        title = _sentence(rng, 8)
+                        if category == "company_news":
+                            title = f"{company_name(str(rng.choice(tickers)))} {title}"
+                        created = midnight + timedelta(seconds=int(rng.integers(0, 86400)))
+                        post = {
+                            "created_utc": created.timestamp(),
+                            "title": title,
+                            "selftext": _sentence(rng, int(rng.integers(0, 60))),
+                            "url": f"https://reddit.com/r/{subreddit}/{day:%Y%m%d}_{i}",
+                            "ups": int(rng.pareto(1.5) * 10),
+                        }
+                        f.write(json.dumps(post) + "\n")
+
+
+def write_simfin(data_dir, tickers, first_day, last_day, rng):
+    """Annual and quarterly statements, published about 5 weeks after each period end."""
+    periods = {
+        "annual": pd.date_range(first_day - pd.DateOffset(years=3), last_day, freq="YE"),
+        "quarterly": pd.date_range(first_day - pd.DateOffset(years=1), last_day, freq="QE"),
+    }
+    for statement, (kind, items) in SIMFIN_STATEMENTS.items():
+        out_dir = os.path.join(data_dir, "fundamental_data", "simfin_data_all", statement, "companies", "us")
+        os.makedirs(out_dir, exist_ok=True)
+        for freq, report_dates in periods.items():
+            rows = []
+            for simfin_id, ticker in enumerate(tickers, start=1000):
+                scale = rng.uniform(1e8, 1e11)
+                for report_date in report_dates:
+                    row = {
+                        "Ticker": ticker,
+                        "SimFinId": simfin_id,
+                        "Currency": "USD",
+                        "Fiscal Year": report_date.year,
+                        "Fiscal Period": "FY" if freq == "annual" else f"Q{report_date.quarter}",
+                        "Report Date": report_date.strftime("%Y-%m-%d"),
+                        "Publish Date": (report_date + pd.Timedelta(days=int(rng.integers(25, 45)))).strftime("%Y-%m-%d"),
+                        "Restated Date": (report_date + pd.Timedelta(days=400)).strftime("%Y-%m-%d"),
+                        "Shares (Basic)": int(scale / 100),
+                    }
+                    row.update({item: round(float(scale * rng.uniform(-0.2, 1.0)), 0) for item in items})
+                    rows.append(row)
+            pd.DataFrame(rows).to_csv(os.path.join(out_dir, f"us-{kind}-{freq}.csv"), sep=";", index=False)
+
+
+def generate_data_dir(
+    data_dir,
+    tickers=10,
+    days=260,
+    end_date="2024-06-28",
+    news_per_day=3,
+    posts_per_day=20,
+    seed=0,
+):
+    """Write a synthetic DATA_DIR and return what is in it.
+
+    tickers is a count or a list of symbols; days is the number of trading
+    days of price history ending at end_date. News, insider data and Reddit
+    posts cover every calendar day of that span.
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    if isinstance(tickers, int):
+        tickers = synthetic_tickers(tickers)
+    trading_days = pd.bdate_range(end=end_date, periods=days)
+    calendar_days = pd.date_range(trading_days[0], trading_days[-1])
+
+    for ticker in tickers:
+        write_prices(data_dir, ticker, trading_days, rng)
+        write_finnhub(data_dir, ticker, calendar_days, news_per_day, rng)
+    write_reddit(data_dir, tickers, calendar_days, posts_per_day, rng)
+    write_simfin(data_dir, tickers, trading_days[0], trading_days[-1], rng)
+
+    files = [os.path.join(root, name) for root, _, names in os.walk(data_dir) for name in names]
+    return {
+        "data_dir": data_dir,
+        "tickers": list(tickers),
+        "start_date": trading_days[0].strftime("%Y-%m-%d"),
+        "end_date": trading_days[-1].strftime("%Y-%m-%d"),
+        "trading_days": len(trading_days),
+        "news_per_day": news_per_day,
+        "posts_per_day": posts_per_day,
+        "seed": seed,
+        "files": len(files),
+        "bytes": sum(os.path.getsize(path) for path in files),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("data_dir")
+    parser.add_argument("--tickers", type=int, default=10)
+    parser.add_argument("--days", type=int, default=260, help="trading days of history")
+    parser.add_argument("--end", default="2024-06-28", help="last trading day")
+    parser.add_argument("--news-per-day", type=int, default=3, help="mean Finnhub headlines per ticker and day")
+    parser.add_argument("--posts-per-day", type=int, default=20, help="mean Reddit posts per subreddit and day")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summary = generate_data_dir(
+        args.data_dir, args.tickers, args.days, args.end, args.news_per_day, args.posts_per_day, args.seed
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
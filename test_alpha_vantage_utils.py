@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test file for the bulk transcript fetch in alpha_vantage_utils.py
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+# the data utilities import api_usage as a top-level module
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tradingagents", "dataflows")
+)
+
+import alpha_vantage_utils
+import api_usage
+
+
+class AlphaVantageStandIn(BaseHTTPRequestHandler):
+    """Serves earnings call transcripts; older quarters answer faster than newer ones."""
+
+    requests = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        with self.lock:
+            self.requests.append(params["quarter"])
+        year = int(params["quarter"][:4])
+        time.sleep(max(0, year - 2020) * 0.02)
+        body = {
+            "symbol": params["symbol"],
+            "quarter": params["quarter"],
+            "transcript": [{"speaker": "CEO", "content": f"{params['quarter']} went well"}],
+        }
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+class TestEarningsFrom(unittest.TestCase):
+    """Test cases for iter_earnings_from against a local HTTP stand-in."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), AlphaVantageStandIn)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/query"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Set up a client on a temporary usage database and the stand-in."""
+        self.db_dir = tempfile.mkdtemp()
+        AlphaVantageStandIn.requests = []
+        env = {"ALPHA_VANTAGE_API_KEY": "test-key-one", "ALPHA_VANTAGE_API_KEY2": "test-key-two"}
+        with patch.dict(os.environ, env), patch.object(
+            api_usage, "DEFAULT_DB_PATH", os.path.join(self.db_dir, "api_usage.db")
+        ):
+            self.client = alpha_vantage_utils.AlphaVantageClient()
+        self.client._base_url = self.base_url
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir, ignore_errors=True)
+
+    def test_quarters_start_from_last_completed_quarter(self):
+        """The quarter list is derived from the date, not hard-coded."""
+        self.assertEqual(
+            alpha_vantage_utils._generate_backward_quarters(2024, date(2025, 2, 10)),
+            ["2024Q4", "2024Q3", "2024Q2", "2024Q1"],
+        )
+        self.assertEqual(
+            alpha_vantage_utils._generate_backward_quarters(2025, date(2025, 8, 1)),
+            ["2025Q2", "2025Q1"],
+        )
+
+    def test_results_stream_in_quarter_order(self):
+        """Concurrently fetched quarters are yielded newest first, in order."""
+        with patch.object(alpha_vantage_utils, "_generate_backward_quarters",
+                          return_value=["2023Q2", "2023Q1", "2022Q4", "2022Q3"]):
+            results = list(self.client.iter_earnings_from("IBM", 2022))
+        self.assertEqual([q for q, _ in results], ["2023Q2", "2023Q1", "2022Q4", "2022Q3"])
+        self.assertEqual(results[2][1]["transcript"][0]["content"], "2022Q4 went well")
+        self.assertEqual(sorted(AlphaVantageStandIn.requests), ["2022Q3", "2022Q4", "2023Q1", "2023Q2"])
+
+    def test_cached_quarters_are_not_requested(self):
+        """Quarters already in the response cache do not hit the network."""
+        quarters = ["2023Q1", "2022Q4"]
+        with patch.object(alpha_vantage_utils, "_generate_backward_quarters", return_value=quarters):
+            self.client.get_earnings_call("IBM", "2023Q1")
+            AlphaVantageStandIn.requests = []
+            transcripts, markdown = self.client.get_earnings_from("IBM", 2022)
+        self.assertEqual(AlphaVantageStandIn.requests, ["2022Q4"])
+        self.assertEqual([json.loads(t)["quarter"] for t in transcripts], quarters)
+        self.assertLess(markdown.index("IBM 2023Q1"), markdown.index("IBM 2022Q4"))
+
+
+def quarterly_earnings(n, seed=0):
+    """An EARNINGS response with n quarters, newest first, EPS as strings like the API."""
+    rng = np.random.default_rng(seed)
+    reported = pd.date_range("2010-01-25", periods=n, freq="91D")[::-1]
+    return {
+        "symbol": "IBM",
+        "quarterlyEarnings": [
+            {"reportedDate": d.strftime("%Y-%m-%d"), "reportedEPS": f"{eps:.2f}"}
+            for d, eps in zip(reported, rng.normal(2, 1, n))
+        ],
+    }
+
+
+class TestTrailingEps(unittest.TestCase):
+    """Test cases for the vectorized trailing-EPS alignment."""
+
+    def assert_same_as_loop(self, df, earnings):
+        eps_rolling = alpha_vantage_utils.trailing_eps(earnings)
+        expected = alpha_vantage_utils._align_trailing_eps_loop(df.copy(), eps_rolling)
+        actual = alpha_vantage_utils.align_trailing_eps(df.copy(), eps_rolling)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_daily_index(self):
+        """Daily bars get exactly the values of the report-by-report assignment."""
+        df = pd.DataFrame({"Close": 1.0}, index=pd.date_range("2009-06-01", "2016-01-01"))
+        self.assert_same_as_loop(df, quarterly_earnings(20))
+
+    def test_intraday_unsorted_and_tz_aware_index(self):
+        """Report days themselves, unsorted rows and time zones are handled the same way."""
+        index = pd.date_range("2012-01-01", "2013-06-01", freq="7h", tz="America/New_York")
+        df = pd.DataFrame({"Close": 1.0, "eps": -1.0}, index=index[::-1])
+        self.assert_same_as_loop(df, quarterly_earnings(24, seed=1))
+
+    def test_string_index_and_short_history(self):
+        """String dates compare as strings; fewer than 4 reports leave the frame unchanged."""
+        df = pd.DataFrame({"Close": 1.0}, index=[d.strftime("%Y-%m-%d") for d in pd.date_range("2010-01-01", "2013-01-01")])
+        self.assert_same_as_loop(df, quarterly_earnings(12, seed=2))
+        self.assertNotIn("eps", alpha_vantage_utils.align_trailing_eps(
+            df.copy(), alpha_vantage_utils.trailing_eps(quarterly_earnings(3))).columns)
+
+    def test_batch(self):
+        """add_eps_columns aligns every symbol with its own earnings."""
+        client = alpha_vantage_utils.AlphaVantageClient.__new__(alpha_vantage_utils.AlphaVantageClient)
+        earnings = {"IBM": quarterly_earnings(12, seed=3), "MSFT": quarterly_earnings(12, seed=4)}
+        client.get_earnings = lambda symbol: earnings[symbol]
+        frames = {s: pd.DataFrame({"Close": 1.0}, index=pd.date_range("2010-01-01", "2013-01-01")) for s in earnings}
+        result = client.add_eps_columns({s: df.copy() for s, df in frames.items()})
+        for symbol in earnings:
+            expected = alpha_vantage_utils._align_trailing_eps_loop(
+                frames[symbol].copy(), alpha_vantage_utils.trailing_eps(earnings[symbol]))
+            pd.testing.assert_frame_equal(result[symbol], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
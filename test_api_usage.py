@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test file for the SQLite usage backend in api_usage.py
+"""
+
+import unittest
+from unittest.mock import patch, Mock
+import json
+import os
+import sqlite3
+import sys
+import shutil
+import tempfile
+import threading
+import zlib
+from datetime import date
+
+# api_usage is imported as a top-level module by the data utilities
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tradingagents", "dataflows")
+)
+
+import api_usage
+import requests
+import urllib3
+
+
+class TestApiUsageClient(unittest.TestCase):
+    """Test cases for ApiUsageClient on the UsageStore backend."""
+
+    def setUp(self):
+        """Set up a usage database in a temporary directory."""
+        self.db_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.db_dir, "api_usage.db")
+        self.client = api_usage.ApiUsageClient("AlphaVantage", 25, db_path=self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir, ignore_errors=True)
+
+    def raw_rows(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT api_key, url, response FROM AlphaVantage").fetchall()
+        finally:
+            conn.close()
+
+    @patch("api_usage.requests.get")
+    def test_responses_are_cached_compressed(self, mock_get):
+        """A second query for the same url is served from the database."""
+        mock_get.return_value = Mock(json=Mock(return_value={"symbol": "AAPL"}))
+        url = "https://www.alphavantage.co/query?function=OVERVIEW&symbol=AAPL"
+        self.assertEqual(self.client.query_rpc(url, ["k1"]), {"symbol": "AAPL"})
+        self.assertEqual(self.client.query_rpc(url, ["k1"]), {"symbol": "AAPL"})
+        self.assertEqual(mock_get.call_count, 1)
+
+        self.client.flush()
+        (api_key, _, blob), = self.raw_rows()
+        self.assertEqual(api_key, "k1")
+        self.assertEqual(json.loads(zlib.decompress(blob)), {"symbol": "AAPL"})
+
+    @patch("api_usage.requests.get")
+    def test_paid_responses_are_committed_right_away(self, mock_get):
+        """A paid response is on disk and counted by other processes without a flush."""
+        mock_get.return_value = Mock(json=Mock(return_value={"symbol": "AAPL"}))
+        self.client.query_rpc("https://www.alphavantage.co/query?function=OVERVIEW&symbol=AAPL", ["k1"])
+
+        self.assertEqual(len(self.raw_rows()), 1)
+        other_process = api_usage.UsageStore(self.db_path)
+        self.assertEqual(other_process.count_usage("AlphaVantage", "k1", date.today().isoformat()), 1)
+
+    def test_quota_is_released_only_for_requests_not_sent(self):
+        """Failed connects give the key back; failures after sending keep it used."""
+        url = "https://www.alphavantage.co/query?function=OVERVIEW&symbol=AAPL"
+        not_sent = requests.ConnectionError(
+            urllib3.exceptions.MaxRetryError(
+                None, url, urllib3.exceptions.NewConnectionError(None, "refused")
+            )
+        )
+        failures = [
+            (not_sent, 0),
+            (requests.ConnectTimeout("connect timed out"), 0),
+            (requests.ReadTimeout("read timed out"), 1),
+            (requests.ConnectionError("Connection aborted."), 2),
+        ]
+        for error, used in failures:
+            with patch("api_usage.requests.get", side_effect=error):
+                with self.assertRaises(type(error)):
+                    self.client.query_rpc(url, ["alpha-key-one"])
+            self.assertEqual(self.client.quota_metrics(["alpha-key-one"])["alph...ne"]["used_today"], used)
+
+        with patch("api_usage.requests.get", return_value=Mock(json=Mock(side_effect=ValueError("not json")))):
+            with self.assertRaises(ValueError):
+                self.client.query_rpc(url, ["alpha-key-one"])
+        self.assertEqual(self.client.quota_metrics(["alpha-key-one"])["alph...ne"]["used_today"], 3)
+
+    def test_plain_text_rows_are_still_read(self):
+        """Rows written before compression are returned unchanged."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT INTO AlphaVantage (api_key, url, response) VALUES (?, ?, ?)",
+            ("k1", "old-url", json.dumps({"old": True})),
+        )
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.client.get_cache("old-url"), {"old": True})
+
+    def test_lookups_use_indexes(self):
+        """The url and (api_key, usage_date) lookups do not scan the table."""
+        conn = sqlite3.connect(self.db_path)
+        plans = [
+            conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            for query, params in [
+                ("SELECT response FROM AlphaVantage WHERE url = ?", ("u",)),
+                ("SELECT COUNT(*) FROM AlphaVantage WHERE api_key = ? AND usage_date = ?", ("k", "d")),
+            ]
+        ]
+        conn.close()
+        for plan in plans:
+            self.assertIn("USING", " ".join(row[-1] for row in plan))
+
+    def test_concurrent_logging(self):
+        """Usages logged from many threads are all counted and committed."""
+        def work(i):
+            client = api_usage.ApiUsageClient("AlphaVantage", 25, db_path=self.db_path)
+            for j in range(20):
+                client.log_usage(f"k{i % 2}", f"url-{i}-{j}", "{}", batch=True)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.client.get_usage_count_today("k0"), 60)
+        self.client.flush()
+        self.assertEqual(len(self.raw_rows()), 120)
+        self.assertEqual(self.client.get_usage_count_today("k1"), 60)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQuotaTracker(unittest.TestCase):
+    """Test cases for the in-memory QuotaTracker."""
+
+    def setUp(self):
+        """Set up a usage database in a temporary directory."""
+        self.db_dir = tempfile.mkdtemp()
+        self.store = api_usage.UsageStore(os.path.join(self.db_dir, "api_usage.db"))
+        self.store.ensure_table("AlphaVantage")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.db_dir, ignore_errors=True)
+
+    def tracker(self, keys, daily_limit=25, per_minute_limit=None):
+        return api_usage.QuotaTracker(
+            self.store, "AlphaVantage", keys, daily_limit, per_minute_limit, clock=self.clock
+        )
+
+    def test_keys_are_rotated(self):
+        """Requests are spread over all keys; unset keys are skipped."""
+        tracker = self.tracker(["key-one", None, "key-two"])
+        self.assertEqual(
+            [tracker.acquire() for _ in range(4)], ["key-one", "key-two", "key-one", "key-two"]
+        )
+
+    def test_daily_usage_is_loaded_from_the_database(self):
+        """Usage logged earlier today counts against the daily limit."""
+        for i in range(3):
+            self.store.log_usage("AlphaVantage", "key-one", f"url-{i}", "{}")
+        self.store.flush()
+        tracker = self.tracker(["key-one", "key-two"], daily_limit=3)
+        self.assertEqual([tracker.acquire() for _ in range(3)], ["key-two"] * 3)
+        with self.assertRaisesRegex(Exception, "daily limit"):
+            tracker.acquire()
+
+    def test_per_minute_limit(self):
+        """A key is skipped for the rest of the minute once its minute quota is used."""
+        tracker = self.tracker(["key-one", "key-two"], per_minute_limit=1)
+        tracker.acquire()
+        tracker.acquire()
+        with self.assertRaisesRegex(Exception, "per-minute"):
+            tracker.acquire(wait=False)
+        self.clock.now += 60
+        self.assertEqual(tracker.acquire(wait=False), "key-one")
+
+    def test_metrics_and_release(self):
+        """Metrics report remaining quota per masked key; released requests are given back."""
+        tracker = self.tracker(["alpha-key-one", "alpha-key-two"], daily_limit=2, per_minute_limit=5)
+        api_key = tracker.acquire()
+        self.assertEqual(sorted(tracker.metrics()), ["alph...ne", "alph...wo"])
+        self.assertEqual(
+            tracker.metrics()["alph...ne"],
+            {"used_today": 1, "remaining_today": 1, "remaining_this_minute": 4},
+        )
+        tracker.release(api_key)
+        self.assertEqual(tracker.metrics()["alph...ne"]["used_today"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test file for the walk-forward Backtester in graph/backtest.py
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradingagents.dataflows.price_store import PriceStore
+from tradingagents.graph.backtest import MEMORY_NAMES, Backtester, realized_returns, signal_position
+from tradingagents.graph.batch import PropagationBatch
+from test_helpers import write_price_csv
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-run, not caught as a job failure."""
+
+
+class StubMemory:
+    def __init__(self):
+        self.records = []
+
+    def export(self):
+        return list(self.records)
+
+    def load(self, records):
+        self.records = list(records)
+
+
+class StubGraph:
+    """Decides BUY for AAA and SELL for BBB, and logs every analysis and reflection."""
+
+    def __init__(self, crash_on=None):
+        self.config = {"backtest_holding_period": 2}
+        self.crash_on = crash_on
+        self.events = []
+        for name in MEMORY_NAMES:
+            setattr(self, name, StubMemory())
+
+    def _run_job(self, ticker, trade_date):
+        if trade_date == self.crash_on:
+            raise Crash()
+        self.events.append(("analyse", trade_date, ticker))
+        if ticker == "BAD":
+            raise RuntimeError("no data")
+        decision = {"AAA": "BUY", "BBB": "SELL"}[ticker]
+        return {"company_of_interest": ticker, "trade_date": trade_date, "messages": []}, decision
+
+    def propagate_many(self, tickers, dates, max_concurrency=None, retries=None):
+        return PropagationBatch(self._run_job, tickers, dates, max_concurrency or 2, retries=0)
+
+    def reflect_and_remember(self, returns_losses, state=None):
+        self.events.append(("reflect", state["trade_date"], state["company_of_interest"]))
+        self.bull_memory.records.append(
+            {"situation": state["trade_date"], "recommendation": returns_losses}
+        )
+
+
+class TestBacktester(unittest.TestCase):
+    """Test cases for Backtester."""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.price_dir = os.path.join(self.data_dir, "price_data")
+        os.makedirs(self.price_dir)
+        path = write_price_csv(
+            self.price_dir, "AAA", "2024-01-01", closes=[100, 110, 121, 110, 99, 99, 108.9, 120]
+        )
+        self.dates = pd.read_csv(path)["Date"].tolist()
+        write_price_csv(self.price_dir, "BBB", "2024-01-01", closes=[50, 50, 45, 45, 40.5, 45, 45, 50])
+        self.store = PriceStore(self.price_dir, os.path.join(self.data_dir, "price_store"))
+        self.checkpoint = os.path.join(self.data_dir, "backtest", "checkpoint.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def backtester(self, graph, tickers=("AAA", "BBB"), checkpoint_path=None):
+        return Backtester(
+            graph, list(tickers), self.dates[0], self.dates[5],
+            checkpoint_path=checkpoint_path, price_store=self.store,
+        )
+
+    def test_realized_returns(self):
+        dates = np.array([0, 1, 2, 5], dtype=np.int64)
+        closes = np.array([10.0, 11.0, 12.0, 15.0])
+        exit_dates, returns = realized_returns(
+            dates, closes, ["1970-01-01", "1970-01-02", "1970-01-04", "1970-01-03"], 2
+        )
+        self.assertEqual(exit_dates, ["1970-01-03", "1970-01-06", None, None])
+        np.testing.assert_allclose(returns, [0.2, 15 / 11 - 1, np.nan, np.nan])
+        self.assertEqual(signal_position("SELL"), -1)
+        self.assertEqual(signal_position("Final: buy"), 1)
+        self.assertEqual(signal_position(None), 0)
+
+    def test_reflects_in_exit_order_without_look_ahead(self):
+        graph = StubGraph()
+        result = self.backtester(graph).run()
+        records = result["records"].set_index(["ticker", "trade_date"])
+
+        self.assertEqual(len(records), 12)
+        self.assertAlmostEqual(records.loc[("AAA", self.dates[0]), "return"], 0.21)
+        self.assertAlmostEqual(records.loc[("BBB", self.dates[0]), "position_return"], 0.1)
+        self.assertEqual(records.loc[("AAA", self.dates[0]), "exit_date"], self.dates[2])
+        self.assertTrue(records["reflected"].all())
+
+        # a decision is reflected on only before the days after its position closed
+        exit_of = {d: self.dates[i + 2] for i, d in enumerate(self.dates[:6])}
+        reflected = []
+        for i, (kind, trade_date, ticker) in enumerate(graph.events):
+            if kind == "reflect":
+                reflected.append(trade_date)
+                later = [e[1] for e in graph.events[i:] if e[0] == "analyse"]
+                if later:
+                    self.assertLess(exit_of[trade_date], min(later))
+        self.assertEqual(reflected, sorted(reflected))
+        first_reflection = graph.events.index(("reflect", self.dates[0], "AAA"))
+        self.assertEqual(graph.events[first_reflection - 1][1], self.dates[2])
+
+        summary = result["summary"]
+        self.assertEqual(summary["days"], 6)
+        self.assertEqual(summary["decisions"], {"BUY": 6, "SELL": 6, "HOLD": 0})
+        self.assertEqual(summary["reflected"], 12)
+        self.assertGreater(summary["decisions_per_second"], 0)
+        self.assertEqual(len(result["days"]), 6)
+
+    def test_equity_curve(self):
+        """One long ticker held one session at a time tracks its price."""
+        graph = StubGraph()
+        backtester = Backtester(
+            graph, ["AAA"], self.dates[0], self.dates[6], holding_period=1, price_store=self.store
+        )
+        curve = backtester.run()["equity_curve"]
+        closes = np.array([100, 110, 121, 110, 99, 99, 108.9, 120])
+
+        self.assertEqual(list(curve.index), self.dates)
+        np.testing.assert_allclose(curve["equity"], closes / 100)
+        np.testing.assert_allclose(curve["drawdown"].min(), 99 / 121 - 1)
+        summary = backtester.summary()
+        self.assertAlmostEqual(summary["total_return"], 0.2)
+        self.assertAlmostEqual(summary["max_drawdown"], 99 / 121 - 1)
+        self.assertEqual(summary["hit_rate"], 4 / 7)
+
+    def test_failures_are_recorded_flat(self):
+        result = self.backtester(StubGraph(), tickers=["AAA", "BAD"]).run()
+        bad = result["records"][result["records"]["ticker"] == "BAD"]
+        self.assertTrue((bad["position"] == 0).all())
+        self.assertTrue(bad["error"].str.contains("no data").all())
+        self.assertFalse(bad["reflected"].any())
+        self.assertEqual(result["summary"]["failed"], 6)
+
+    def test_resume_from_checkpoint(self):
+        """A run that dies mid-way resumes after its last finished day with its memories."""
+        crashing = StubGraph(crash_on=self.dates[3])
+        with self.assertRaises(Crash):
+            self.backtester(crashing, checkpoint_path=self.checkpoint).run()
+        self.assertTrue(os.path.exists(self.checkpoint))
+
+        resumed = StubGraph()
+        result = self.backtester(resumed, checkpoint_path=self.checkpoint).run()
+        analysed = sorted({e[1] for e in resumed.events if e[0] == "analyse"})
+        self.assertEqual(analysed, self.dates[3:6])
+
+        fresh = StubGraph()
+        expected = self.backtester(fresh).run()
+        columns = ["ticker", "trade_date", "decision", "exit_date", "return", "reflected"]
+        pd.testing.assert_frame_equal(result["records"][columns], expected["records"][columns])
+        self.assertEqual(resumed.bull_memory.records, fresh.bull_memory.records)
+        pd.testing.assert_frame_equal(result["equity_curve"], expected["equity_curve"])
+
+        with self.assertRaises(ValueError):
+            Backtester(
+                StubGraph(), ["AAA"], self.dates[0], self.dates[5],
+                checkpoint_path=self.checkpoint, price_store=self.store,
+            ).run()
+
+
+if __name__ == "__main__":
+    unittest.main()
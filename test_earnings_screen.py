@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test file for the profile and price loading of get_earnings_and_profiles in finnhub_utils.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.finnhub_utils as finnhub_utils
+from tradingagents.dataflows.finnhub_utils import (
+    get_company_profiles,
+    get_earnings_and_profiles,
+    get_session_prices,
+)
+from test_helpers import write_price_csv
+
+
+def yf_download_frame(symbols, dates):
+    """A multi-ticker yf.download result: (Price, Ticker) columns indexed by Date."""
+    index = pd.DatetimeIndex(dates, name="Date")
+    columns = pd.MultiIndex.from_product(
+        [["Close", "High", "Low", "Open", "Volume"], symbols], names=["Price", "Ticker"]
+    )
+    values = np.arange(len(index) * len(columns), dtype=float).reshape(len(index), -1) + 10
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+class TestEarningsScreen(unittest.TestCase):
+    """Test cases for get_company_profiles, get_session_prices and get_earnings_and_profiles."""
+
+    def setUp(self):
+        """Set up a temporary price directory and an empty profile cache."""
+        self.data_dir = tempfile.mkdtemp()
+        self.price_dir = os.path.join(self.data_dir, "market_data", "price_data")
+        os.makedirs(self.price_dir)
+        self.config = {"data_dir": self.data_dir, "profile_cache_ttl_seconds": 3600}
+        patches = [
+            patch.object(finnhub_utils, "get_config", return_value=self.config),
+            patch.dict(finnhub_utils._profile_cache, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.data_dir)
+
+    def test_profiles_fetched_concurrently_and_cached(self):
+        """Profiles are scraped by several workers at once, then served from the cache."""
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def profile(symbol, use_finnhub_for_profile=False):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            if symbol == "BAD":
+                raise KeyError("marketCap")
+            return {"ticker": symbol, "marketCapitalization": float(len(symbol))}
+
+        symbols = ["AAPL", "BAD", "MSFT", "NVDA", "TSM"]
+        with patch.object(finnhub_utils, "get_company_profile", side_effect=profile) as fetch:
+            profiles = get_company_profiles(symbols, max_workers=4)
+            self.assertEqual(list(profiles), ["AAPL", "MSFT", "NVDA", "TSM"])
+            self.assertGreater(peak[0], 1)
+            self.assertLessEqual(peak[0], 4)
+
+            fetch.reset_mock()
+            again = get_company_profiles(["TSM", "AAPL"])
+            self.assertEqual(again, {"TSM": profiles["TSM"], "AAPL": profiles["AAPL"]})
+            # both profiles are cached, so nothing is scraped again
+            fetch.assert_not_called()
+
+    def test_profiles_expire_after_ttl(self):
+        self.config["profile_cache_ttl_seconds"] = 0
+        with patch.object(
+            finnhub_utils, "get_company_profile", return_value={"ticker": "AAPL"}
+        ) as fetch:
+            get_company_profiles(["AAPL"])
+            time.sleep(0.01)
+            get_company_profiles(["AAPL"])
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_session_prices_from_price_store(self):
+        """Symbols with both sessions on disk are not downloaded; the rest only for the span."""
+        local = pd.read_csv(write_price_csv(self.price_dir, "AAPL", "2024-07-01", "2024-07-31"))
+        remote = yf_download_frame(["MSFT"], ["2024-07-23", "2024-07-24"])
+
+        with patch.object(finnhub_utils.yf, "download", return_value=remote) as download:
+            prices = get_session_prices(["AAPL", "MSFT"], "2024-07-23", "2024-07-24")
+
+        download.assert_called_once_with(
+            ["MSFT"], start="2024-07-23", end="2024-07-25", progress=False
+        )
+        aapl = prices[prices["Ticker"] == "AAPL"].set_index("Date")
+        expected = local.set_index(pd.to_datetime(local["Date"]))
+        for date in ["2024-07-23", "2024-07-24"]:
+            self.assertEqual(aapl.loc[date, "Close"], expected.loc[date, "Close"])
+            self.assertEqual(aapl.loc[date, "Open"], expected.loc[date, "Open"])
+        msft = prices[prices["Ticker"] == "MSFT"]
+        self.assertEqual(len(msft), 2)
+        self.assertEqual(len(prices[prices["Date"] == pd.Timestamp("2024-07-24")]), 2)
+
+    def test_earnings_and_profiles(self):
+        """The screen joins earnings, the two sessions and the profiles as before."""
+        write_price_csv(self.price_dir, "AAPL", "2024-07-01", "2024-07-31")
+        write_price_csv(self.price_dir, "MSFT", "2024-07-01", "2024-07-31")
+        earnings = pd.DataFrame(
+            {
+                "date": ["2024-07-24", "2024-07-24"],
+                "symbol": ["AAPL", "MSFT"],
+                "epsActual": [1.0, 2.0],
+                "epsEstimate": [0.9, 2.1],
+                "eps_diff_percent": [0.1, -0.05],
+                "revenueActual": [10.0, 20.0],
+                "revenueEstimate": [9.0, 21.0],
+                "revenue_diff_percent": [0.1, -0.05],
+            }
+        )
+
+        def profile(symbol, use_finnhub_for_profile=False):
+            return {"ticker": symbol, "marketCapitalization": {"AAPL": 3.0, "MSFT": 2.0}[symbol]}
+
+        with patch.object(finnhub_utils, "get_earnings_calendar", return_value=earnings), \
+                patch.object(finnhub_utils, "next_open_market_day", return_value="2024-07-25"), \
+                patch.object(finnhub_utils, "get_company_profile", side_effect=profile), \
+                patch.object(finnhub_utils.yf, "download") as download:
+            screen = get_earnings_and_profiles("2024-07-24", "amc")
+
+        download.assert_not_called()
+        self.assertEqual(screen["symbol"].tolist(), ["AAPL", "MSFT"])
+        prices = pd.read_csv(os.path.join(self.price_dir, "AAPL-YFin-data-2024-07-01-2024-07-31.csv"), index_col="Date")
+        expected = (prices.loc["2024-07-25", "Open"] - prices.loc["2024-07-24", "Close"]) / prices.loc["2024-07-24", "Close"]
+        self.assertAlmostEqual(screen.iloc[0]["change_after_earning"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test file for the offline "fake" LLM provider in graph/fake_llm.py
+"""
+
+import unittest
+import asyncio
+import os
+import random
+import sys
+import shutil
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.fake_llm import FakeChatModel, sample_latency
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+ANALYST_TOOLS = {
+    "market": [
+        Toolkit.get_YFin_data_online, Toolkit.get_stockstats_indicators_report_online,
+        Toolkit.get_YFin_data, Toolkit.get_stockstats_indicators_report,
+    ],
+    "social": [Toolkit.get_stock_news_openai, Toolkit.get_reddit_stock_info],
+    "news": [
+        Toolkit.get_global_news_openai, Toolkit.get_google_news,
+        Toolkit.get_finnhub_news, Toolkit.get_reddit_news,
+    ],
+    "fundamentals": [
+        Toolkit.get_fundamentals_openai,
+        Toolkit.get_finnhub_company_insider_sentiment,
+        Toolkit.get_finnhub_company_insider_transactions,
+        Toolkit.get_simfin_balance_sheet, Toolkit.get_simfin_cashflow, Toolkit.get_simfin_income_stmt,
+    ],
+}
+
+ANALYST_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", "For your reference, the current date is {current_date}. The company we want to look at is {ticker}"),
+        MessagesPlaceholder(variable_name="messages"),
+    ]
+)
+
+
+class TestFakeChatModel(unittest.TestCase):
+    """Test cases for FakeChatModel."""
+
+    def test_tool_calls_match_each_tool_schema(self):
+        llm = FakeChatModel()
+        for analyst, tools in ANALYST_TOOLS.items():
+            chain = ANALYST_PROMPT | llm.bind_tools(tools)
+            result = chain.invoke(
+                {"current_date": "2024-05-10", "ticker": "NVDA", "messages": [HumanMessage("NVDA")]}
+            )
+            self.assertEqual([call["name"] for call in result.tool_calls], [t.name for t in tools], analyst)
+            for tool, call in zip(tools, result.tool_calls):
+                # raises if an argument is missing or of the wrong type
+                tool.args_schema.model_validate(call["args"])
+                for name, value in call["args"].items():
+                    if name in ("symbol", "ticker"):
+                        self.assertEqual(value, "NVDA")
+                    if name == "curr_date":
+                        self.assertEqual(value, "2024-05-10")
+
+    def test_report_after_tool_results(self):
+        chain = ANALYST_PROMPT | FakeChatModel().bind_tools(ANALYST_TOOLS["social"])
+        messages = [
+            HumanMessage("NVDA"),
+            AIMessage(content="", tool_calls=[{"name": "get_stock_news_openai", "args": {}, "id": "call_0"}]),
+            ToolMessage(content="news", tool_call_id="call_0"),
+        ]
+        result = chain.invoke({"current_date": "2024-05-10", "ticker": "NVDA", "messages": messages})
+        self.assertEqual(result.tool_calls, [])
+        self.assertIn("NVDA as of 2024-05-10", result.content)
+        self.assertGreater(result.usage_metadata["input_tokens"], 0)
+
+    def test_deterministic_signal_and_extraction(self):
+        llm = FakeChatModel()
+        answer = llm.invoke("Debate the reports on NVDA as of 2024-05-10.").content
+        self.assertEqual(answer, llm.invoke("Debate the reports on NVDA as of 2024-05-10.").content)
+        self.assertIn("FINAL TRANSACTION PROPOSAL: **", answer)
+
+        extracted = llm.invoke(
+            [
+                ("system", "Your task is to extract the investment decision: SELL, BUY, or HOLD."),
+                ("human", "After review. FINAL TRANSACTION PROPOSAL: **HOLD**"),
+            ]
+        )
+        self.assertEqual(extracted.content, "HOLD")
+        self.assertIn("**BUY**", FakeChatModel(signal="BUY").invoke("on NVDA as of 2024-05-10").content)
+
+    def test_script(self):
+        llm = FakeChatModel(script=[(r"Bull Analyst", "Bullish on {ticker}, {signal}.")], signal="SELL")
+        self.assertEqual(
+            llm.invoke("You are a Bull Analyst. Reports on AAPL as of 2024-05-10").content,
+            "Bullish on AAPL, SELL.",
+        )
+        self.assertIn("FINAL TRANSACTION PROPOSAL", llm.invoke("You are a Bear Analyst.").content)
+
+    def test_latency_distributions(self):
+        rng = random.Random(7)
+        self.assertEqual(sample_latency(None, rng), 0.0)
+        self.assertEqual(sample_latency({"seconds": 0.25}, rng), 0.25)
+        uniform = [sample_latency({"distribution": "uniform", "low": 0.1, "high": 0.2}, rng) for _ in range(200)]
+        self.assertTrue(all(0.1 <= x <= 0.2 for x in uniform))
+        normal = [sample_latency({"distribution": "normal", "mean": 0.0, "std": 1.0}, rng) for _ in range(200)]
+        self.assertTrue(all(x >= 0.0 for x in normal))
+        lognormal = sorted(
+            sample_latency({"distribution": "lognormal", "median": 2.0, "sigma": 0.5}, rng) for _ in range(2001)
+        )
+        self.assertAlmostEqual(lognormal[1000], 2.0, delta=0.2)
+        with self.assertRaises(ValueError):
+            sample_latency({"distribution": "pareto"}, rng)
+
+        spec = {"distribution": "uniform", "low": 0.0, "high": 1.0}
+        self.assertEqual(
+            [sample_latency(spec, random.Random(3)) for _ in range(2)],
+            [sample_latency(spec, random.Random(3)) for _ in range(2)],
+        )
+
+        llm = FakeChatModel(latency={"distribution": "constant", "seconds": 0.05})
+        started = time.perf_counter()
+        asyncio.run(llm.ainvoke("hello"))
+        llm.invoke("hello")
+        self.assertGreaterEqual(time.perf_counter() - started, 0.1)
+        self.assertEqual(llm.calls, 2)
+
+
+class TestFakeProvider(unittest.TestCase):
+    """The full graph on llm_provider "fake", offline."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.work_dir = tempfile.mkdtemp()
+        cls.cwd = os.getcwd()
+        os.chdir(cls.work_dir)
+        config = DEFAULT_CONFIG.copy()
+        config.update(llm_provider="fake", online_tools=False, data_dir=cls.work_dir)
+        # every analyst but news, whose offline tools still include Google News scraping
+        cls.graph = TradingAgentsGraph(["market", "social", "fundamentals"], config=config)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls.cwd)
+        shutil.rmtree(cls.work_dir)
+
+    def test_propagate_is_deterministic(self):
+        self.graph.tool_nodes["fundamentals"].reset_stats()
+        state, decision = self.graph.propagate("NVDA", "2024-05-10")
+        again, again_decision = self.graph.propagate("NVDA", "2024-05-10")
+
+        self.assertIn(decision, ("BUY", "SELL", "HOLD"))
+        self.assertEqual(again_decision, decision)
+        self.assertIn(f"FINAL TRANSACTION PROPOSAL: **{decision}**", state["final_trade_decision"])
+        self.assertIn("NVDA as of 2024-05-10", state["final_trade_decision"])
+        self.assertIn("get_YFin_data", state["market_report"])
+        for key in state:
+            if key != "messages":
+                self.assertEqual(state[key], again[key], key)
+
+        # every analyst's tools were called, with the calls failing on the empty data dir
+        self.assertEqual(self.graph.tool_nodes["fundamentals"].stats()["tools"]["get_simfin_cashflow"]["calls"], 2)
+
+    def test_async_and_memory(self):
+        state, decision = asyncio.run(self.graph.apropagate("AAPL", "2024-05-10"))
+        self.assertEqual(decision, self.graph.propagate("AAPL", "2024-05-10")[1])
+
+        self.graph.bull_memory.add_situations([(state["market_report"], "lesson")])
+        matches = self.graph.bull_memory.get_memories(state["market_report"])
+        self.assertEqual(matches[0]["recommendation"], "lesson")
+        self.assertAlmostEqual(matches[0]["similarity_score"], 1.0, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
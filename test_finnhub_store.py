@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test file for the indexed Finnhub store in finnhub_store.py
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.finnhub_store import FinnhubSeries, FinnhubStore
+from tradingagents.dataflows.finnhub_utils import get_data_in_range
+
+
+def write_finnhub_json(data_dir, ticker, data_type, data):
+    """Write a formatted Finnhub file the way the data fetchers lay it out."""
+    path = os.path.join(data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+SENTIMENT = {"symbol": "AAPL", "year": 2024, "month": 5, "change": -120, "mspr": -12.5}
+
+
+class TestFinnhubStore(unittest.TestCase):
+    """Test cases for FinnhubStore."""
+
+    def setUp(self):
+        """Set up a temporary DATA_DIR with insider sentiment data."""
+        self.data_dir = tempfile.mkdtemp()
+        self.json_path = write_finnhub_json(
+            self.data_dir,
+            "AAPL",
+            "insider_senti",
+            {
+                "2024-06-03": [SENTIMENT],
+                "2024-05-30": [],
+                "2024-06-01": [SENTIMENT, {**SENTIMENT, "month": 4}],
+                "2024-06-10": [{**SENTIMENT, "month": 6}],
+            },
+        )
+        self.patcher = patch.object(interface, "DATA_DIR", self.data_dir)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_range_keeps_file_order_and_skips_empty_days(self):
+        """Ranges are inclusive, skip empty days and follow the JSON key order."""
+        result = FinnhubStore(self.data_dir).get_range(
+            "AAPL", "2024-05-30", "2024-06-03", "insider_senti"
+        )
+        self.assertEqual(list(result), ["2024-06-03", "2024-06-01"])
+        self.assertEqual(result["2024-06-01"][1]["month"], 4)
+
+    def test_sidecar_is_reused_until_json_changes(self):
+        """The SQLite sidecar is built once and rebuilt when the JSON is rewritten."""
+        FinnhubSeries(self.json_path)
+        self.assertTrue(os.path.exists(f"{self.json_path}.sqlite"))
+        with patch.object(FinnhubSeries, "_build_sidecar") as build:
+            FinnhubSeries(self.json_path)
+            build.assert_not_called()
+
+        write_finnhub_json(self.data_dir, "AAPL", "insider_senti", {"2024-07-01": [SENTIMENT]})
+        self.assertEqual(
+            get_data_in_range("AAPL", "2024-01-01", "2024-12-31", "insider_senti", self.data_dir),
+            {"2024-07-01": [SENTIMENT]},
+        )
+
+    def test_missing_file_raises(self):
+        """Tickers without data raise like the plain file read did."""
+        with self.assertRaises(FileNotFoundError):
+            get_data_in_range("MSFT", "2024-01-01", "2024-12-31", "insider_senti", self.data_dir)
+
+    def test_insider_sentiment_dedupes_entries(self):
+        """Identical entries on different days are reported once."""
+        report = interface.get_finnhub_company_insider_sentiment("AAPL", "2024-06-05", 10)
+        self.assertEqual(report.count("### 2024-5:"), 1)
+        self.assertEqual(report.count("### 2024-4:"), 1)
+        self.assertLess(report.index("### 2024-5:"), report.index("### 2024-4:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test file for the point-in-time SimFin index in fundamentals_index.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.fundamentals_index import (
+    FundamentalsIndex,
+    get_fundamentals_index,
+)
+
+
+def write_simfin_csv(path):
+    """Write a small semicolon-separated statement file in SimFin's layout."""
+    rows = [
+        # Ticker, SimFinId, Fiscal Year, Report Date, Publish Date, Revenue
+        ("AAPL", 111, 2018, "2018-09-30", "2018-11-05", 100.0),
+        ("MSFT", 222, 2019, "2019-06-30", "2019-08-01", 300.0),
+        ("AAPL", 111, 2019, "2019-09-30", "2019-10-31", 110.0),
+        ("AAPL", 111, 2019, "2019-09-30", "2019-10-31", 999.0),
+        ("AAPL", 111, 2020, "2020-09-30", "2020-10-30", 120.0),
+    ]
+    data = pd.DataFrame(
+        rows,
+        columns=["Ticker", "SimFinId", "Fiscal Year", "Report Date", "Publish Date", "Revenue"],
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data.to_csv(path, sep=";", index=False)
+
+
+def legacy_latest(path, ticker, curr_date):
+    """The full-scan selection the statement functions used before the index."""
+    df = pd.read_csv(path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    if filtered_df.empty:
+        return None
+    return filtered_df.loc[filtered_df["Publish Date"].idxmax()]
+
+
+class TestFundamentalsIndex(unittest.TestCase):
+    """Test cases for FundamentalsIndex."""
+
+    def setUp(self):
+        """Set up a temporary DATA_DIR with an annual balance sheet file."""
+        self.data_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(
+            self.data_dir, "fundamental_data", "simfin_data_all", "balance_sheet",
+            "companies", "us", "us-balance-annual.csv",
+        )
+        write_simfin_csv(self.csv_path)
+        self.patcher = patch.object(interface, "DATA_DIR", self.data_dir)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_as_of_matches_full_scan(self):
+        """Lookups return the same row as the full-scan selection, ties included."""
+        index = FundamentalsIndex(self.csv_path)
+        for ticker in ["AAPL", "MSFT", "TSLA"]:
+            for curr_date in ["2018-01-01", "2018-11-05", "2019-10-31", "2020-06-01", "2021-01-01"]:
+                expected = legacy_latest(self.csv_path, ticker, curr_date)
+                actual = index.as_of(ticker, curr_date)
+                if expected is None:
+                    self.assertIsNone(actual)
+                else:
+                    self.assertEqual(str(actual), str(expected))
+
+    def test_no_look_ahead(self):
+        """A report is not visible before its publish date."""
+        index = FundamentalsIndex(self.csv_path)
+        self.assertEqual(index.as_of("AAPL", "2020-10-29")["Fiscal Year"], 2019)
+        self.assertEqual(index.as_of("AAPL", "2020-10-30")["Fiscal Year"], 2020)
+
+    def test_index_is_persisted_and_rebuilt_on_change(self):
+        """The pickled index is reused until the CSV changes."""
+        get_fundamentals_index(self.csv_path)
+        self.assertTrue(os.path.exists(f"{self.csv_path}.asof-index.pkl"))
+
+        with patch.object(FundamentalsIndex, "_build") as build:
+            FundamentalsIndex(self.csv_path)
+            build.assert_not_called()
+
+        data = pd.read_csv(self.csv_path, sep=";")
+        data.loc[len(data)] = ["AAPL", 111, 2021, "2021-09-30", "2021-10-29", 130.0]
+        data.to_csv(self.csv_path, sep=";", index=False)
+        self.assertEqual(
+            get_fundamentals_index(self.csv_path).as_of("AAPL", "2022-01-01")["Fiscal Year"], 2021
+        )
+
+    def test_statement_report(self):
+        """The balance sheet tool reports the latest published statement."""
+        report = interface.get_simfin_balance_sheet("AAPL", "annual", "2020-01-01")
+        self.assertIn("released on 2019-10-31", report)
+        self.assertIn("110.0", report)
+        self.assertNotIn("SimFinId", report)
+        self.assertEqual(interface.get_simfin_balance_sheet("AAPL", "annual", "2017-01-01"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
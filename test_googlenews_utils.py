@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test file for concurrent Google News fetching in googlenews_utils.py
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradingagents.dataflows.googlenews_utils import TokenBucket, getNewsData
+
+PAGES = 5
+
+
+def result_html(page, i):
+    return (
+        '<div class="SoaBEf"><a href="https://news.example/{p}-{i}"></a>'
+        '<div class="MBeuO">Title {p}-{i}</div><div class="GI74Re">Snippet {p}-{i}</div>'
+        '<div class="LfVVr">1 day ago</div><div class="NUnG9d"><span>Source</span></div>'
+        "</div>"
+    ).format(p=page, i=i)
+
+
+class GoogleNewsStandIn(BaseHTTPRequestHandler):
+    """Serves PAGES result pages of 10 results; the first request for page 1 gets a 429."""
+
+    requests = []
+    rate_limited = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params["start"][0]) // 10
+        with self.lock:
+            self.requests.append(page)
+            throttle = page == 1 and page not in self.rate_limited
+            self.rate_limited.add(page)
+
+        if throttle:
+            self.send_response(429)
+            self.end_headers()
+            return
+
+        body = ""
+        if page < PAGES:
+            body = "".join(result_html(page, i) for i in range(10))
+            if page < PAGES - 1:
+                body += '<a id="pnnext" href="#">Next</a>'
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+        self.wfile.write(f"<html><body>{body}</body></html>".encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+class TestGetNewsData(unittest.TestCase):
+    """Test cases for getNewsData against a local HTTP stand-in."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), GoogleNewsStandIn)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/search"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Set up an empty cache directory and a fast limiter."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.limiter = TokenBucket(rate=200, capacity=4)
+        GoogleNewsStandIn.requests = []
+        GoogleNewsStandIn.rate_limited = set()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def fetch(self, end_date="2024-06-07"):
+        return getNewsData(
+            "AAPL",
+            "2024-06-01",
+            end_date,
+            concurrency=4,
+            base_url=self.base_url,
+            cache_dir=self.cache_dir,
+            limiter=self.limiter,
+        )
+
+    def test_pages_are_returned_in_order(self):
+        """All pages are fetched, in page order, despite the 429 and concurrency."""
+        results = self.fetch()
+        self.assertEqual(
+            [r["title"] for r in results],
+            [f"Title {p}-{i}" for p in range(PAGES) for i in range(10)],
+        )
+        self.assertEqual(results[0]["source"], "Source")
+        self.assertEqual(GoogleNewsStandIn.requests.count(1), 2)
+
+    def test_rate_limit_slows_the_bucket(self):
+        """A 429 halves the refill rate and successes grow it back."""
+        bucket = TokenBucket(rate=10, increase=1)
+        bucket.on_rate_limited()
+        self.assertEqual(bucket.rate, 5)
+        bucket.on_success()
+        self.assertEqual(bucket.rate, 6)
+
+    def test_past_windows_are_served_from_cache(self):
+        """A repeated query for a past window does not hit the network."""
+        first = self.fetch()
+        GoogleNewsStandIn.requests = []
+        self.assertEqual(self.fetch(), first)
+        self.assertEqual(GoogleNewsStandIn.requests, [])
+
+    def test_open_windows_are_not_cached(self):
+        """Windows ending today or later can still change and are fetched again."""
+        self.fetch(end_date="2999-01-01")
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test file for the sequential and parallel analyst topologies in graph/setup.py
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import StructuredTool
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.tool_node import ConcurrentToolNode
+from test_helpers import StubMemory
+
+# first tool each analyst binds with online_tools on
+ANALYST_TOOLS = {
+    "market": "get_YFin_data_online",
+    "social": "get_stock_news_openai",
+    "news": "get_global_news_openai",
+    "fundamentals": "get_fundamentals_openai",
+}
+
+
+class StubLLM:
+    """Chat model stand-in: analysts call one tool and then report on its output."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def _wait(self):
+        self._enter()
+        time.sleep(self.delay)
+        self._exit()
+
+    async def _await(self):
+        self._enter()
+        await asyncio.sleep(self.delay)
+        self._exit()
+
+    @staticmethod
+    def _analyst_reply(prompt, tool_name):
+        last = prompt.to_messages()[-1]
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"report on {last.content}")
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": tool_name, "args": {}, "id": f"call_{tool_name}"}],
+        )
+
+    def _record(self, prompt, tool_name):
+        with self._lock:
+            self.prompts.append((tool_name, [(m.type, m.content) for m in prompt.to_messages()]))
+
+    def bind_tools(self, tools):
+        tool_name = tools[0].name
+
+        def respond(prompt):
+            self._record(prompt, tool_name)
+            self._wait()
+            return self._analyst_reply(prompt, tool_name)
+
+        async def arespond(prompt):
+            self._record(prompt, tool_name)
+            await self._await()
+            return self._analyst_reply(prompt, tool_name)
+
+        return RunnableLambda(respond, afunc=arespond)
+
+    def invoke(self, prompt):
+        self._wait()
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **BUY**")
+
+    async def ainvoke(self, prompt):
+        await self._await()
+        return AIMessage(content="FINAL TRANSACTION PROPOSAL: **BUY**")
+
+
+def stub_tool(name):
+    return StructuredTool.from_function(
+        lambda: f"{name} data", name=name, description=f"stub for {name}"
+    )
+
+
+def build_graph(llm, parallel_analysts, selected_analysts=list(ANALYST_TOOLS)):
+    tool_nodes = {
+        analyst: ConcurrentToolNode([stub_tool(name)]) for analyst, name in ANALYST_TOOLS.items()
+    }
+    memory = StubMemory()
+    setup = GraphSetup(
+        llm, llm, Toolkit(config={"online_tools": True}), tool_nodes,
+        memory, memory, memory, memory, memory, ConditionalLogic(),
+    )
+    return setup.setup_graph(selected_analysts, parallel_analysts=parallel_analysts)
+
+
+def run(graph, ticker="NVDA", trade_date="2024-05-10"):
+    propagator = Propagator()
+    return graph.invoke(
+        propagator.create_initial_state(ticker, trade_date), **propagator.get_graph_args()
+    )
+
+
+async def arun(graph, ticker="NVDA", trade_date="2024-05-10"):
+    propagator = Propagator()
+    return await graph.ainvoke(
+        propagator.create_initial_state(ticker, trade_date), **propagator.get_graph_args()
+    )
+
+
+def comparable(state):
+    """Final state without message ids."""
+    state = dict(state)
+    state["messages"] = [(m.type, m.content) for m in state["messages"]]
+    return state
+
+
+class TestGraphSetup(unittest.TestCase):
+    """Test cases for GraphSetup.setup_graph."""
+
+    def test_parallel_final_state_matches_sequential(self):
+        """Both topologies leave the same reports, debates and messages behind."""
+        sequential = run(build_graph(StubLLM(), parallel_analysts=False))
+        parallel = run(build_graph(StubLLM(), parallel_analysts=True))
+
+        self.assertEqual(sorted(sequential), sorted(parallel))
+        for key in sequential:
+            if key == "messages":
+                continue
+            self.assertEqual(sequential[key], parallel[key], key)
+        self.assertEqual(
+            [(m.type, m.content) for m in sequential["messages"]],
+            [(m.type, m.content) for m in parallel["messages"]],
+        )
+        self.assertEqual(parallel["market_report"], "report on get_YFin_data_online data")
+        self.assertEqual(parallel["fundamentals_report"], "report on get_fundamentals_openai data")
+
+    def test_parallel_analysts_send_the_sequential_prompts(self):
+        """Each parallel branch starts from the messages its analyst sees in sequence."""
+        sequential, parallel = StubLLM(), StubLLM()
+        run(build_graph(sequential, parallel_analysts=False))
+        run(build_graph(parallel, parallel_analysts=True))
+        self.assertEqual(sorted(parallel.prompts), sorted(sequential.prompts))
+        self.assertEqual(len(sequential.prompts), 2 * len(ANALYST_TOOLS))
+
+    def test_parallel_analysts_overlap(self):
+        """The analyst loops run at the same time instead of one after another."""
+        llm = StubLLM(delay=0.05)
+        run(build_graph(llm, parallel_analysts=True))
+        self.assertGreater(llm.peak, 1)
+
+        llm = StubLLM(delay=0.01)
+        run(build_graph(llm, parallel_analysts=False))
+        self.assertEqual(llm.peak, 1)
+
+    def test_async_run_matches_sync(self):
+        """ainvoke goes through the async agent nodes and ends in the same state."""
+        for parallel_analysts in (False, True):
+            graph = build_graph(StubLLM(), parallel_analysts=parallel_analysts)
+            self.assertEqual(comparable(asyncio.run(arun(graph))), comparable(run(graph)))
+
+    def test_one_event_loop_drives_many_runs(self):
+        llm = StubLLM(delay=0.02)
+        graph = build_graph(llm, parallel_analysts=False)
+        tickers = [f"T{i}" for i in range(12)]
+
+        async def run_all():
+            return await asyncio.gather(*(arun(graph, ticker) for ticker in tickers))
+
+        states = asyncio.run(run_all())
+        self.assertEqual([state["company_of_interest"] for state in states], tickers)
+        self.assertGreater(llm.peak, 6)
+
+    def test_subset_of_analysts(self):
+        state = run(build_graph(StubLLM(), parallel_analysts=True, selected_analysts=["news"]))
+        self.assertEqual(state["news_report"], "report on get_global_news_openai data")
+        self.assertEqual(state["market_report"], "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Stubs and data writers shared by the test files
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class StubMemory:
+    """FinancialSituationMemory stand-in without an embedding model or vector store."""
+
+    def __init__(self, name=None, config=None):
+        self.name = name
+
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+    async def aget_memories(self, current_situation, n_matches=1):
+        return []
+
+
+def write_price_csv(price_dir, symbol, start, end=None, tz_suffix="", closes=None):
+    """Write a synthetic YFin CSV the way the offline dataset is laid out.
+
+    Covers the business days from start to end with closes rising from 100
+    to 150, or, when closes is given, one business day per close with every
+    price column at the close. Returns the path of the file.
+    """
+    if closes is None:
+        dates = pd.bdate_range(start, end)
+        close = np.linspace(100.0, 150.0, len(dates))
+        open_, high, low, adj_close = close - 1, close + 1, close - 2, close * 0.98
+    else:
+        dates = pd.bdate_range(start, periods=len(closes))
+        close = open_ = high = low = adj_close = np.asarray(closes)
+    df = pd.DataFrame(
+        {
+            "Date": [d.strftime("%Y-%m-%d") + tz_suffix for d in dates],
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Adj Close": adj_close,
+            "Volume": np.arange(len(dates)) + 1000,
+        }
+    )
+    end = end or dates[-1].strftime("%Y-%m-%d")
+    path = os.path.join(price_dir, f"{symbol}-YFin-data-{start}-{end}.csv")
+    df.to_csv(path, index=False)
+    return path
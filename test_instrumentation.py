@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test file for the per-node and per-tool run metrics in graph/instrumentation.py
+"""
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import json
+import os
+import sys
+import shutil
+import tempfile
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import tool
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.graph.trading_graph as trading_graph
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.instrumentation import (
+    InstrumentedNode,
+    MeteredChatModel,
+    MetricsRegistry,
+    instrument_tool,
+    track,
+)
+from tradingagents.graph.tool_node import ConcurrentToolNode
+from test_helpers import StubMemory
+
+
+@tool
+def get_quote(ticker: str) -> str:
+    """Latest quote of a ticker."""
+    return "quote " * 10
+
+
+@tool
+def get_broken(ticker: str) -> str:
+    """A data source that is down."""
+    raise RuntimeError("source down")
+
+
+def usage_reply(input):
+    return AIMessage(
+        content="ok", usage_metadata={"input_tokens": 7, "output_tokens": 3, "total_tokens": 10}
+    )
+
+
+class TestRunMetrics(unittest.TestCase):
+    """Test cases for the node, chat model and tool wrappers."""
+
+    def test_llm_and_tool_calls_are_credited_to_the_current_node(self):
+        llm = MeteredChatModel(RunnableLambda(usage_reply))
+        tools = ConcurrentToolNode([instrument_tool(get_quote), instrument_tool(get_broken)])
+
+        def analyst(state):
+            llm.invoke("hello")
+            llm.invoke("again")
+            return {}
+
+        analyst_node = InstrumentedNode("Market Analyst", analyst)
+        tool_node = InstrumentedNode("tools_market", tools, round_trip_of="Market Analyst")
+        call = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "get_quote", "args": {"ticker": "NVDA"}, "id": "call_0"},
+                {"name": "get_broken", "args": {"ticker": "NVDA"}, "id": "call_1"},
+            ],
+        )
+
+        with track("NVDA", "2024-05-10") as run:
+            analyst_node.invoke({})
+            tool_node.invoke({"messages": [call]})
+            asyncio.run(tool_node.ainvoke({"messages": [call]}))
+        metrics = run.to_dict()
+
+        analyst_metrics = metrics["nodes"]["Market Analyst"]
+        self.assertEqual(analyst_metrics["calls"], 1)
+        self.assertEqual(analyst_metrics["llm_calls"], 2)
+        self.assertEqual(analyst_metrics["input_tokens"], 14)
+        self.assertEqual(analyst_metrics["output_tokens"], 6)
+        self.assertEqual(analyst_metrics["tool_round_trips"], 2)
+
+        # the calls run on the tool node's pool and, under ainvoke, in worker threads
+        self.assertEqual(metrics["nodes"]["tools_market"]["tool_calls"], 4)
+        self.assertEqual(metrics["tools"]["get_quote"]["calls"], 2)
+        self.assertEqual(metrics["tools"]["get_quote"]["output_bytes"], 2 * len("quote " * 10))
+        self.assertEqual(metrics["tools"]["get_broken"]["errors"], 2)
+        self.assertEqual(metrics["totals"]["tool_errors"], 2)
+        self.assertGreater(metrics["wall_seconds"], 0.0)
+
+    def test_nothing_recorded_outside_a_run(self):
+        llm = MeteredChatModel(RunnableLambda(usage_reply))
+        self.assertEqual(llm.invoke("hello").content, "ok")
+        self.assertEqual(instrument_tool(get_quote).invoke({"ticker": "NVDA"}), "quote " * 10)
+        with track("NVDA", "2024-05-10") as run:
+            pass
+        self.assertEqual(run.to_dict()["nodes"], {})
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        with track("NVDA", "2024-05-10") as run:
+            InstrumentedNode('Odd "Node"', lambda state: {}).invoke({})
+            instrument_tool(get_quote).invoke({"ticker": "NVDA"})
+        registry.add(run.to_dict())
+        registry.add(run.to_dict())
+
+        text = registry.prometheus_text()
+        self.assertIn("# TYPE tradingagents_runs_total counter\ntradingagents_runs_total 2\n", text)
+        self.assertIn('tradingagents_node_calls_total{node="Odd \\"Node\\""} 2', text)
+        self.assertIn('tradingagents_tool_calls_total{tool="get_quote"} 2', text)
+        self.assertIn('tradingagents_tool_output_bytes_total{tool="get_quote"} 120', text)
+
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir)
+        path = os.path.join(work_dir, "textfile", "tradingagents.prom")
+        registry.write_prometheus(path)
+        with open(path) as f:
+            self.assertEqual(f.read(), text)
+
+
+class TestGraphMetrics(unittest.TestCase):
+    """Run metrics of TradingAgentsGraph runs on the fake provider."""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        memory = patch.object(trading_graph, "FinancialSituationMemory", StubMemory)
+        memory.start()
+        self.addCleanup(memory.stop)
+        self.config = DEFAULT_CONFIG.copy()
+        self.config.update(
+            llm_provider="fake",
+            online_tools=False,
+            data_dir=self.work_dir,
+            run_metrics=True,
+            prometheus_metrics_path=os.path.join(self.work_dir, "metrics.prom"),
+        )
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.work_dir)
+
+    def build(self, **config):
+        self.config.update(config)
+        return trading_graph.TradingAgentsGraph(["market", "social"], config=self.config)
+
+    def check_run_metrics(self, metrics):
+        nodes = metrics["nodes"]
+        for analyst, tools in (("Market", 2), ("Social", 1)):
+            self.assertEqual(nodes[f"{analyst} Analyst"]["calls"], 2)
+            self.assertEqual(nodes[f"{analyst} Analyst"]["llm_calls"], 2)
+            self.assertEqual(nodes[f"{analyst} Analyst"]["tool_round_trips"], 1)
+            self.assertEqual(nodes[f"tools_{analyst.lower()}"]["tool_calls"], tools)
+        self.assertGreater(nodes["Research Manager"]["input_tokens"], 0)
+        self.assertEqual(set(metrics["tools"]), {"get_YFin_data", "get_stockstats_indicators_report", "get_reddit_stock_info"})
+        self.assertEqual(
+            metrics["totals"]["input_tokens"], sum(node["input_tokens"] for node in nodes.values())
+        )
+        self.assertEqual(metrics["totals"]["tool_round_trips"], 2)
+
+    def test_metrics_in_final_state_and_next_to_the_states_log(self):
+        graph = self.build()
+        state, _ = graph.propagate("NVDA", "2024-05-10")
+        async_state, _ = asyncio.run(graph.apropagate("NVDA", "2024-05-13"))
+
+        self.check_run_metrics(state["run_metrics"])
+        self.check_run_metrics(async_state["run_metrics"])
+        self.assertEqual(state["run_metrics"]["trade_date"], "2024-05-10")
+
+        log_dir = os.path.join("eval_results", "NVDA", "TradingAgentsStrategy_logs")
+        with open(os.path.join(log_dir, "run_metrics.json")) as f:
+            logged = json.load(f)
+        self.assertEqual(list(logged), ["2024-05-10", "2024-05-13"])
+        self.assertEqual(logged["2024-05-10"], state["run_metrics"])
+
+        with open(self.config["prometheus_metrics_path"]) as f:
+            self.assertIn("tradingagents_runs_total 2\n", f.read())
+        self.assertIn('tradingagents_node_calls_total{node="tools_market"} 2', graph.prometheus_metrics())
+
+    def test_parallel_analysts(self):
+        state, _ = self.build(parallel_analysts=True).propagate("NVDA", "2024-05-10")
+        self.check_run_metrics(state["run_metrics"])
+
+    def test_disabled_by_default(self):
+        self.config.update(run_metrics=DEFAULT_CONFIG["run_metrics"], prometheus_metrics_path=None)
+        graph = self.build()
+        state, _ = graph.propagate("NVDA", "2024-05-10")
+        self.assertNotIn("run_metrics", state)
+        log_dir = os.path.join("eval_results", "NVDA", "TradingAgentsStrategy_logs")
+        self.assertEqual(os.listdir(log_dir), ["full_states_log.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
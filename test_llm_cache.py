@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test file for the record/replay chat model cache in graph/llm_cache.py
+"""
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sys
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import tool
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.graph.trading_graph as trading_graph
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.llm_cache import (
+    CachedChatModel,
+    LLMCacheMiss,
+    LLMResponseStore,
+    request_key,
+)
+from test_helpers import StubMemory
+
+
+@tool
+def get_quote(ticker: str) -> str:
+    """Latest quote of a ticker."""
+    return "1.0"
+
+
+@tool
+def get_news(ticker: str) -> str:
+    """News about a ticker."""
+    return "none"
+
+
+class CountingLLM:
+    """Chat model stand-in that numbers its answers, so replays are recognizable."""
+
+    def __init__(self, model=None, base_url=None, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def _reply(self, input):
+        self.calls += 1
+        time.sleep(self.delay)
+        text = input.to_string() if hasattr(input, "to_string") else str(input)
+        if "extract the investment decision" in text:
+            return AIMessage(content="SELL", usage_metadata={"input_tokens": 3, "output_tokens": 1, "total_tokens": 4})
+        return AIMessage(
+            content=f"answer {self.calls}. FINAL TRANSACTION PROPOSAL: **SELL**",
+            id=f"run-{self.calls}",
+        )
+
+    def invoke(self, input, config=None):
+        return self._reply(input)
+
+    async def ainvoke(self, input, config=None):
+        return self._reply(input)
+
+    def bind_tools(self, tools):
+        async def areply(input):
+            return self._reply(input)
+
+        return RunnableLambda(self._reply, afunc=areply)
+
+
+class FailingLLM(CountingLLM):
+    def _reply(self, input):
+        raise AssertionError("a replayed run must not call the model")
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test cases for CachedChatModel and LLMResponseStore."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.store = LLMResponseStore(os.path.join(self.cache_dir, "llm_responses.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def cached(self, llm, mode):
+        return CachedChatModel(llm, self.store, "openai", "gpt-4o-mini", mode)
+
+    def test_record_then_replay(self):
+        llm = CountingLLM()
+        recorder = self.cached(llm, "record")
+        first = recorder.invoke("How is NVDA doing?")
+        again = recorder.invoke("How is NVDA doing?")
+        other = recorder.invoke("How is AAPL doing?")
+
+        self.assertEqual(llm.calls, 2)
+        self.assertEqual(again.content, first.content)
+        self.assertEqual(again.id, first.id)
+        self.assertNotEqual(other.content, first.content)
+        self.assertEqual(recorder.stats()["hits"], 1)
+        self.assertEqual(recorder.stats()["misses"], 2)
+
+        replayer = self.cached(FailingLLM(), "replay")
+        self.assertEqual(replayer.invoke("How is NVDA doing?").content, first.content)
+        self.assertEqual(asyncio.run(replayer.ainvoke("How is AAPL doing?")).content, other.content)
+        with self.assertRaises(LLMCacheMiss):
+            replayer.invoke("How is MSFT doing?")
+
+    def test_passthrough(self):
+        llm = CountingLLM()
+        passthrough = self.cached(llm, "passthrough")
+        passthrough.invoke("hello")
+        passthrough.invoke("hello")
+        self.assertEqual(llm.calls, 2)
+        self.assertEqual(len(self.store), 0)
+        with self.assertRaises(ValueError):
+            self.cached(llm, "sometimes")
+
+    def test_key_normalization(self):
+        """Message ids, tool call ids and retrieval timestamps don't change the key."""
+
+        def turn(call_id, retrieved):
+            return [
+                SystemMessage(content="You are a market analyst."),
+                HumanMessage(content="NVDA", id="a"),
+                AIMessage(content="", tool_calls=[{"name": "get_quote", "args": {"ticker": "NVDA"}, "id": call_id}]),
+                ToolMessage(
+                    content=f"# Stock data for NVDA\n# Data retrieved on: {retrieved}\n\nDate,Close",
+                    name="get_quote",
+                    tool_call_id=call_id,
+                ),
+            ]
+
+        key = request_key("openai", "o4-mini", turn("call_1", "2025-01-01 10:00:00"))
+        self.assertEqual(key, request_key("openai", "o4-mini", turn("call_9", "2025-03-04 11:12:13")))
+        self.assertNotEqual(key, request_key("openai", "gpt-4o-mini", turn("call_1", "2025-01-01 10:00:00")))
+        self.assertNotEqual(key, request_key("anthropic", "o4-mini", turn("call_1", "2025-01-01 10:00:00")))
+        prompt = ChatPromptTemplate.from_messages([("human", "{question}")])
+        self.assertEqual(
+            request_key("openai", "o4-mini", "What now?"),
+            request_key("openai", "o4-mini", prompt.invoke({"question": "What now?"})),
+        )
+
+    def test_bound_tools_in_a_chain(self):
+        """prompt | llm.bind_tools(tools) is cached per set of tools."""
+        llm = CountingLLM()
+        recorder = self.cached(llm, "record")
+        prompt = ChatPromptTemplate.from_messages(
+            [("system", "Analyse {ticker}."), MessagesPlaceholder(variable_name="messages")]
+        )
+        state = {"ticker": "NVDA", "messages": [("human", "NVDA")]}
+
+        quote_chain = prompt | recorder.bind_tools([get_quote])
+        news_chain = prompt | recorder.bind_tools([get_news])
+        first = quote_chain.invoke(state)
+        self.assertEqual(quote_chain.invoke(state).content, first.content)
+        self.assertNotEqual(news_chain.invoke(state).content, first.content)
+        self.assertEqual(asyncio.run(quote_chain.ainvoke(state)).content, first.content)
+        self.assertEqual(llm.calls, 2)
+        self.assertEqual(recorder.stats()["hits"], 2)
+
+    def test_stats_of_bound_copies_from_many_threads(self):
+        """The bound copies count into the model's stats under one lock."""
+        recorder = self.cached(CountingLLM(), "record")
+        bound = [recorder.bind_tools([get_quote]) for _ in range(8)]
+        bound[0].invoke("How is NVDA doing?")
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for model in bound:
+                pool.submit(lambda model=model: [model._count(hits=1) for _ in range(5000)])
+
+        self.assertIs(bound[3]._shared["lock"], recorder._shared["lock"])
+        self.assertEqual(recorder.stats()["hits"], 8 * 5000)
+        self.assertEqual(recorder.stats()["misses"], 1)
+
+    def test_size_based_eviction(self):
+        """Past max_bytes the least recently used responses go first."""
+        recorder = self.cached(CountingLLM(), "record")
+        for i in range(3):
+            recorder.invoke(f"question {i}")
+        entry_size = self.store.size_bytes() // 3
+        recorder.invoke("question 0")  # question 1 is now the least recently used
+
+        self.store.max_bytes = entry_size * 3 + entry_size // 2
+        recorder.invoke("question 3")
+        self.assertEqual(len(self.store), 3)
+        self.assertLessEqual(self.store.size_bytes(), self.store.max_bytes)
+
+        replayer = self.cached(FailingLLM(), "replay")
+        for question in ("question 0", "question 2", "question 3"):
+            replayer.invoke(question)
+        with self.assertRaises(LLMCacheMiss):
+            replayer.invoke("question 1")
+
+    def test_replayed_propagate(self):
+        """A recorded run replays through TradingAgentsGraph without calling the models."""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir)
+        cwd = os.getcwd()
+        os.chdir(work_dir)
+        self.addCleanup(os.chdir, cwd)
+
+        config = DEFAULT_CONFIG.copy()
+        config["data_dir"] = work_dir
+        config["llm_cache_path"] = os.path.join(self.cache_dir, "graph.db")
+
+        def build(llm_class, mode):
+            config["llm_cache_mode"] = mode
+            with patch.object(trading_graph, "ChatOpenAI", llm_class), patch.object(
+                trading_graph, "FinancialSituationMemory", StubMemory
+            ):
+                return trading_graph.TradingAgentsGraph(config=config)
+
+        recorded = build(lambda model=None, base_url=None: CountingLLM(delay=0.01), "record")
+        state, decision = recorded.propagate("NVDA", "2024-05-10")
+        calls = recorded.quick_thinking_llm.stats()["calls"] + recorded.deep_thinking_llm.stats()["calls"]
+        self.assertGreater(calls, 10)
+
+        replayed = build(FailingLLM, "replay")
+        started = time.perf_counter()
+        replay_state, replay_decision = replayed.propagate("NVDA", "2024-05-10")
+        self.assertLess(time.perf_counter() - started, calls * 0.01)
+
+        self.assertEqual(replay_decision, decision)
+        for key in ("market_report", "investment_plan", "final_trade_decision"):
+            self.assertEqual(replay_state[key], state[key])
+        self.assertGreater(replayed.quick_thinking_llm.stats()["saved_seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test file for the OpenAI web-search response cache in openai_cache.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.openai_cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache."""
+
+    def setUp(self):
+        """Set up a cache in a temporary directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.cache_dir, "openai_responses.db")
+        self.cache = ResponseCache(self.db_path, ttl_seconds=3600)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_hits_survive_a_restart(self):
+        """Responses are stored on disk and served without a new request."""
+        calls = []
+        fetch = lambda: calls.append(1) or "report"
+        self.assertEqual(self.cache.get_or_fetch("f", "AAPL", "2024-06-03", "m", fetch), "report")
+        restarted = ResponseCache(self.db_path, ttl_seconds=3600)
+        self.assertEqual(restarted.get_or_fetch("f", "AAPL", "2024-06-03", "m", fetch), "report")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(restarted.stats()["hits"], 1)
+
+    def test_expired_responses_are_refetched(self):
+        """Responses older than the TTL are requested again."""
+        self.cache.ttl_seconds = 0.01
+        self.cache.get_or_fetch("f", "AAPL", "2024-06-03", "m", lambda: "old")
+        time.sleep(0.02)
+        self.assertEqual(self.cache.get_or_fetch("f", "AAPL", "2024-06-03", "m", lambda: "new"), "new")
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_concurrent_calls_share_one_request(self):
+        """Callers arriving while a request is in flight wait for its result."""
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "report"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.cache.get_or_fetch("f", "", "2024-06-03", "m", fetch)
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["report"] * 4)
+        self.assertEqual(len(calls), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["misses"], stats["shared"]), (1, 3))
+
+    def test_errors_are_not_cached(self):
+        """A failed request raises and the next call tries again."""
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_fetch("f", "AAPL", "2024-06-03", "m", fail)
+        self.assertEqual(self.cache.get_or_fetch("f", "AAPL", "2024-06-03", "m", lambda: "ok"), "ok")
+        stats = self.cache.stats()
+        self.assertEqual((stats["misses"], stats["errors"]), (2, 1))
+        self.assertEqual(stats["mean_fetch_seconds"], stats["fetch_seconds"])
+
+    def test_global_news_is_shared_across_tickers(self):
+        """The market-wide tool is requested once per date."""
+        with patch.object(interface, "get_response_cache", return_value=self.cache), patch.object(
+            interface, "_web_search", return_value="macro"
+        ) as search:
+            interface.get_global_news_openai("2024-06-03")
+            interface.get_global_news_openai("2024-06-03")
+            interface.get_stock_news_openai("AAPL", "2024-06-03")
+        self.assertEqual(search.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
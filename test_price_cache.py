@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test file for the incremental online price cache in price_cache.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradingagents.dataflows.price_cache import OnlinePriceCache, PriceSource
+
+
+class LocalPriceSource(PriceSource):
+    """Stand-in for Yahoo Finance serving bars from an in-memory frame."""
+
+    def __init__(self, end="2024-12-31"):
+        dates = pd.bdate_range("2010-01-01", end)
+        close = np.linspace(10.0, 50.0, len(dates))
+        self.bars = pd.DataFrame(
+            {
+                "Date": dates,
+                "Close": close,
+                "High": close + 1,
+                "Low": close - 1,
+                "Open": close,
+                "Volume": np.arange(len(dates)),
+            }
+        )
+        self.calls = []
+
+    def download(self, symbol, start_date, end_date):
+        self.calls.append((symbol, start_date, end_date))
+        mask = (self.bars["Date"] >= start_date) & (self.bars["Date"] < end_date)
+        return self.bars[mask].reset_index(drop=True)
+
+
+class TestOnlinePriceCache(unittest.TestCase):
+    """Test cases for OnlinePriceCache."""
+
+    def setUp(self):
+        """Set up an empty cache directory and a local price source."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.source = LocalPriceSource()
+        self.cache = OnlinePriceCache(self.cache_dir, source=self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def read(self, symbol):
+        return pd.read_csv(self.cache.path(symbol))
+
+    def test_only_tail_is_fetched_on_later_days(self):
+        """A new day fetches only the bars after the last cached one."""
+        self.cache.update("AAPL", today="2024-06-03")
+        self.cache.update("AAPL", today="2024-06-03")
+        self.cache.update("AAPL", today="2024-06-06")
+
+        self.assertEqual(
+            self.source.calls,
+            [("AAPL", "2009-06-03", "2024-06-03"), ("AAPL", "2024-05-31", "2024-06-06")],
+        )
+        data = self.read("AAPL")
+        self.assertEqual(data["Date"].iloc[-1], "2024-06-05")
+        self.assertFalse(data["Date"].duplicated().any())
+        self.assertEqual(os.listdir(self.cache_dir).count("AAPL-YFin-data.csv"), 1)
+
+    def test_update_interrupted_before_metadata_write(self):
+        """Rerunning an update whose metadata write failed does not duplicate bars."""
+        self.cache.update("AAPL", today="2024-06-03")
+        with patch.object(self.cache, "_write_meta", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.cache.update("AAPL", today="2024-06-06")
+        # a second cache over the same directory, like another process
+        for cache in (self.cache, OnlinePriceCache(self.cache_dir, source=self.source)):
+            cache.update("AAPL", today="2024-06-06")
+
+        data = self.read("AAPL")
+        self.assertFalse(data["Date"].duplicated().any())
+        self.assertEqual(list(data["Date"].iloc[-3:]), ["2024-06-03", "2024-06-04", "2024-06-05"])
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["AAPL-YFin-data.csv", "AAPL-YFin-data.json"])
+
+    def test_readjusted_history_is_downloaded_again(self):
+        """A changed close on the overlapping bar triggers a full refresh."""
+        self.cache.update("AAPL", today="2024-06-03")
+        self.source.bars["Close"] = self.source.bars["Close"] * 0.5
+        self.cache.update("AAPL", today="2024-06-06")
+
+        self.assertEqual(self.source.calls[-1], ("AAPL", "2009-06-06", "2024-06-06"))
+        expected = self.source.bars[self.source.bars["Date"] < "2024-06-06"]
+        self.assertAlmostEqual(self.read("AAPL")["Close"].iloc[0], expected["Close"].iloc[0])
+
+    def test_compact_adopts_newest_legacy_file(self):
+        """Old date-stamped files are folded into the per-symbol cache."""
+        for end in ["2024-06-01", "2024-06-02"]:
+            self.source.download("MSFT", "2009-06-01", end).to_csv(
+                os.path.join(self.cache_dir, f"MSFT-YFin-data-2009-06-01-{end}.csv"),
+                index=False,
+            )
+        removed = self.cache.compact()
+
+        self.assertEqual(removed, ["MSFT-YFin-data-2009-06-01-2024-06-01.csv"])
+        self.assertEqual(
+            sorted(os.listdir(self.cache_dir)),
+            ["MSFT-YFin-data.csv", "MSFT-YFin-data.json"],
+        )
+        self.source.calls.clear()
+        self.cache.update("MSFT", today="2024-06-04")
+        self.assertEqual(self.source.calls, [("MSFT", "2024-05-31", "2024-06-04")])
+
+    def test_prune_removes_unused_symbols(self):
+        """Symbols not read within max_age_days are removed."""
+        self.cache.update("AAPL", today="2024-06-03")
+        self.assertEqual(self.cache.prune(max_age_days=1), [])
+        self.assertEqual(self.cache.prune(max_age_days=-1), ["AAPL"])
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test file for the columnar offline price store in price_store.py
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import shutil
+import tempfile
+
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.interface as interface
+import tradingagents.dataflows.price_store as price_store
+from tradingagents.dataflows.price_store import PriceStore
+from test_helpers import write_price_csv
+
+
+def legacy_window(path, start_date, end_date):
+    """The filtering get_YFin_data_window did before the price store."""
+    data = pd.read_csv(path)
+    data["DateOnly"] = data["Date"].str[:10]
+    filtered = data[(data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)]
+    return filtered.drop("DateOnly", axis=1)
+
+
+class TestPriceStore(unittest.TestCase):
+    """Test cases for PriceStore."""
+
+    def setUp(self):
+        """Set up a temporary DATA_DIR with one price CSV."""
+        self.data_dir = tempfile.mkdtemp()
+        self.price_dir = os.path.join(self.data_dir, "market_data", "price_data")
+        os.makedirs(self.price_dir)
+        self.csv_path = write_price_csv(
+            self.price_dir, "AAPL", "2020-01-01", "2020-06-30", " 00:00:00-05:00"
+        )
+        self.store = PriceStore(self.price_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_range_matches_csv_filter(self):
+        """Range queries return exactly the rows the CSV filter returned."""
+        expected = legacy_window(self.csv_path, "2020-02-10", "2020-03-15")
+        actual = self.store.get_range("AAPL", "2020-02-10", "2020-03-15")
+        self.assertEqual(expected.to_string(), actual.to_string())
+
+    def test_date_range_from_data(self):
+        """The date range comes from the data, not the file name."""
+        self.assertEqual(self.store.date_range("AAPL"), ("2020-01-01", "2020-06-30"))
+
+    def test_store_is_persisted_and_rebuilt_on_change(self):
+        """The columnar files are written once and refreshed when the CSV changes."""
+        self.store.series("AAPL")
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.data_dir, "market_data", "price_store", "AAPL", "meta.json")
+            )
+        )
+
+        os.remove(self.csv_path)
+        write_price_csv(self.price_dir, "AAPL", "2020-01-01", "2020-09-30")
+        self.assertEqual(self.store.date_range("AAPL"), ("2020-01-01", "2020-09-30"))
+
+    def test_rebuild_by_another_process_while_reading(self):
+        """A reader whose build is swapped out under it picks up the new build."""
+        symbol_dir = os.path.join(self.data_dir, "market_data", "price_store", "AAPL")
+        other = PriceStore(self.price_dir)
+        other.series("AAPL")
+        first_build = other._read_meta("AAPL")["build"]
+
+        read_meta = self.store._read_meta
+
+        def read_meta_then_rebuild(symbol):
+            meta = read_meta(symbol)
+            if meta is not None and meta["build"] == first_build:
+                other.build(symbol)
+            return meta
+
+        with patch.object(self.store, "_read_meta", side_effect=read_meta_then_rebuild):
+            self.assertEqual(self.store.date_range("AAPL"), ("2020-01-01", "2020-06-30"))
+
+        current = self.store._read_meta("AAPL")["build"]
+        self.assertNotEqual(current, first_build)
+        self.assertEqual(sorted(os.listdir(symbol_dir)), sorted([current, "meta.json"]))
+        self.assertEqual(
+            legacy_window(self.csv_path, "2020-02-10", "2020-03-15").to_string(),
+            self.store.get_range("AAPL", "2020-02-10", "2020-03-15").to_string(),
+        )
+
+    def test_read_only_dataset_uses_the_cache_dir(self):
+        """A read-only store dir is detected once and old stores in the cache dir are rebuilt."""
+        write_price_csv(self.price_dir, "MSFT", "2020-01-01", "2020-03-31")
+        cache_store = os.path.join(self.data_dir, "cache", "price_store")
+        os.makedirs(os.path.join(cache_store, "AAPL"))
+        with open(os.path.join(cache_store, "AAPL", "meta.json"), "w") as f:
+            json.dump({"version": 1, "source": list(PriceStore._fingerprint(self.csv_path))}, f)
+
+        config = {"data_cache_dir": os.path.join(self.data_dir, "cache")}
+        with patch.object(price_store, "get_config", return_value=config), \
+                patch.object(PriceStore, "_writable", return_value=False) as writable:
+            self.assertEqual(self.store.date_range("AAPL"), ("2020-01-01", "2020-06-30"))
+            self.assertEqual(self.store.date_range("MSFT"), ("2020-01-01", "2020-03-31"))
+        writable.assert_called_once()
+        self.assertEqual(self.store.store_dir, cache_store)
+        self.assertEqual(self.store._read_meta("AAPL")["version"], price_store._STORE_VERSION)
+        self.assertTrue(os.path.exists(os.path.join(cache_store, "MSFT", "meta.json")))
+
+    def test_missing_symbol(self):
+        """Unknown symbols raise FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            self.store.series("MSFT")
+
+    def test_get_YFin_data_uses_real_range(self):
+        """get_YFin_data rejects end dates past the last date in the data."""
+        with patch.object(interface, "DATA_DIR", self.data_dir):
+            data = interface.get_YFin_data("AAPL", "2020-03-01", "2020-03-31")
+            self.assertEqual(len(data), 22)
+            self.assertEqual(data.index[0], 0)
+            with self.assertRaises(Exception):
+                interface.get_YFin_data("AAPL", "2020-03-01", "2020-07-31")
+
+
+if __name__ == "__main__":
+    unittest.main()
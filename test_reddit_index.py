@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Test file for the per-day Reddit index in reddit_index.py
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+import re
+import sys
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.reddit_index import RedditFileIndex, get_reddit_index
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.reddit_utils import (
+    TickerMentionMatcher,
+    fetch_top_from_category,
+    fetch_top_from_category_range,
+    register_company,
+    search_terms,
+    ticker_to_company,
+)
+
+
+def write_reddit_jsonl(category_dir, subreddit, posts):
+    """Write a subreddit dump; posts are (day, hour, ups, title, selftext)."""
+    os.makedirs(category_dir, exist_ok=True)
+    path = os.path.join(category_dir, f"{subreddit}.jsonl")
+    with open(path, "w") as f:
+        for day, hour, ups, title, selftext in posts:
+            created = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            created += timedelta(hours=hour)
+            f.write(
+                json.dumps(
+                    {
+                        "created_utc": created.timestamp(),
+                        "title": title,
+                        "selftext": selftext,
+                        "url": f"https://reddit.com/{subreddit}/{title}",
+                        "ups": ups,
+                    }
+                )
+                + "\n"
+            )
+        f.write("\n")
+    return path
+
+
+class TestRedditIndex(unittest.TestCase):
+    """Test cases for the range API over the per-day index."""
+
+    def setUp(self):
+        """Set up a temporary DATA_DIR with global and company news dumps."""
+        self.data_dir = tempfile.mkdtemp()
+        self.reddit_dir = os.path.join(self.data_dir, "reddit_data")
+        global_dir = os.path.join(self.reddit_dir, "global_news")
+        company_dir = os.path.join(self.reddit_dir, "company_news")
+        self.world_path = write_reddit_jsonl(
+            global_dir,
+            "worldnews",
+            [
+                ("2024-06-01", 1, 10, "a", ""),
+                ("2024-06-01", 23, 30, "b", "text"),
+                ("2024-06-02", 5, 30, "c", ""),
+                ("2024-06-02", 6, 30, "d", ""),
+                ("2024-06-02", 7, 50, "e", ""),
+                ("2024-06-04", 0, 5, "f", ""),
+            ],
+        )
+        write_reddit_jsonl(
+            global_dir, "news", [("2024-06-02", 3, 1, "g", ""), ("2024-06-03", 3, 2, "h", "")]
+        )
+        write_reddit_jsonl(
+            company_dir,
+            "stocks",
+            [
+                ("2024-06-01", 1, 10, "Apple earnings", ""),
+                ("2024-06-01", 2, 90, "Oil prices", ""),
+                ("2024-06-02", 1, 20, "Markets", "buying more AAPL"),
+                ("2024-06-03", 1, 20, "Microsoft", ""),
+            ],
+        )
+        self.patcher = patch.object(interface, "DATA_DIR", self.data_dir)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def per_day(self, category, start, days, max_limit, query=None):
+        posts = []
+        for i in range(days):
+            day = (datetime.strptime(start, "%Y-%m-%d") + timedelta(days=i)).strftime("%Y-%m-%d")
+            posts.extend(fetch_top_from_category(category, day, max_limit, query, self.reddit_dir))
+        return posts
+
+    def test_range_matches_per_day_fetches(self):
+        """The range API returns exactly the concatenated per-day results."""
+        for max_limit in [2, 4, 6]:
+            self.assertEqual(
+                fetch_top_from_category_range(
+                    "global_news", "2024-05-31", "2024-06-04", max_limit, data_path=self.reddit_dir
+                ),
+                self.per_day("global_news", "2024-05-31", 5, max_limit),
+            )
+        self.assertEqual(
+            fetch_top_from_category_range(
+                "company_news", "2024-06-01", "2024-06-03", 3, "AAPL", self.reddit_dir
+            ),
+            self.per_day("company_news", "2024-06-01", 3, 3, "AAPL"),
+        )
+
+    def test_malformed_posts_are_skipped(self):
+        """Posts without a timestamp or upvotes, or cut-off lines, do not break the index."""
+        expected = fetch_top_from_category_range(
+            "global_news", "2024-06-01", "2024-06-04", 4, data_path=self.reddit_dir
+        )
+        created = datetime(2024, 6, 2, 8, tzinfo=timezone.utc).timestamp()
+        with open(self.world_path, "a") as f:
+            f.write(json.dumps({"title": "no timestamp", "selftext": "", "url": "u", "ups": 99}) + "\n")
+            f.write(json.dumps({"created_utc": created, "title": "no upvotes", "selftext": "", "url": "u"}) + "\n")
+            f.write('{"created_utc": 17172\n')
+
+        posts = fetch_top_from_category_range(
+            "global_news", "2024-06-01", "2024-06-04", 4, data_path=self.reddit_dir
+        )
+        self.assertEqual(posts, expected)
+        self.assertEqual(get_reddit_index(self.reddit_dir).file("global_news", "worldnews.jsonl").ups[-1], 0)
+
+    def test_limit_below_file_count_raises(self):
+        """A limit smaller than the category's file count is rejected."""
+        with self.assertRaises(ValueError):
+            fetch_top_from_category_range(
+                "global_news", "2024-06-01", "2024-06-02", 1, data_path=self.reddit_dir
+            )
+
+    def test_index_lives_outside_category_and_is_reused(self):
+        """Sidecars do not change the category's file count and are reloaded."""
+        get_reddit_index(self.reddit_dir).ingest("global_news")
+        self.assertEqual(len(os.listdir(os.path.join(self.reddit_dir, "global_news"))), 2)
+        index_path = os.path.join(self.reddit_dir, ".index", "global_news", "worldnews.jsonl.npz")
+        self.assertTrue(os.path.exists(index_path))
+        with patch.object(RedditFileIndex, "_build") as build:
+            RedditFileIndex(self.world_path, index_path)
+            build.assert_not_called()
+
+    def test_company_news_report(self):
+        """The company news tool only includes posts mentioning the company."""
+        report = interface.get_reddit_company_news("AAPL", "2024-06-03", 2, 3)
+        self.assertIn("### Apple earnings", report)
+        self.assertIn("buying more AAPL", report)
+        self.assertNotIn("Oil prices", report)
+
+
+class TestTickerMentionMatcher(unittest.TestCase):
+    """Test cases for the combined ticker mention matcher."""
+
+    def setUp(self):
+        """Set up a temporary company news dump."""
+        self.data_dir = tempfile.mkdtemp()
+        self.reddit_dir = os.path.join(self.data_dir, "reddit_data")
+        write_reddit_jsonl(
+            os.path.join(self.reddit_dir, "company_news"),
+            "stocks",
+            [
+                ("2024-06-01", 1, 10, "Rivian deliveries", ""),
+                ("2024-06-01", 2, 20, "Nothing here", "RIVN calls"),
+                ("2024-06-01", 3, 30, "Apple", ""),
+            ],
+        )
+        self.saved_mapping = dict(ticker_to_company)
+
+    def tearDown(self):
+        ticker_to_company.clear()
+        ticker_to_company.update(self.saved_mapping)
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_matches_per_term_search(self):
+        """The matcher finds exactly the tickers the per-term re.search finds."""
+        matcher = TickerMentionMatcher(ticker_to_company)
+        texts = [
+            "Apple and JP Morgan", "snap incorporated", "Snap Inc. beats", "ASML",
+            "ASML results", "johnson & johnson", "a mu b", "nothing", "K\u212a", "",
+        ]
+        for title in texts:
+            for selftext in texts:
+                post = {"title": title, "selftext": selftext}
+                expected = [
+                    ticker
+                    for ticker in sorted(ticker_to_company)
+                    if any(
+                        re.search(term, title, re.IGNORECASE)
+                        or re.search(term, selftext, re.IGNORECASE)
+                        for term in search_terms(ticker, ticker_to_company[ticker])
+                    )
+                ]
+                self.assertEqual(matcher.mentioned(post), expected)
+
+    def test_registered_company_is_indexed(self):
+        """Tickers added with register_company are found through the mention index."""
+        register_company("RIVN", ["Rivian", "Rivian Automotive"])
+        with patch.object(reddit_utils, "mentions_company") as per_post:
+            posts = fetch_top_from_category_range(
+                "company_news", "2024-06-01", "2024-06-01", 5, "RIVN", self.reddit_dir
+            )
+            per_post.assert_not_called()
+        self.assertEqual([post["title"] for post in posts], ["Nothing here", "Rivian deliveries"])
+
+    def test_unknown_ticker_is_searched_by_symbol(self):
+        """Tickers outside the mapping fall back to searching for the symbol."""
+        posts = fetch_top_from_category_range(
+            "company_news", "2024-06-01", "2024-06-01", 5, "RIVN", self.reddit_dir
+        )
+        self.assertEqual([post["title"] for post in posts], ["Nothing here"])
+
+
+if __name__ == "__main__":
+    unittest.main()
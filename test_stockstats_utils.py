@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test file for the indicator helpers in stockstats_utils.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.stockstats_utils import (
+    IndicatorCache,
+    NOT_TRADING_DAY,
+    StockstatsUtils,
+)
+from test_helpers import write_price_csv
+
+
+class TestIndicatorWindow(unittest.TestCase):
+    """Test cases for the single-pass indicator window."""
+
+    def setUp(self):
+        """Set up a temporary DATA_DIR with one price CSV."""
+        self.data_dir = tempfile.mkdtemp()
+        self.price_dir = os.path.join(self.data_dir, "market_data", "price_data")
+        os.makedirs(self.price_dir)
+        write_price_csv(self.price_dir, "AAPL", "2019-01-01", "2020-06-30")
+        self.patcher = patch.object(interface, "DATA_DIR", self.data_dir)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_window_matches_single_day_lookups(self):
+        """Every line of the window equals the per-day get_stockstats_indicator value."""
+        report = interface.get_stock_stats_indicators_window(
+            "AAPL", "macd", "2020-03-02", 10, False
+        )
+        lines = [line for line in report.splitlines() if line[:4] == "2020"]
+        self.assertEqual(
+            [line.split(": ")[0] for line in lines],
+            ["2020-03-02", "2020-02-28", "2020-02-27", "2020-02-26", "2020-02-25",
+             "2020-02-24", "2020-02-21"],
+        )
+        for line in lines:
+            date, value = line.split(": ")
+            self.assertEqual(
+                value, interface.get_stockstats_indicator("AAPL", "macd", date, False)
+            )
+
+    def test_batch_marks_non_trading_days(self):
+        """Dates without a bar get the not-a-trading-day marker."""
+        values = StockstatsUtils.get_stock_stats_window(
+            "AAPL", "rsi", ["2020-02-29", "2020-03-02"], self.price_dir
+        )
+        self.assertEqual(values["2020-02-29"], NOT_TRADING_DAY)
+        self.assertNotEqual(values["2020-03-02"], NOT_TRADING_DAY)
+
+    def test_missing_symbol_returns_empty_values(self):
+        """Errors are reported as empty values like the single-day lookup."""
+        values = interface.get_stockstats_indicator_window(
+            "MSFT", "rsi", ["2020-03-02"], False
+        )
+        self.assertEqual(values, {"2020-03-02": ""})
+
+
+class TestIndicatorCache(unittest.TestCase):
+    """Test cases for the process-wide indicator cache."""
+
+    def setUp(self):
+        """Set up a temporary price directory and an empty cache."""
+        self.data_dir = tempfile.mkdtemp()
+        self.price_dir = os.path.join(self.data_dir, "market_data", "price_data")
+        os.makedirs(self.price_dir)
+        self.csv_path = write_price_csv(self.price_dir, "AAPL", "2019-01-01", "2020-06-30")
+        StockstatsUtils.clear_cache()
+
+    def tearDown(self):
+        StockstatsUtils.clear_cache()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_hits_and_misses(self):
+        """The same symbol/indicator is computed once, other indicators miss."""
+        StockstatsUtils.get_stock_stats("AAPL", "rsi", "2020-03-02", self.price_dir)
+        StockstatsUtils.get_stock_stats("AAPL", "rsi", "2020-03-03", self.price_dir)
+        StockstatsUtils.get_stock_stats("AAPL", "macd", "2020-03-02", self.price_dir)
+        stats = StockstatsUtils.cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual(stats["entries"], 2)
+
+    def test_changed_file_is_not_served_stale(self):
+        """Rewriting the price file invalidates its cached columns."""
+        before = StockstatsUtils.get_stock_stats("AAPL", "close_10_ema", "2020-03-02", self.price_dir)
+        data = pd.read_csv(self.csv_path)
+        data["Close"] = data["Close"] * 2
+        data.to_csv(self.csv_path, index=False)
+        after = StockstatsUtils.get_stock_stats("AAPL", "close_10_ema", "2020-03-02", self.price_dir)
+        self.assertAlmostEqual(after, before * 2)
+        self.assertEqual(StockstatsUtils.cache_stats()["misses"], 2)
+
+    def test_max_bytes_follows_the_config(self):
+        """A later set_config(indicator_cache_max_bytes=...) resizes the process-wide cache."""
+        StockstatsUtils.get_stock_stats("AAPL", "rsi", "2020-03-02", self.price_dir)
+        StockstatsUtils.get_stock_stats("AAPL", "macd", "2020-03-02", self.price_dir)
+        max_bytes = get_config()["indicator_cache_max_bytes"]
+        self.addCleanup(set_config, {"indicator_cache_max_bytes": max_bytes})
+
+        entry_bytes = StockstatsUtils.cache_stats()["bytes"] // 2
+        set_config({"indicator_cache_max_bytes": entry_bytes})
+        stats = StockstatsUtils.cache_stats()
+        self.assertEqual((stats["max_bytes"], stats["entries"], stats["evictions"]), (entry_bytes, 1, 1))
+
+    def test_lru_eviction_by_size(self):
+        """Entries beyond the byte budget are evicted least recently used first."""
+        cache = IndicatorCache(max_bytes=160)
+        dates = np.array(["2020-01-01"], dtype="U10")
+        cache.put(("A", "rsi", 1), dates, np.zeros(4))
+        cache.put(("B", "rsi", 1), dates, np.zeros(4))
+        cache.get(("A", "rsi", 1))
+        cache.put(("C", "rsi", 1), dates, np.zeros(4))
+        self.assertIsNone(cache.get(("B", "rsi", 1)))
+        self.assertIsNotNone(cache.get(("A", "rsi", 1)))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
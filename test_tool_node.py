@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test file for the concurrent tool execution in graph/tool_node.py
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.graph.tool_node import ConcurrentToolNode
+
+
+class ConcurrencyProbe:
+    """Counts how many tool calls are running at once."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.active -= 1
+
+
+probe = ConcurrencyProbe()
+
+
+@tool
+def get_indicator(indicator: str, delay: float) -> str:
+    """Return the indicator name after delay seconds."""
+    with probe:
+        time.sleep(delay)
+    return f"{indicator} values"
+
+
+@tool
+def get_broken(ticker: str) -> str:
+    """Always fails."""
+    raise RuntimeError(f"no data for {ticker}")
+
+
+def turn(*calls):
+    """State whose last message asks for the given (name, args) tool calls."""
+    tool_calls = [
+        {"name": name, "args": args, "id": f"call_{i}"} for i, (name, args) in enumerate(calls)
+    ]
+    return {"messages": [HumanMessage("NVDA"), AIMessage(content="", tool_calls=tool_calls)]}
+
+
+class TestConcurrentToolNode(unittest.TestCase):
+    """Test cases for ConcurrentToolNode."""
+
+    def setUp(self):
+        probe.peak = 0
+        self.node = ConcurrentToolNode([get_indicator, get_broken], max_concurrency=3)
+        # slowest first, so finishing order differs from call order
+        self.calls = [
+            ("get_indicator", {"indicator": name, "delay": delay})
+            for name, delay in [("rsi", 0.2), ("macd", 0.1), ("atr", 0.05), ("vwma", 0.15), ("boll", 0.01)]
+        ]
+
+    def check_messages(self, messages):
+        self.assertEqual([m.tool_call_id for m in messages], [f"call_{i}" for i in range(5)])
+        self.assertEqual(
+            [m.content for m in messages],
+            ["rsi values", "macd values", "atr values", "vwma values", "boll values"],
+        )
+
+    def test_calls_run_concurrently_in_call_order(self):
+        """Results come back in call order with at most max_concurrency calls at once."""
+        started = time.perf_counter()
+        result = self.node.invoke(turn(*self.calls))
+        elapsed = time.perf_counter() - started
+
+        self.check_messages(result["messages"])
+        self.assertEqual(probe.peak, 3)
+        self.assertLess(elapsed, 0.45)
+
+    def test_async_calls(self):
+        result = asyncio.run(self.node.ainvoke(turn(*self.calls)))
+        self.check_messages(result["messages"])
+        self.assertLessEqual(probe.peak, 3)
+        self.assertGreater(probe.peak, 1)
+
+    def test_errors_become_messages(self):
+        """A failing or unknown tool answers with an error message, the other calls still run."""
+        result = self.node.invoke(
+            turn(
+                ("get_broken", {"ticker": "NVDA"}),
+                ("get_indicator", {"indicator": "rsi", "delay": 0}),
+                ("get_missing", {}),
+            )
+        )
+        broken, indicator, missing = result["messages"]
+        self.assertEqual(broken.status, "error")
+        self.assertIn("no data for NVDA", broken.content)
+        self.assertEqual(indicator.content, "rsi values")
+        self.assertEqual(missing.status, "error")
+        self.assertIn("get_missing is not a valid tool", missing.content)
+
+    def test_latency_stats(self):
+        """Per-call latency is recorded, and the speedup of running the calls together."""
+        self.node.invoke(turn(*self.calls))
+        self.node.invoke(turn(("get_broken", {"ticker": "NVDA"})))
+        stats = self.node.stats()
+
+        self.assertEqual(stats["batches"], 2)
+        self.assertEqual(stats["calls"], 6)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["tools"]["get_indicator"]["calls"], 5)
+        self.assertGreaterEqual(stats["tools"]["get_indicator"]["max_seconds"], 0.2)
+        self.assertGreater(stats["speedup"], 1.5)
+
+        self.node.reset_stats()
+        self.assertEqual(self.node.stats()["calls"], 0)
+
+    def test_toolkit_tools(self):
+        """The Toolkit's tools run through the node with their own argument schemas."""
+        node = ConcurrentToolNode([Toolkit.get_YFin_data, Toolkit.get_stockstats_indicators_report])
+        self.assertEqual(
+            sorted(node.tools_by_name), ["get_YFin_data", "get_stockstats_indicators_report"]
+        )
+        result = node.invoke(turn(("get_YFin_data", {"symbol": "NVDA"})))
+        self.assertEqual(result["messages"][0].status, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test file for the exchange session calendar in trading_calendar.py
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pandas_market_calendars as mcal
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.dataflows.trading_calendar as trading_calendar
+from tradingagents.dataflows.finnhub_utils import (
+    next_open_market_day,
+    previous_open_market_day,
+)
+from tradingagents.dataflows.trading_calendar import (
+    TradingCalendar,
+    get_trading_calendar,
+    load_exchange_calendar,
+)
+
+
+def schedule_previous(date_str):
+    """Previous session the way finnhub_utils used to find it, one schedule per call."""
+    date = pd.Timestamp(date_str)
+    schedule = mcal.get_calendar("NYSE").schedule(
+        start_date=date - pd.Timedelta(days=15), end_date=date
+    )
+    return schedule.index[schedule.index < date][-1].strftime("%Y-%m-%d")
+
+
+def schedule_next(date_str):
+    date = pd.Timestamp(date_str)
+    schedule = mcal.get_calendar("NYSE").schedule(
+        start_date=date, end_date=date + pd.Timedelta(days=15)
+    )
+    return schedule.index[schedule.index > date][0].strftime("%Y-%m-%d")
+
+
+SAMPLE_DATES = [
+    "2024-01-01",  # New Year's Day
+    "2024-01-02",
+    "2024-03-29",  # Good Friday
+    "2024-07-04",  # Independence Day, a Thursday
+    "2024-07-06",  # Saturday
+    "2024-07-07",  # Sunday
+    "2024-11-28",  # Thanksgiving
+    "2024-12-25",
+    "2025-01-09",  # national day of mourning
+    "2025-06-19",  # Juneteenth
+]
+
+
+class TestTradingCalendar(unittest.TestCase):
+    """Test cases for TradingCalendar and the cached exchange calendars."""
+
+    def setUp(self):
+        """Set up a temporary calendar cache directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.calendar = load_exchange_calendar("NYSE", 2023, 2025, cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.cache_dir)
+
+    def test_previous_and_next_match_schedule(self):
+        """Single lookups agree with the per-call pandas_market_calendars schedule."""
+        for date_str in SAMPLE_DATES:
+            self.assertEqual(self.calendar.previous(date_str), schedule_previous(date_str))
+            self.assertEqual(self.calendar.next(date_str), schedule_next(date_str))
+
+    def test_batch_lookups(self):
+        """The batch versions answer every date at once, for strings or datetime64 arrays."""
+        expected_previous = [schedule_previous(d) for d in SAMPLE_DATES]
+        expected_next = [schedule_next(d) for d in SAMPLE_DATES]
+
+        self.assertEqual(list(self.calendar.previous_many(SAMPLE_DATES)), expected_previous)
+        days = np.array(SAMPLE_DATES, dtype="datetime64[D]")
+        self.assertEqual(list(self.calendar.next_many(days)), expected_next)
+        self.assertEqual(
+            list(self.calendar.is_session_many(pd.DatetimeIndex(SAMPLE_DATES))),
+            [False, True, False, False, False, False, False, False, False, False],
+        )
+
+    def test_sessions_between(self):
+        """Sessions in a range are inclusive of both ends and skip holidays and weekends."""
+        self.assertEqual(
+            self.calendar.sessions_between("2024-07-01", "2024-07-08"),
+            ["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-05", "2024-07-08"],
+        )
+        self.assertEqual(self.calendar.sessions_between("2024-07-06", "2024-07-07"), [])
+
+    def test_out_of_span_dates_raise(self):
+        with self.assertRaises(ValueError):
+            self.calendar.previous("2022-06-01")
+        with self.assertRaises(ValueError):
+            self.calendar.next_many(["2024-06-03", "2026-06-01"])
+
+    def test_from_sessions(self):
+        """A calendar over given dates, e.g. the rows of a price file, edges included."""
+        calendar = TradingCalendar.from_sessions(["2024-01-05", "2024-01-03", "2024-01-05"])
+        self.assertEqual(calendar.sessions_between("2024-01-01", "2024-01-31"), ["2024-01-03", "2024-01-05"])
+        self.assertEqual(calendar.next("2024-01-03"), "2024-01-05")
+        with self.assertRaisesRegex(ValueError, "No previous open market day found"):
+            calendar.previous("2024-01-03")
+        with self.assertRaisesRegex(ValueError, "No next open market day found"):
+            calendar.next("2024-01-05")
+
+    def test_cache_file_is_reused(self):
+        """The second load reads the .npy file instead of building the schedule."""
+        cache_path = os.path.join(self.cache_dir, "NYSE-2023-01-01-2025-12-31.npy")
+        self.assertTrue(os.path.exists(cache_path))
+
+        with patch.object(trading_calendar, "_build_sessions") as build:
+            calendar = load_exchange_calendar("NYSE", 2023, 2025, cache_dir=self.cache_dir)
+        build.assert_not_called()
+        np.testing.assert_array_equal(calendar.sessions, self.calendar.sessions)
+
+    def test_process_wide_calendar(self):
+        """get_trading_calendar is shared and widens its span when a query needs more."""
+        config = {
+            "data_cache_dir": self.cache_dir,
+            "trading_calendar_start_year": 2024,
+            "trading_calendar_years_ahead": 1,
+        }
+        with patch.object(trading_calendar, "get_config", return_value=config), \
+                patch.dict(trading_calendar._calendars, clear=True):
+            calendar = get_trading_calendar("NYSE")
+            self.assertIs(get_trading_calendar("NYSE", start="2024-05-01", end="2024-05-01"), calendar)
+
+            wider = get_trading_calendar("NYSE", start="2023-12-29", end="2023-12-29")
+            self.assertEqual(str(wider.first_day), "2023-01-01")
+            self.assertEqual(wider.last_day, calendar.last_day)
+            self.assertEqual(wider.next("2023-12-29"), "2024-01-02")
+
+    def test_finnhub_open_market_days(self):
+        """finnhub_utils answers from the shared calendar with the same results as before."""
+        config = {
+            "data_cache_dir": self.cache_dir,
+            "trading_calendar_start_year": 2023,
+            "trading_calendar_years_ahead": 1,
+        }
+        with patch.object(trading_calendar, "get_config", return_value=config), \
+                patch.dict(trading_calendar._calendars, clear=True):
+            for date_str in SAMPLE_DATES:
+                self.assertEqual(previous_open_market_day(date_str), schedule_previous(date_str))
+                self.assertEqual(next_open_market_day(date_str), schedule_next(date_str))
+
+    def test_finnhub_open_market_days_across_year_ends(self):
+        """Lookups on Dec 31 and Jan 1 find sessions in the neighbouring year."""
+        config = {
+            "data_cache_dir": self.cache_dir,
+            "trading_calendar_start_year": 2024,
+            "trading_calendar_years_ahead": 0,
+        }
+        with patch.object(trading_calendar, "get_config", return_value=config), \
+                patch.dict(trading_calendar._calendars, clear=True):
+            for date_str in ("2024-01-01", "2027-12-31", "2028-01-01"):
+                self.assertEqual(previous_open_market_day(date_str), schedule_previous(date_str))
+                self.assertEqual(next_open_market_day(date_str), schedule_next(date_str))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test file for running TradingAgentsGraph end to end with a stub chat model
+"""
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import json
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tradingagents.graph.trading_graph as trading_graph
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+from test_helpers import StubMemory
+
+
+class StubLLM:
+    """Chat model stand-in that answers every prompt at once, without tool calls."""
+
+    def __init__(self, model=None, base_url=None):
+        self.calls = 0
+        self.delay = 0.0
+        self.failures = {}  # ticker -> how many more prompts about it raise, -1 for all
+        self._lock = threading.Lock()
+
+    def _reply(self, prompt):
+        text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+        with self._lock:
+            self.calls += 1
+            for ticker, remaining in self.failures.items():
+                if remaining and ticker in text:
+                    self.failures[ticker] -= 1
+                    raise RuntimeError(f"rate limited on {ticker}")
+        time.sleep(self.delay)
+        if "extract the investment decision" in text:
+            return AIMessage(content="BUY")
+        return AIMessage(content="Looks good. FINAL TRANSACTION PROPOSAL: **BUY**")
+
+    def bind_tools(self, tools):
+        async def areply(prompt):
+            return self._reply(prompt)
+
+        return RunnableLambda(self._reply, afunc=areply)
+
+    def invoke(self, prompt):
+        return self._reply(prompt)
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0.001)
+        return self._reply(prompt)
+
+
+class TestTradingAgentsGraph(unittest.TestCase):
+    """Test cases for propagate and apropagate."""
+
+    def setUp(self):
+        """Run in a temporary directory, eval_results is written to the working directory."""
+        self.work_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        patches = [
+            patch.object(trading_graph, "ChatOpenAI", StubLLM),
+            patch.object(trading_graph, "FinancialSituationMemory", StubMemory),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        config = DEFAULT_CONFIG.copy()
+        config["data_dir"] = self.work_dir
+        config["batch_retry_delay"] = 0.0
+        self.graph = TradingAgentsGraph(config=config)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.work_dir)
+
+    def test_apropagate_matches_propagate(self):
+        state, decision = self.graph.propagate("NVDA", "2024-05-10")
+        astate, adecision = asyncio.run(self.graph.apropagate("NVDA", "2024-05-10"))
+
+        self.assertEqual(decision, "BUY")
+        self.assertEqual(adecision, "BUY")
+        for key in state:
+            if key != "messages":
+                self.assertEqual(state[key], astate[key], key)
+        self.assertIs(self.graph.curr_state, astate)
+
+    def test_concurrent_apropagate_logs_each_ticker(self):
+        """Concurrent analyses each log to their own ticker's file."""
+        tickers = ["NVDA", "AAPL", "MSFT"]
+
+        async def run_all():
+            return await asyncio.gather(
+                *(self.graph.apropagate(ticker, "2024-05-10") for ticker in tickers)
+            )
+
+        results = asyncio.run(run_all())
+        self.assertEqual([state["company_of_interest"] for state, _ in results], tickers)
+        for ticker in tickers:
+            path = os.path.join(
+                "eval_results", ticker, "TradingAgentsStrategy_logs", "full_states_log.json"
+            )
+            with open(path) as f:
+                log = json.load(f)
+            self.assertEqual(log["2024-05-10"]["company_of_interest"], ticker)
+
+    def test_propagate_many_runs_the_grid(self):
+        """Every ticker x date job completes once, without touching the graph's own state."""
+        tickers = ["NVDA", "AAPL", "MSFT"]
+        dates = ["2024-05-09", "2024-05-10"]
+        self.graph.quick_thinking_llm.delay = 0.002
+        batch = self.graph.propagate_many(tickers, dates, max_concurrency=3)
+        results = list(batch)
+
+        self.assertEqual(
+            sorted((r["ticker"], r["trade_date"]) for r in results),
+            sorted((t, d) for t in tickers for d in dates),
+        )
+        for result in results:
+            self.assertEqual(result["decision"], "BUY")
+            self.assertIsNone(result["error"])
+            self.assertEqual(result["final_state"]["company_of_interest"], result["ticker"])
+            self.assertEqual(result["final_state"]["trade_date"], result["trade_date"])
+        self.assertIsNone(self.graph.curr_state)
+        self.assertIsNone(self.graph.ticker)
+
+        stats = batch.stats()
+        self.assertEqual(stats["total"], 6)
+        self.assertEqual(stats["succeeded"], 6)
+        self.assertEqual(stats["progress"], 1.0)
+        self.assertEqual(stats["running"], 0)
+        self.assertGreater(stats["jobs_per_second"], 0)
+
+        with open(os.path.join(
+            "eval_results", "AAPL", "TradingAgentsStrategy_logs", "full_states_log.json"
+        )) as f:
+            self.assertEqual(sorted(json.load(f)), dates)
+
+    def test_propagate_many_retries_and_records_failures(self):
+        """A flaky job succeeds on retry, a broken one is recorded and the rest still run."""
+        llm = self.graph.quick_thinking_llm
+        llm.failures = {"FLKY": 1, "BRKN": -1}
+        batch = self.graph.propagate_many(
+            ["NVDA", "FLKY", "BRKN"], "2024-05-10", max_concurrency=2, retries=2
+        )
+        results = {r["ticker"]: r for r in batch.results()}
+
+        self.assertEqual(results["NVDA"]["attempts"], 1)
+        self.assertEqual(results["FLKY"]["attempts"], 2)
+        self.assertEqual(results["FLKY"]["decision"], "BUY")
+        self.assertEqual(results["BRKN"]["attempts"], 3)
+        self.assertIsNone(results["BRKN"]["final_state"])
+        self.assertIn("rate limited on BRKN", results["BRKN"]["error"])
+
+        stats = batch.stats()
+        self.assertEqual((stats["succeeded"], stats["failed"], stats["retries"]), (2, 1, 3))
+
+    def test_propagate_many_overlaps_jobs(self):
+        self.graph.quick_thinking_llm.delay = 0.01
+        self.graph.deep_thinking_llm.delay = 0.01
+        tickers = [f"T{i}" for i in range(4)]
+
+        started = time.perf_counter()
+        self.graph.propagate(tickers[0], "2024-05-10")
+        one = time.perf_counter() - started
+
+        started = time.perf_counter()
+        list(self.graph.propagate_many(tickers, "2024-05-10", max_concurrency=4))
+        self.assertLess(time.perf_counter() - started, 2.5 * one)
+
+
+if __name__ == "__main__":
+    unittest.main()
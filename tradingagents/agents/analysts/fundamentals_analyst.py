@@ -1,10 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
 
 def create_fundamentals_analyst(llm, toolkit):
-    def fundamentals_analyst_node(state):
+    def fundamentals_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -47,13 +48,18 @@ def create_fundamentals_analyst(llm, toolkit):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def fundamentals_analyst_update(result):
         return {
             "messages": [result],
             "fundamentals_report": result.content,
         }
 
-    return fundamentals_analyst_node
+    def fundamentals_analyst_node(state):
+        return fundamentals_analyst_update(fundamentals_analyst_chain(state).invoke(state["messages"]))
+
+    async def afundamentals_analyst_node(state):
+        return fundamentals_analyst_update(await fundamentals_analyst_chain(state).ainvoke(state["messages"]))
+
+    return RunnableLambda(fundamentals_analyst_node, afunc=afundamentals_analyst_node)
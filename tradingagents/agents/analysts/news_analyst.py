@@ -1,10 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
 
 def create_news_analyst(llm, toolkit):
-    def news_analyst_node(state):
+    def news_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -44,12 +45,18 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def news_analyst_update(result):
         return {
             "messages": [result],
             "news_report": result.content,
         }
 
-    return news_analyst_node
+    def news_analyst_node(state):
+        return news_analyst_update(news_analyst_chain(state).invoke(state["messages"]))
+
+    async def anews_analyst_node(state):
+        return news_analyst_update(await news_analyst_chain(state).ainvoke(state["messages"]))
+
+    return RunnableLambda(news_analyst_node, afunc=anews_analyst_node)
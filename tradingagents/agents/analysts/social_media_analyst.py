@@ -1,10 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
 
 def create_social_media_analyst(llm, toolkit):
-    def social_media_analyst_node(state):
+    def social_media_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -43,13 +44,18 @@ def create_social_media_analyst(llm, toolkit):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def social_media_analyst_update(result):
         return {
             "messages": [result],
             "sentiment_report": result.content,
         }
 
-    return social_media_analyst_node
+    def social_media_analyst_node(state):
+        return social_media_analyst_update(social_media_analyst_chain(state).invoke(state["messages"]))
+
+    async def asocial_media_analyst_node(state):
+        return social_media_analyst_update(await social_media_analyst_chain(state).ainvoke(state["messages"]))
+
+    return RunnableLambda(social_media_analyst_node, afunc=asocial_media_analyst_node)
@@ -1,22 +1,23 @@
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
 
 def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
-
-        company_name = state["company_of_interest"]
-
-        history = state["risk_debate_state"]["history"]
-        risk_debate_state = state["risk_debate_state"]
+    def situation(state) -> str:
         market_research_report = state["market_report"]
         news_report = state["news_report"]
         fundamentals_report = state["news_report"]
         sentiment_report = state["sentiment_report"]
-        trader_plan = state["investment_plan"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+
+    def risk_manager_prompt(state, past_memories) -> str:
+
+        company_name = state["company_of_interest"]
+
+        history = state["risk_debate_state"]["history"]
+        trader_plan = state["investment_plan"]
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -42,8 +43,10 @@ Deliverables:
 ---
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
+        return prompt
 
-        response = llm.invoke(prompt)
+    def risk_manager_update(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -63,4 +66,14 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    def risk_manager_node(state) -> dict:
+        past_memories = memory.get_memories(situation(state), n_matches=2)
+        response = llm.invoke(risk_manager_prompt(state, past_memories))
+        return risk_manager_update(state, response)
+
+    async def arisk_manager_node(state) -> dict:
+        past_memories = await memory.aget_memories(situation(state), n_matches=2)
+        response = await llm.ainvoke(risk_manager_prompt(state, past_memories))
+        return risk_manager_update(state, response)
+
+    return RunnableLambda(risk_manager_node, afunc=arisk_manager_node)
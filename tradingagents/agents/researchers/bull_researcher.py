@@ -1,13 +1,16 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
 
 def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+    def situation(state) -> str:
+        return f"{state['market_report']}\n\n{state['sentiment_report']}\n\n{state['news_report']}\n\n{state['fundamentals_report']}"
+
+    def bull_prompt(state, past_memories) -> str:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
-        bull_history = investment_debate_state.get("bull_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
         market_research_report = state["market_report"]
@@ -15,9 +18,6 @@ def create_bull_researcher(llm, memory):
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
@@ -41,8 +41,12 @@ Last bear argument: {current_response}
 Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bull argument, refute the bear's concerns, and engage in a dynamic debate that demonstrates the strengths of the bull position. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
+        return prompt
 
-        response = llm.invoke(prompt)
+    def bull_update(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -56,4 +60,14 @@ Use this information to deliver a compelling bull argument, refute the bear's co
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    def bull_node(state) -> dict:
+        past_memories = memory.get_memories(situation(state), n_matches=2)
+        response = llm.invoke(bull_prompt(state, past_memories))
+        return bull_update(state, response)
+
+    async def abull_node(state) -> dict:
+        past_memories = await memory.aget_memories(situation(state), n_matches=2)
+        response = await llm.ainvoke(bull_prompt(state, past_memories))
+        return bull_update(state, response)
+
+    return RunnableLambda(bull_node, afunc=abull_node)
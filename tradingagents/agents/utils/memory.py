@@ -1,26 +1,58 @@
+import hashlib
+import math
+import re
+
 import chromadb
 from chromadb.config import Settings
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+FAKE_EMBEDDING_DIM = 256
+
+
+def fake_embedding(text, dim=FAKE_EMBEDDING_DIM):
+    """Deterministic offline embedding: hashed bag of words, unit length"""
+    vector = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        digest = hashlib.md5(word.encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "little") % dim] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
 
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
-        if config["backend_url"] == "http://localhost:11434/v1":
+        if config.get("llm_provider", "").lower() == "fake":
+            # offline runs, no embedding requests
+            self.embedding = "fake"
+        elif config["backend_url"] == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
         else:
             self.embedding = "text-embedding-3-small"
             self.client = OpenAI()
+            self.async_client = AsyncOpenAI()
         self.chroma_client = chromadb.Client(Settings(allow_reset=True))
         self.situation_collection = self.chroma_client.create_collection(name=name)
 
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
-        
+        if self.embedding == "fake":
+            return fake_embedding(text)
+
         response = self.client.embeddings.create(
             model=self.embedding, input=text
         )
         return response.data[0].embedding
 
+    async def aget_embedding(self, text):
+        """Get OpenAI embedding for a text without blocking the event loop"""
+        if self.embedding == "fake":
+            return fake_embedding(text)
+
+        response = await self.async_client.embeddings.create(
+            model=self.embedding, input=text
+        )
+        return response.data[0].embedding
+
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
 
@@ -47,7 +79,14 @@ class FinancialSituationMemory:
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
         query_embedding = self.get_embedding(current_situation)
+        return self._match(query_embedding, n_matches)
+
+    async def aget_memories(self, current_situation, n_matches=1):
+        """get_memories for async nodes, the embedding request is awaited"""
+        query_embedding = await self.aget_embedding(current_situation)
+        return self._match(query_embedding, n_matches)
 
+    def _match(self, query_embedding, n_matches):
         results = self.situation_collection.query(
             query_embeddings=[query_embedding],
             n_results=n_matches,
@@ -66,6 +105,34 @@ class FinancialSituationMemory:
 
         return matched_results
 
+    def export(self):
+        """All stored situations, advice and embeddings, as JSON-serializable records"""
+        stored = self.situation_collection.get(
+            include=["documents", "metadatas", "embeddings"]
+        )
+        return [
+            {
+                "id": stored["ids"][i],
+                "situation": stored["documents"][i],
+                "recommendation": stored["metadatas"][i]["recommendation"],
+                "embedding": [float(x) for x in stored["embeddings"][i]],
+            }
+            for i in range(len(stored["ids"]))
+        ]
+
+    def load(self, records):
+        """Replace the stored situations with records from export, without new embedding requests"""
+        existing = self.situation_collection.get(include=[])["ids"]
+        if existing:
+            self.situation_collection.delete(ids=existing)
+        if records:
+            self.situation_collection.add(
+                documents=[r["situation"] for r in records],
+                metadatas=[{"recommendation": r["recommendation"]} for r in records],
+                embeddings=[r["embedding"] for r in records],
+                ids=[r["id"] for r in records],
+            )
+
 
 if __name__ == "__main__":
     # Example usage
@@ -1,8 +1,21 @@
 from .finnhub_utils import get_data_in_range
 from .googlenews_utils import getNewsData
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import (
+    TickerMentionMatcher,
+    build_reddit_index,
+    fetch_top_from_category,
+    fetch_top_from_category_range,
+    register_company,
+)
 from .stockstats_utils import StockstatsUtils
+from .price_store import PriceStore, get_price_store
+from .price_cache import OnlinePriceCache, get_online_price_cache, prune_price_cache
+from .fundamentals_index import FundamentalsIndex, get_fundamentals_index
+from .finnhub_store import FinnhubStore, get_finnhub_store
+from .reddit_index import RedditIndex, get_reddit_index
+from .openai_cache import ResponseCache, get_openai_client, openai_cache_stats
+from .trading_calendar import TradingCalendar, get_trading_calendar
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -6,28 +6,33 @@ https://www.alphavantage.co/documentation/
 """
 
 import requests
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 import os
 import api_usage
 import json
-from typing import Literal
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Literal, Tuple
+from datetime import date, datetime, timedelta
 
 # Load environment variables from .env file
 load_dotenv()
 
-def _generate_backward_quarters(from_year:int):
-    '''Generate from current year & quarter to Q1 of the given year.
+def _generate_backward_quarters(from_year:int, today: date | None = None):
+    '''Generate from the last completed quarter (as of today) back to Q1 of the given year.
     '''
-    quarters = ['2025Q2', '2025Q1']
-    year= 2024
+    today = today or date.today()
+    year = today.year
+    quarter = (today.month - 1) // 3  # last completed quarter, 0 means Q4 of last year
+    if quarter == 0:
+        year, quarter = year - 1, 4
+    quarters = []
     while year >= from_year:
-        quarters.append(f'{year}Q4')
-        quarters.append(f'{year}Q3')
-        quarters.append(f'{year}Q2')
-        quarters.append(f'{year}Q1')
-        year = year-1
+        quarters.append(f'{year}Q{quarter}')
+        quarter -= 1
+        if quarter == 0:
+            year, quarter = year - 1, 4
     return quarters
 
 def _earnings_to_markdown(earnings):
@@ -57,11 +62,67 @@ def _earnings_to_markdown(earnings):
     
     return md_output
 
+def trailing_eps(earnings) -> pd.Series:
+    '''Sum of the last 4 reported EPS at each report date, newest report first.
+
+    earnings is the response of the EARNINGS function.
+    '''
+    qe = pd.DataFrame(earnings['quarterlyEarnings']).set_index('reportedDate')
+
+    # shift so latest reported date has value
+    eps_rolling = qe['reportedEPS'].rolling(window=4).sum().shift(-3)
+    return eps_rolling.dropna()
+
+
+def _report_dates_like(index: pd.Index, dates: pd.Index):
+    '''Report dates as values comparable with index, the way df.index > date compares them.'''
+    if isinstance(index, pd.DatetimeIndex):
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        if index.tz is not None:
+            dates = dates.tz_localize(index.tz)
+        return dates.asi8, index.asi8, ~index.isna()
+    values = np.asarray(index, dtype=object)
+    return np.asarray(dates, dtype=object), values, ~pd.isna(values)
+
+
+def align_trailing_eps(df: pd.DataFrame, eps_rolling: pd.Series):
+    '''Set df['eps'] to the trailing EPS of the latest report dated strictly before each row.
+
+    One as-of lookup over the whole index; rows on or before the oldest report
+    keep their value. eps_rolling is trailing_eps() output, newest report first.
+    '''
+    if eps_rolling.empty:
+        return df
+    if not eps_rolling.index.is_monotonic_decreasing or not eps_rolling.index.is_unique:
+        return _align_trailing_eps_loop(df, eps_rolling)
+
+    dates, values, valid = _report_dates_like(df.index, eps_rolling.index[::-1])
+    eps = eps_rolling.values[::-1]
+    # number of report dates strictly before each row
+    position = np.searchsorted(dates, values, side='left')
+    matched = valid & (position > 0)
+    df.loc[matched, 'eps'] = eps[position[matched] - 1]
+    return df
+
+
+def _align_trailing_eps_loop(df: pd.DataFrame, eps_rolling: pd.Series):
+    '''Report-by-report assignment, for report dates that are not strictly newest first.'''
+    previous_date = None
+    for date, eps in eps_rolling.items():
+        if previous_date is None:
+            df.loc[df.index > date, 'eps'] = eps
+        else:
+            df.loc[(df.index > date) & (df.index <= previous_date), 'eps'] = eps
+        previous_date =date
+    return df
+
+
 class AlphaVantageClient():
     def __init__(self, debug=False):
         # Get API key from environment
+        self._base_url = 'https://www.alphavantage.co/query'
         self._usage_table_name = 'AlphaVantage'
-        self._api_usage_client = api_usage.ApiUsageClient(self._usage_table_name, 25)
+        self._api_usage_client = api_usage.ApiUsageClient(self._usage_table_name, 25, per_minute_limit=5)
         self._api_keys = [os.getenv('ALPHA_VANTAGE_API_KEY'),
                     os.getenv('ALPHA_VANTAGE_API_KEY2')]
         self._debug = debug
@@ -72,9 +133,12 @@ class AlphaVantageClient():
         return self._api_usage_client.query_rpc(url, self._api_keys, debug= self._debug, result_is_csv = result_is_csv)
     
 
+    def _earnings_call_url(self, symbol:str, quarter:str):
+        return f'{self._base_url}?function=EARNINGS_CALL_TRANSCRIPT&symbol={symbol}&quarter={quarter}'
+
     def get_earnings_call(self, symbol:str, quarter='2025Q2'):
         # get earnings transcript
-        url = f'https://www.alphavantage.co/query?function=EARNINGS_CALL_TRANSCRIPT&symbol={symbol}&quarter={quarter}'
+        url = self._earnings_call_url(symbol, quarter)
         return self._query_rpc(url)
     
     def get_earnings_calendar(self, symbol:str|None = None, horizon_month: Literal[3,6,12] = 12):
@@ -83,7 +147,7 @@ class AlphaVantageClient():
         symbol_filter = ''
         if symbol:
             symbol_filter = f'&symbol={symbol}'
-        url = f'https://www.alphavantage.co/query?function=EARNINGS_CALENDAR{symbol_filter}&horizon={horizon_month}month'
+        url = f'{self._base_url}?function=EARNINGS_CALENDAR{symbol_filter}&horizon={horizon_month}month'
         return self._query_rpc(url, result_is_csv=True)
     
     def get_news(self, symbols:list[str]|None=None,
@@ -100,11 +164,11 @@ class AlphaVantageClient():
         formatted_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y%m%dT0000")
         symbol_filter = ''
         if symbols:
-            symbol_filter=f'&symbol={','.join(symbols)}'
+            symbol_filter='&symbol=' + ','.join(symbols)
         topic_filter = ''
         if topics:
-            topic_filter = f'&topics={','.join(topics)}'
-        news = self._query_rpc(f'https://www.alphavantage.co/query?function=NEWS_SENTIMENT{symbol_filter}{topic_filter}&time_from={formatted_date}&limit={limit}')
+            topic_filter = '&topics=' + ','.join(topics)
+        news = self._query_rpc(f'{self._base_url}?function=NEWS_SENTIMENT{symbol_filter}{topic_filter}&time_from={formatted_date}&limit={limit}')
         news_list = []
         fields= ['title', 'url', 'time_published', 'summary', 
                  'source', 'category_within_source', 'source_domain', 
@@ -136,7 +200,7 @@ class AlphaVantageClient():
             return df_news
     
     def get_earnings(self, symbol:str):
-        url = f'https://www.alphavantage.co/query?function=EARNINGS&symbol={symbol}'
+        url = f'{self._base_url}?function=EARNINGS&symbol={symbol}'
         return self._query_rpc(url)
     
     def add_eps_column(self, df: pd.DataFrame, symbol:str):
@@ -148,25 +212,45 @@ class AlphaVantageClient():
 
         df should have index which is date.
         '''
-        qe = pd.DataFrame(self.get_earnings(symbol)['quarterlyEarnings']).set_index('reportedDate')
-
-        # shift so latest reported date has value
-        eps_rolling = qe['reportedEPS'].rolling(window=4).sum().shift(-3)
-        previous_date = None
-        for date, eps in eps_rolling.dropna().items():
-            if previous_date is None:
-                df.loc[df.index > date, 'eps'] = eps
-            else:
-                df.loc[(df.index > date) & (df.index <= previous_date), 'eps'] = eps
-            previous_date =date
-        return df
+        return align_trailing_eps(df, trailing_eps(self.get_earnings(symbol)))
 
-    def get_earnings_from(self, symbol: str, from_year:int):
+    def add_eps_columns(self, frames: dict[str, pd.DataFrame], max_workers=4):
+        '''Batch add_eps_column: symbol -> frame, earnings are fetched concurrently.'''
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            earnings = dict(zip(frames, executor.map(self.get_earnings, frames)))
+        return {symbol: align_trailing_eps(df, trailing_eps(earnings[symbol]))
+                for symbol, df in frames.items()}
+
+    def iter_earnings_from(self, symbol: str, from_year:int, max_workers=4) -> Iterator[Tuple[str, dict]]:
+        '''Yield (quarter, earnings call) from the last completed quarter back to from_year.
+
+        Quarters already in the response cache are served from it; the rest are
+        fetched concurrently (the api usage client keeps them within each key's
+        daily and per-minute quota). Results are yielded in quarter order as
+        soon as each one and all the quarters before it have arrived.
+        '''
         quarters = _generate_backward_quarters(from_year)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            for quarter in quarters:
+                cached = self._api_usage_client.get_cache(self._earnings_call_url(symbol, quarter))
+                if cached is None:
+                    pending[quarter] = executor.submit(self.get_earnings_call, symbol, quarter)
+                else:
+                    pending[quarter] = cached
+            try:
+                for quarter in quarters:
+                    result = pending[quarter]
+                    yield quarter, result.result() if isinstance(result, Future) else result
+            finally:
+                for result in pending.values():
+                    if isinstance(result, Future):
+                        result.cancel()
+
+    def get_earnings_from(self, symbol: str, from_year:int):
         transcripts = []
         markdown_transcript = ''
-        for quarter in quarters:
-            earnings = self.get_earnings_call(symbol, quarter)
+        for quarter, earnings in self.iter_earnings_from(symbol, from_year):
             if len(earnings['transcript']) > 0:
                 markdown_transcript+= _earnings_to_markdown(earnings)
                 transcripts.append(json.dumps(earnings))
@@ -1,72 +1,342 @@
+import atexit
+import os
 import sqlite3
+import threading
+import time
+import zlib
+from collections import deque
 from datetime import datetime, date
 import requests
+import urllib3
 import pandas as pd
 import json
 from io import StringIO
 
-conn = sqlite3.connect("api_usage.db")
-cursor = conn.cursor()
+DEFAULT_DB_PATH = os.getenv("API_USAGE_DB", "api_usage.db")
+
+
+class UsageStore():
+    '''SQLite backend shared by the ApiUsageClients of one database file.
+
+    Every thread gets its own connection and the database runs in WAL mode so
+    readers do not block the writer. Paid API responses are committed as soon
+    as they are logged, so a crash loses none of them and other processes see
+    current quota counts; bookkeeping rows logged with batch=True are buffered
+    and committed in batches (and at exit). Responses are stored as zlib
+    compressed blobs; rows written as plain text by older versions are still
+    read as they are.
+    '''
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, batch_size=50, flush_interval=5.0):
+        self.db_path = os.path.abspath(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tables = set()
+        self._pending = []  # (table, usage_date, api_key, url, blob)
+        self._pending_urls = {}  # (table, url) -> blob, so unflushed responses are cache hits
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def ensure_table(self, table_name):
+        with self._lock:
+            if table_name in self._tables:
+                return
+            conn = self.connection()
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    usage_date DATE DEFAULT (DATE('now')),
+                    api_key TEXT,
+                    url TEXT,
+                    response TEXT
+                )
+            """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_url ON {table_name} (url)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_key_date ON {table_name} (api_key, usage_date)")
+            conn.commit()
+            self._tables.add(table_name)
+
+    @staticmethod
+    def _encode(response: str):
+        return sqlite3.Binary(zlib.compress(response.encode('utf-8')))
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode('utf-8')
+        return value
+
+    def get_response(self, table_name, url):
+        '''The first response logged for url, or None.'''
+        with self._lock:
+            pending = self._pending_urls.get((table_name, url))
+        if pending is not None:
+            return self._decode(bytes(pending))
+        row = self.connection().execute(f"""
+            SELECT response FROM {table_name}
+            WHERE url = ? ORDER BY id LIMIT 1
+        """, (url,)).fetchone()
+        if row is None:
+            return None
+        return self._decode(row[0])
+
+    def usage_counts(self, table_name, usage_date):
+        '''api_key -> number of usages logged on usage_date, including unflushed ones.'''
+        counts = dict(self.connection().execute(f"""
+            SELECT api_key, COUNT(*) FROM {table_name}
+            WHERE usage_date = ? GROUP BY api_key
+        """, (usage_date,)).fetchall())
+        with self._lock:
+            for row in self._pending:
+                if row[0] == table_name and row[1] == usage_date:
+                    counts[row[2]] = counts.get(row[2], 0) + 1
+        return counts
+
+    def count_usage(self, table_name, api_key, usage_date):
+        with self._lock:
+            pending = sum(1 for row in self._pending if row[0] == table_name and row[1] == usage_date and row[2] == api_key)
+        row = self.connection().execute(f"""
+            SELECT COUNT(*) FROM {table_name}
+            WHERE api_key = ? AND usage_date = ?
+        """, (api_key, usage_date)).fetchone()
+        return row[0] + pending
+
+    def log_usage(self, table_name, api_key, url, response: str, batch=False):
+        '''Record one usage; committed right away unless batch is set.'''
+        blob = self._encode(response)
+        with self._lock:
+            self._pending.append((table_name, date.today().isoformat(), api_key, url, blob))
+            self._pending_urls.setdefault((table_name, url), blob)
+            due = (not batch
+                   or len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        '''Commit the buffered usages in one transaction.'''
+        with self._lock:
+            if not self._pending:
+                self._last_flush = time.monotonic()
+                return
+            conn = self.connection()
+            by_table = {}
+            for table_name, usage_date, api_key, url, blob in self._pending:
+                by_table.setdefault(table_name, []).append((usage_date, api_key, url, blob))
+            with conn:
+                for table_name, rows in by_table.items():
+                    conn.executemany(f"INSERT INTO {table_name} (usage_date, api_key, url, response) VALUES (?, ?, ?, ?)", rows)
+            self._pending.clear()
+            self._pending_urls.clear()
+            self._last_flush = time.monotonic()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_usage_store(db_path=None):
+    '''Process-wide UsageStore for a database file, "api_usage.db" (or $API_USAGE_DB) by default.'''
+    db_path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = UsageStore(db_path)
+        return _stores[db_path]
+
+
+def _mask(api_key):
+    return f'{api_key[:4]}...{api_key[-2:]}' if len(api_key) > 8 else '...'
+
+
+class QuotaTracker():
+    '''In-memory per-key quota for one usage table.
+
+    Today's usage counts are loaded from the database once (and again when
+    the date changes); after that every request is counted in memory when a
+    key is handed out. Keys are used in rotation so the load is spread over
+    all of them, and a key is skipped while it has used up its daily limit or
+    its per-minute limit.
+    '''
+
+    def __init__(self, store, table_name, api_keys, daily_limit, per_minute_limit=None, clock=time.monotonic):
+        self._store = store
+        self._table_name = table_name
+        # missing keys (unset environment variables) are never tried
+        self._keys = [api_key for api_key in dict.fromkeys(api_keys) if api_key]
+        self._daily_limit = daily_limit
+        self._per_minute_limit = per_minute_limit
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._day = None
+        self._load()
+
+    def _load(self):
+        self._day = date.today().isoformat()
+        counts = self._store.usage_counts(self._table_name, self._day)
+        self._used = {api_key: counts.get(api_key, 0) for api_key in self._keys}
+        self._recent = {api_key: deque() for api_key in self._keys}
+        self._rotation = deque(api_key for api_key in self._keys if self._used[api_key] < self._daily_limit)
+
+    def _expire_minute(self, api_key, now):
+        recent = self._recent[api_key]
+        while recent and now - recent[0] >= 60:
+            recent.popleft()
+
+    def acquire(self, wait=True):
+        '''Reserve one request and return the key to use.
+
+        Raises when every key has used up its daily limit. When the remaining
+        keys are only limited for the current minute, waits for the earliest
+        one to free up (or raises if wait is False).
+        '''
+        while True:
+            with self._lock:
+                if date.today().isoformat() != self._day:
+                    self._load()
+                if not self._rotation:
+                    raise Exception("All API keys exceeded daily limit")
+
+                now = self._clock()
+                next_free = None
+                for _ in range(len(self._rotation)):
+                    api_key = self._rotation[0]
+                    self._rotation.rotate(-1)
+                    self._expire_minute(api_key, now)
+                    recent = self._recent[api_key]
+                    if self._per_minute_limit is None or len(recent) < self._per_minute_limit:
+                        self._used[api_key] += 1
+                        recent.append(now)
+                        if self._used[api_key] >= self._daily_limit:
+                            self._rotation.remove(api_key)
+                        return api_key
+                    free_at = recent[0] + 60
+                    next_free = free_at if next_free is None else min(next_free, free_at)
+
+            if not wait:
+                raise Exception("All API keys exceeded per-minute limit")
+            time.sleep(max(next_free - self._clock(), 0.01))
+
+    def release(self, api_key):
+        '''Give back a reservation whose request was not made.'''
+        with self._lock:
+            if api_key not in self._used or self._used[api_key] == 0:
+                return
+            if self._used[api_key] == self._daily_limit:
+                self._rotation.append(api_key)
+            self._used[api_key] -= 1
+            if self._recent[api_key]:
+                self._recent[api_key].pop()
+
+    def metrics(self):
+        '''Remaining quota per key (keys masked), for today and for the current minute.'''
+        with self._lock:
+            now = self._clock()
+            metrics = {}
+            for api_key in self._keys:
+                self._expire_minute(api_key, now)
+                metrics[_mask(api_key)] = {
+                    'used_today': self._used[api_key],
+                    'remaining_today': max(self._daily_limit - self._used[api_key], 0),
+                    'remaining_this_minute': (
+                        None if self._per_minute_limit is None
+                        else max(self._per_minute_limit - len(self._recent[api_key]), 0)
+                    ),
+                }
+            return metrics
+
+
+def _not_sent(error):
+    '''Whether a requests error happened before the request reached the server.'''
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
 
 class ApiUsageClient():
-    def __init__(self, table_name, daily_limit):
+    def __init__(self, table_name, daily_limit, db_path=None, per_minute_limit=None):
         self._table_name = table_name
         self._daily_limit = daily_limit
-    
-    # def create_db(self):
-    #     cursor.execute(f"""
-    #     CREATE TABLE IF NOT EXISTS {self._table_name} (
-    #         id INTEGER PRIMARY KEY AUTOINCREMENT,
-    #         usage_date DATE DEFAULT (DATE('now')),
-    #         api_key TEXT,
-    #         content TEXT,
-    #     )
-    #     """)
-    #     conn.commit()
-
-    def get_cache(self, url:str):
-        cursor.execute(f"""
-            SELECT response FROM {self._table_name}
-            WHERE url = ?
-        """, (url,))
-        rows= cursor.fetchall()
-        if len(rows) >0:
-            return json.loads(rows[0][0])
-        return None
+        self._per_minute_limit = per_minute_limit
+        self._store = get_usage_store(db_path)
+        self._store.ensure_table(table_name)
+
+    def quota(self, api_keys) -> QuotaTracker:
+        '''The process-wide tracker for this table and set of keys.'''
+        key = (self._store.db_path, self._table_name, tuple(api_keys))
+        with _trackers_lock:
+            if key not in _trackers:
+                _trackers[key] = QuotaTracker(self._store, self._table_name, api_keys,
+                                              self._daily_limit, self._per_minute_limit)
+            return _trackers[key]
+
+    def quota_metrics(self, api_keys):
+        '''Remaining daily and per-minute quota of each key.'''
+        return self.quota(api_keys).metrics()
+
+    def get_cache(self, url:str, result_is_csv=False):
+        response = self._store.get_response(self._table_name, url)
+        if response is None:
+            return None
+        if result_is_csv:
+            return pd.read_csv(StringIO(response))
+        return json.loads(response)
 
     def query_rpc(self, url, api_keys, result_is_csv = False, debug=False):
         '''Will append token to end of url and query.
         '''
-        response_cache = self.get_cache(url)
+        response_cache = self.get_cache(url, result_is_csv)
         if response_cache is not None:
             return response_cache
-        for api_key in api_keys:
-            count = self.get_usage_count_today(api_key)
-            if count < self._daily_limit:
-                url_with_key= f'{url}&apikey={api_key}'
-                if debug:
-                    print(url_with_key)
-                if result_is_csv:
-                    with requests.Session() as s:
-                        download = s.get(url_with_key)
-                        decoded_content = download.content.decode('utf-8')
-                        self.log_usage(api_key, url, decoded_content)
-                        # Use pandas to read the CSV data from the decoded string
-                        return pd.read_csv(StringIO(decoded_content))
-                else:
-                    response_json = requests.get(f'{url}&apikey={api_key}').json()
-                    self.log_usage(api_key, url, json.dumps(response_json))
-                    return response_json
-        raise Exception("All API keys exceeded daily limit")
-    
+        quota = self.quota(api_keys)
+        api_key = quota.acquire()
+        url_with_key= f'{url}&apikey={api_key}'
+        if debug:
+            print(url_with_key)
+        try:
+            if result_is_csv:
+                with requests.Session() as s:
+                    download = s.get(url_with_key)
+            else:
+                download = requests.get(url_with_key)
+        except requests.ConnectionError as e:
+            # the server may have counted a request that failed after connecting
+            if _not_sent(e):
+                quota.release(api_key)
+            raise
+        if result_is_csv:
+            decoded_content = download.content.decode('utf-8')
+        else:
+            response_json = download.json()
+        if result_is_csv:
+            self.log_usage(api_key, url, decoded_content)
+            # Use pandas to read the CSV data from the decoded string
+            return pd.read_csv(StringIO(decoded_content))
+        self.log_usage(api_key, url, json.dumps(response_json))
+        return response_json
+
     def get_usage_count_today(self, api_key: str):
         today_str = date.today().isoformat()
-        cursor.execute(f"""
-            SELECT COUNT(*) FROM {self._table_name}
-            WHERE api_key = ? AND usage_date = ?
-        """, (api_key, today_str))
-        return cursor.fetchone()[0]
+        return self._store.count_usage(self._table_name, api_key, today_str)
+
+    def log_usage(self, api_key: str, url: str, response: str, batch=False):
+        self._store.log_usage(self._table_name, api_key, url, response, batch)
 
-    def log_usage(self, api_key: str, url: str, response: str):
-        cursor.execute(f"INSERT INTO {self._table_name} (api_key, url, response) VALUES (?,?, ?)", (api_key,url,response))
-        conn.commit()
+    def flush(self):
+        '''Commit buffered usage rows now.'''
+        self._store.flush()
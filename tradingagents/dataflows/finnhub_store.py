@@ -0,0 +1,167 @@
+"""
+Indexed store over the Finnhub ``*_data_formatted.json`` files.
+
+The formatted files map a date (YYYY-MM-DD) to the list of entries for that
+day. Each file is converted once into an SQLite sidecar next to it,
+``{file}.sqlite``, holding one zlib-compressed JSON payload per date together
+with the size and mtime of the JSON it was built from. A (ticker, data_type,
+period) series is loaded from the sidecar once per process into date-sorted
+arrays, range queries are answered by bisection, and payloads are only
+decoded the first time a query touches them.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import Annotated, Dict, List, Optional, Tuple
+
+_SIDECAR_VERSION = 1
+
+
+class FinnhubSeries:
+    """All non-empty dates of one formatted Finnhub file, sorted by date."""
+
+    def __init__(self, json_path: str):
+        self.json_path = json_path
+        self.sidecar_path = f"{json_path}.sqlite"
+        self.fingerprint = self._fingerprint()
+        self._lock = threading.Lock()
+
+        rows = self._read_sidecar()
+        if rows is None:
+            rows = self._build_sidecar()
+        # rows are (date, position in the JSON file, compressed payload)
+        rows.sort(key=lambda row: row[0])
+        self.dates: List[str] = [row[0] for row in rows]
+        self.positions: List[int] = [row[1] for row in rows]
+        self._payloads: List[bytes] = [row[2] for row in rows]
+        self._values: List[Optional[list]] = [None] * len(rows)
+
+    def _fingerprint(self) -> str:
+        stat = os.stat(self.json_path)
+        return f"{_SIDECAR_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _read_sidecar(self) -> Optional[List[Tuple[str, int, bytes]]]:
+        if not os.path.exists(self.sidecar_path):
+            return None
+        try:
+            conn = sqlite3.connect(self.sidecar_path)
+            try:
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'fingerprint'"
+                ).fetchone()
+                if row is None or row[0] != self.fingerprint:
+                    return None
+                return conn.execute(
+                    "SELECT date, position, payload FROM entries"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+
+    def _build_sidecar(self) -> List[Tuple[str, int, bytes]]:
+        with open(self.json_path, "r") as f:
+            data = json.load(f)
+
+        rows = [
+            (key, position, zlib.compress(json.dumps(value).encode("utf-8")))
+            for position, (key, value) in enumerate(data.items())
+            if len(value) > 0
+        ]
+
+        tmp_path = f"{self.sidecar_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute(
+                    "CREATE TABLE entries (date TEXT, position INTEGER, payload BLOB)"
+                )
+                conn.execute("CREATE INDEX idx_entries_date ON entries (date)")
+                conn.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+                conn.execute(
+                    "INSERT INTO meta VALUES ('fingerprint', ?)", (self.fingerprint,)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+            os.replace(tmp_path, self.sidecar_path)
+        except (OSError, sqlite3.Error):
+            # read-only data directory, keep the series in memory only
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return rows
+
+    def _value(self, i: int) -> list:
+        value = self._values[i]
+        if value is None:
+            value = json.loads(zlib.decompress(self._payloads[i]).decode("utf-8"))
+            self._values[i] = value
+        return value
+
+    def get_range(self, start_date: str, end_date: str) -> Dict[str, list]:
+        """Entries dated start_date..end_date inclusive, in the JSON file's order."""
+        lo = bisect_left(self.dates, start_date)
+        hi = bisect_right(self.dates, end_date)
+        hits = sorted(range(lo, hi), key=lambda i: self.positions[i])
+        with self._lock:
+            return {self.dates[i]: self._value(i) for i in hits}
+
+
+class FinnhubStore:
+    """Loads each formatted Finnhub file once and serves date-range queries."""
+
+    def __init__(self, data_dir: Annotated[str, "directory where the data is saved"]):
+        self.data_dir = data_dir
+        self._series: Dict[str, FinnhubSeries] = {}
+        self._lock = threading.Lock()
+
+    def path(self, ticker: str, data_type: str, period: Optional[str] = None) -> str:
+        if period:
+            file_name = f"{ticker}_{period}_data_formatted.json"
+        else:
+            file_name = f"{ticker}_data_formatted.json"
+        return os.path.join(self.data_dir, "finnhub_data", data_type, file_name)
+
+    def series(
+        self, ticker: str, data_type: str, period: Optional[str] = None
+    ) -> FinnhubSeries:
+        """The loaded series for a file, reloaded if the JSON has changed."""
+        json_path = self.path(ticker, data_type, period)
+        series = self._series.get(json_path)
+        if series is not None and series.fingerprint == series._fingerprint():
+            return series
+
+        with self._lock:
+            series = self._series.get(json_path)
+            if series is None or series.fingerprint != series._fingerprint():
+                series = FinnhubSeries(json_path)
+                self._series[json_path] = series
+            return series
+
+    def get_range(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        start_date: Annotated[str, "Start date in YYYY-MM-DD format"],
+        end_date: Annotated[str, "End date in YYYY-MM-DD format"],
+        data_type: Annotated[str, "insider_trans, SEC_filings, news_data, insider_senti, or fin_as_reported"],
+        period: Annotated[Optional[str], "annual or quarterly, if the data has a period"] = None,
+    ) -> Dict[str, list]:
+        return self.series(ticker, data_type, period).get_range(start_date, end_date)
+
+
+_stores: Dict[str, FinnhubStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_finnhub_store(data_dir: str) -> FinnhubStore:
+    """Process-wide FinnhubStore for a data directory."""
+    key = os.path.abspath(data_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = FinnhubStore(data_dir)
+        return _stores[key]
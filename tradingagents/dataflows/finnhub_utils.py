@@ -7,17 +7,23 @@ https://finnhub.io/docs/api/
 
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Literal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
 
 import finnhub
 import pandas as pd
-import pandas_market_calendars as mcal
 import requests
 import yfinance as yf
 from dotenv import load_dotenv
 from tabulate import tabulate
 
+from .config import get_config
+from .finnhub_store import get_finnhub_store
+from .price_store import get_price_store
+from .trading_calendar import get_trading_calendar
+
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
     """
@@ -28,29 +34,14 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         data_type (str): Type of data from finnhub to fetch. Can be insider_trans, SEC_filings, news_data, insider_senti, or fin_as_reported.
         data_dir (str): Directory where the data is saved.
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
+    Returns:
+        dict: date -> non-empty list of entries, for the dates in the range. The
+        entries are shared with the store's cache and must not be modified.
     """
 
-    if period:
-        data_path = os.path.join(
-            data_dir,
-            "finnhub_data",
-            data_type,
-            f"{ticker}_{period}_data_formatted.json",
-        )
-    else:
-        data_path = os.path.join(
-            data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
-        )
-
-    data = open(data_path, "r")
-    data = json.load(data)
-
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    return get_finnhub_store(data_dir).get_range(
+        ticker, start_date, end_date, data_type, period
+    )
 
 
 # Load environment variables from .env file
@@ -89,60 +80,125 @@ def get_earnings_calendar(start_date: str, end_date: str):
         print(f"Error {response.status_code}: {response.text}")
 
 
-def previous_open_market_day(date_str: str) -> str:
-    nyse = mcal.get_calendar("NYSE")
-    date = datetime.strptime(date_str, "%Y-%m-%d")
-
-    # Get the previous 10 business days including the target day
-    schedule = nyse.schedule(
-        start_date=(date - timedelta(days=15)).strftime("%Y-%m-%d"),
-        end_date=date.strftime("%Y-%m-%d"),
+def _nyse_calendar_around(date_str: str, days: int = 15):
+    """NYSE calendar spanning days either side of date_str, across year ends too."""
+    date = pd.Timestamp(date_str[:10])
+    return get_trading_calendar(
+        "NYSE", start=date - pd.Timedelta(days=days), end=date + pd.Timedelta(days=days)
     )
 
-    # Find all market open days before the given date
-    open_days = schedule.index[schedule.index < date].sort_values()
 
-    if not open_days.empty:
-        return open_days[-1].strftime("%Y-%m-%d")
-    else:
-        raise ValueError("No previous open market day found")
+def previous_open_market_day(date_str: str) -> str:
+    """Latest NYSE session strictly before date_str."""
+    return _nyse_calendar_around(date_str).previous(date_str)
 
 
 def next_open_market_day(date_str: str) -> str:
-    nyse = mcal.get_calendar("NYSE")
-    date = datetime.strptime(date_str, "%Y-%m-%d")
+    """Earliest NYSE session strictly after date_str."""
+    return _nyse_calendar_around(date_str).next(date_str)
 
-    # Get the previous 10 business days including the target day
-    schedule = nyse.schedule(
-        start_date=date, end_date=(date + timedelta(days=15)).strftime("%Y-%m-%d")
-    )
 
-    # Find all market open days before the given date
-    open_days = schedule.index[schedule.index > date].sort_values()
+_profile_cache: Dict[Tuple[str, bool], Tuple[float, dict]] = {}
+_profile_cache_lock = threading.Lock()
 
-    if not open_days.empty:
-        return open_days[0].strftime("%Y-%m-%d")
-    else:
-        raise ValueError("No next open market day found")
+
+def get_company_profiles(
+    symbols: Iterable[str], max_workers=8, use_finnhub_for_profile=False
+) -> Dict[str, dict]:
+    """
+    get_company_profile for many symbols, fetched concurrently by a bounded pool.
+
+    Profiles are kept in memory for profile_cache_ttl_seconds, so repeated
+    screens do not scrape the same symbols again. Symbols whose profile
+    cannot be fetched are reported and left out.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    ttl = get_config()["profile_cache_ttl_seconds"]
+    now = time.time()
+    profiles, missing = {}, []
+    with _profile_cache_lock:
+        for symbol in symbols:
+            cached = _profile_cache.get((symbol, use_finnhub_for_profile))
+            if cached is not None and (ttl is None or now - cached[0] <= ttl):
+                profiles[symbol] = dict(cached[1])
+            else:
+                missing.append(symbol)
+
+    def fetch(symbol):
+        try:
+            return get_company_profile(symbol, use_finnhub_for_profile)
+        except Exception as e:
+            print(e)
+            return None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            fetched = list(executor.map(fetch, missing))
+        with _profile_cache_lock:
+            for symbol, profile in zip(missing, fetched):
+                if profile is not None:
+                    _profile_cache[(symbol, use_finnhub_for_profile)] = (time.time(), profile)
+                    profiles[symbol] = dict(profile)
+
+    # same order as the symbols asked for
+    return {symbol: profiles[symbol] for symbol in symbols if symbol in profiles}
+
+
+def get_session_prices(
+    symbols: List[str], first_date: str, last_date: str, price_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Daily bars of the symbols on first_date and last_date, one row per (Date, Ticker).
+
+    Symbols whose local price data (price_dir, DATA_DIR/market_data/price_data
+    by default) has both sessions are served from the price store; the rest
+    are downloaded from yfinance for just the span between the two dates.
+    """
+    price_dir = price_dir or os.path.join(
+        get_config()["data_dir"], "market_data", "price_data"
+    )
+    store = get_price_store(price_dir)
+    frames, remote = [], []
+    for symbol in symbols:
+        try:
+            series = store.series(symbol)
+        except OSError:
+            remote.append(symbol)
+            continue
+        if not (series.has_date(first_date) and series.has_date(last_date)):
+            remote.append(symbol)
+            continue
+        lo, hi = series.slice_bounds(first_date, first_date)
+        rows = series.to_frame(lo, hi)
+        lo, hi = series.slice_bounds(last_date, last_date)
+        rows = pd.concat([rows, series.to_frame(lo, hi)])
+        rows["Date"] = pd.to_datetime(rows["Date"].astype(str).str[:10])
+        rows["Ticker"] = symbol
+        frames.append(rows)
+
+    if remote:
+        end = (pd.Timestamp(last_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        downloaded = yf.download(remote, start=first_date, end=end, progress=False)
+        if not downloaded.empty:
+            # future_stack keeps the rows of tickers without data, drop them as stack() used to
+            frames.append(
+                downloaded.stack(level=1, future_stack=True).dropna(how="all").reset_index()
+            )
+
+    if not frames:
+        return pd.DataFrame(columns=["Date", "Ticker", "Open", "High", "Low", "Close", "Volume"])
+    return pd.concat(frames, ignore_index=True)
 
 
 def get_earnings_and_profiles(
-    earning_release_date: str, hour: Literal["amc", "bmo"], stock_limit=50
+    earning_release_date: str, hour: Literal["amc", "bmo"], stock_limit=50, max_workers=8
 ):
     df_earnings = get_earnings_calendar(earning_release_date, earning_release_date)
     df_earnings = df_earnings.sort_values(by="revenueActual", ascending=False).head(
         stock_limit
     )
-    company_profiles = {}
-
-    for _, row in df_earnings.iterrows():
-        try:
-            company_profiles[row["symbol"]] = get_company_profile(row["symbol"])
-        except Exception as e:
-            print(e)
+    symbols = df_earnings.symbol.tolist()
 
-    # Dictionary with keys as rows (default)
-    df_company_profiles = pd.DataFrame(company_profiles).T
     if hour == "amc":
         # next day
         before_earning_date = earning_release_date
@@ -151,15 +207,21 @@ def get_earnings_and_profiles(
         # the same day
         before_earning_date = previous_open_market_day(earning_release_date)
         after_earning_date = earning_release_date
-    stock_data = (
-        yf.download(df_earnings.symbol.tolist(), period="1y")
-        .stack(level=1)
-        .reset_index()
-    )
+
+    # prices load while the profiles are scraped
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        prices = executor.submit(
+            get_session_prices, symbols, before_earning_date, after_earning_date
+        )
+        company_profiles = get_company_profiles(symbols, max_workers=max_workers)
+        stock_data = prices.result()
+
+    # Dictionary with keys as rows (default)
+    df_company_profiles = pd.DataFrame(company_profiles).T
     df_ep_p = (
-        stock_data.query(f'Date == "{before_earning_date}"')
+        stock_data[stock_data["Date"] == pd.Timestamp(before_earning_date)]
         .merge(
-            stock_data.query(f'Date == "{after_earning_date}"'),
+            stock_data[stock_data["Date"] == pd.Timestamp(after_earning_date)],
             on="Ticker",
             suffixes=["", "_1"],
         )
@@ -237,9 +299,7 @@ if __name__ == "__main__":
     # response = get_company_profile('AAPL')
     df_earnings = get_earnings_calendar("2025-07-20", "2025-07-26")
     df_earnings = df_earnings.sort_values(by="revenueActual", ascending=False).head(50)
-    company_profiles = {}
-    for index, row in df_earnings.iterrows():
-        company_profiles[row["symbol"]] = get_company_profile(row["symbol"])
+    company_profiles = get_company_profiles(df_earnings["symbol"])
     # Dictionary with keys as rows (default)
     df_company_profiles = pd.DataFrame(company_profiles).T
     df_earning_with_profile = df_earnings.merge(
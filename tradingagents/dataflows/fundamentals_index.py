@@ -0,0 +1,128 @@
+"""
+Point-in-time index over the SimFin statement CSVs.
+
+Each ``us-{statement}-{freq}.csv`` is parsed once, partitioned by ticker with
+rows sorted by Publish Date, and pickled next to the CSV together with the
+CSV's size and mtime. An as-of lookup is then a dictionary hit plus a binary
+search over that ticker's publish dates, and only reports published on or
+before the trading date are ever visible.
+"""
+
+import os
+import pickle
+import threading
+from typing import Annotated, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_INDEX_VERSION = 1
+
+
+class FundamentalsIndex:
+    """As-of lookups into one SimFin statement file."""
+
+    def __init__(self, csv_path: Annotated[str, "path of a SimFin statement CSV"]):
+        self.csv_path = csv_path
+        self.index_path = f"{csv_path}.asof-index.pkl"
+        self.fingerprint = self._fingerprint()
+        self._load()
+
+    def _fingerprint(self) -> Tuple:
+        stat = os.stat(self.csv_path)
+        return (_INDEX_VERSION, stat.st_size, stat.st_mtime_ns)
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                saved = pickle.load(f)
+            if saved["fingerprint"] == self.fingerprint:
+                self.frame = saved["frame"]
+                self.tickers = saved["tickers"]
+                self.publish_dates = saved["publish_dates"]
+                return
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+
+        self._build()
+        try:
+            tmp_path = f"{self.index_path}.tmp-{os.getpid()}"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {
+                        "fingerprint": self.fingerprint,
+                        "frame": self.frame,
+                        "tickers": self.tickers,
+                        "publish_dates": self.publish_dates,
+                    },
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # read-only dataset, keep the index in memory only
+            pass
+
+    def _build(self):
+        df = pd.read_csv(self.csv_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        # rows without a ticker or publish date can never match an as-of query
+        df = df[df["Ticker"].notna() & df["Publish Date"].notna()]
+
+        # stable sort keeps the original row order among equal publish dates
+        df = df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+        tickers = df["Ticker"].astype(str).values
+        starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+        ends = np.r_[starts[1:], len(tickers)]
+
+        self.frame = df
+        self.tickers: Dict[str, Tuple[int, int]] = {
+            tickers[start]: (int(start), int(end)) for start, end in zip(starts, ends)
+        }
+        self.publish_dates = df["Publish Date"].values.astype("datetime64[ns]").astype(np.int64)
+
+    def as_of(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """
+        The latest report for ticker published on or before curr_date, or None.
+        Among reports published on the same day the first one in the file wins.
+        """
+        bounds = self.tickers.get(ticker)
+        if bounds is None:
+            return None
+        start, end = bounds
+
+        curr = pd.to_datetime(curr_date, utc=True).normalize().value
+        dates = self.publish_dates[start:end]
+        pos = int(np.searchsorted(dates, curr, side="right"))
+        if pos == 0:
+            return None
+        first = int(np.searchsorted(dates, dates[pos - 1], side="left"))
+        return self.frame.iloc[start + first]
+
+
+_indexes: Dict[str, FundamentalsIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_fundamentals_index(csv_path: str) -> FundamentalsIndex:
+    """Process-wide index for a statement CSV, rebuilt when the CSV changes."""
+    key = os.path.abspath(csv_path)
+    index = _indexes.get(key)
+    if index is not None and index.fingerprint == index._fingerprint():
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.fingerprint != index._fingerprint():
+            index = FundamentalsIndex(csv_path)
+            _indexes[key] = index
+        return index
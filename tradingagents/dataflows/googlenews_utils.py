@@ -1,6 +1,10 @@
+import hashlib
 import json
+import os
+import threading
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import random
@@ -12,6 +16,8 @@ from tenacity import (
     retry_if_result,
 )
 
+from .config import get_config
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -31,12 +37,250 @@ def make_request(url, headers):
     return response
 
 
-def getNewsData(query, start_date, end_date):
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by concurrent page requests.
+
+    The refill rate adapts to the server: it is halved on every 429 (and the
+    bucket is paused for Retry-After seconds when given) and grows back
+    additively with each successful request, up to max_rate.
+    """
+
+    def __init__(self, rate, capacity=1.0, min_rate=0.05, max_rate=None, increase=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.increase = increase if increase is not None else self.max_rate / 10
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Process-wide limiter for Google News requests, configured by google_news_rate."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            rate = get_config()["google_news_rate"]
+            _limiter = TokenBucket(rate, min_rate=rate / 20)
+        return _limiter
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_page(url, headers, limiter, max_attempts=5):
+    """Request url under the limiter, retrying 429 responses at the limiter's slowed rate."""
+    for _ in range(max_attempts):
+        limiter.acquire()
+        response = requests.get(url, headers=headers, timeout=30)
+        if not is_rate_limited(response):
+            limiter.on_success()
+            return response
+        limiter.on_rate_limited(_retry_after(response))
+    return response
+
+
+def parse_results(content):
+    """News results on a result page and whether it links to a next page."""
+    soup = BeautifulSoup(content, "html.parser")
+    results_on_page = soup.select("div.SoaBEf")
+    news_results = []
+    for el in results_on_page:
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+    has_next = soup.find("a", id="pnnext") is not None
+    return news_results, bool(results_on_page), has_next
+
+
+def _cache_path(cache_dir, query, start_date, end_date):
+    key = json.dumps([query, start_date, end_date])
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def _read_cache(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)["news_results"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+def _write_cache(path, query, start_date, end_date, news_results):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {
+                "query": query,
+                "start_date": start_date,
+                "end_date": end_date,
+                "news_results": news_results,
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def _fetch_sequential(url_for_page, headers):
+    """The original page-by-page walk. Returns (news_results, complete)."""
+    news_results = []
+    page = 0
+    while True:
+        try:
+            response = make_request(url_for_page(page), headers)
+            results_on_page, has_results, has_next = parse_results(response.content)
+
+            if not has_results:
+                return news_results, True  # No more results found
+
+            news_results.extend(results_on_page)
+
+            # Check for the "Next" link (pagination)
+            if not has_next:
+                return news_results, True
+
+            page += 1
+
+        except Exception as e:
+            print(f"Failed after multiple retries: {e}")
+            return news_results, False
+
+
+def _fetch_concurrent(url_for_page, headers, concurrency, limiter):
+    """
+    Request pages in windows under the shared limiter and keep them in page
+    order up to the last page. The window starts at one page and doubles up to
+    `concurrency`, so short result lists do not pay for speculative requests.
+    Returns (news_results, complete).
+    """
+    news_results = []
+    page = 0
+    window = 1
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            futures = [
+                executor.submit(fetch_page, url_for_page(p), headers, limiter)
+                for p in range(page, page + window)
+            ]
+            for future in futures:
+                try:
+                    response = future.result()
+                    if is_rate_limited(response):
+                        raise RuntimeError("still rate limited after retries")
+                    results_on_page, has_results, has_next = parse_results(
+                        response.content
+                    )
+                except Exception as e:
+                    print(f"Failed after multiple retries: {e}")
+                    for pending in futures:
+                        pending.cancel()
+                    return news_results, False
+
+                if not has_results:
+                    return news_results, True  # No more results found
+
+                news_results.extend(results_on_page)
+
+                # Check for the "Next" link (pagination)
+                if not has_next:
+                    for pending in futures:
+                        pending.cancel()
+                    return news_results, True
+
+            page += window
+            window = min(window * 2, concurrency)
+
+
+def getNewsData(
+    query,
+    start_date,
+    end_date,
+    concurrency=None,
+    base_url=None,
+    cache_dir=None,
+    limiter=None,
+):
     """
     Scrape Google News search results for a given query and date range.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    concurrency: int - pages requested at a time, defaults to google_news_concurrency;
+        0 walks the pages one by one with the original randomized delays
+    base_url: str - search endpoint, defaults to google_news_base_url
+    cache_dir: str - where parsed results are cached, defaults to data_cache_dir/google_news
+    limiter: TokenBucket - rate limiter, defaults to the process-wide one
+
+    Results of windows that ended before today are cached on disk by query and
+    dates, so repeated runs over the same history do not hit the network.
     """
     if "-" in start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
@@ -45,64 +289,38 @@ def getNewsData(query, start_date, end_date):
         end_date = datetime.strptime(end_date, "%Y-%m-%d")
         end_date = end_date.strftime("%m/%d/%Y")
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    config = get_config()
+    if concurrency is None:
+        concurrency = config["google_news_concurrency"]
+    base_url = base_url or config["google_news_base_url"]
+    cache_dir = cache_dir or os.path.join(config["data_cache_dir"], "google_news")
 
-    news_results = []
-    page = 0
-    while True:
+    cache_path = _cache_path(cache_dir, query, start_date, end_date)
+    cached = _read_cache(cache_path)
+    if cached is not None:
+        return cached
+
+    def url_for_page(page):
         offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
+        return (
+            f"{base_url}?q={query}"
             f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
             f"&tbm=nws&start={offset}"
         )
 
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
-
-            page += 1
+    if concurrency > 0:
+        news_results, complete = _fetch_concurrent(
+            url_for_page, HEADERS, concurrency, limiter or get_rate_limiter()
+        )
+    else:
+        news_results, complete = _fetch_sequential(url_for_page, HEADERS)
 
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
+    # results for a window that is still open can change, only cache past windows
+    window_closed = datetime.strptime(end_date, "%m/%d/%Y").date() < datetime.now().date()
+    if complete and window_closed:
+        try:
+            _write_cache(cache_path, query, start_date, end_date, news_results)
+        except OSError as e:
+            print(f"Could not cache Google News results: {e}")
 
     return news_results
@@ -0,0 +1,168 @@
+"""
+Persistent cache for the OpenAI web-search tools.
+
+Responses are stored in an SQLite file in the data cache directory, keyed by
+tool function, ticker, date and model, and expire after a configurable TTL.
+Every call shares one OpenAI client, and concurrent calls for the same key
+wait for the single request in flight instead of issuing their own.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Annotated, Callable, Dict, Optional
+
+from openai import OpenAI
+
+from .config import get_config
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """The process-wide OpenAI client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI()
+        return _client
+
+
+class ResponseCache:
+    """SQLite-backed TTL cache with single-flight requests and hit/miss stats."""
+
+    def __init__(
+        self,
+        db_path: Annotated[str, "SQLite file holding the responses"],
+        ttl_seconds: Annotated[Optional[float], "age after which a response is refetched, None to keep forever"],
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                function TEXT, ticker TEXT, curr_date TEXT, model TEXT,
+                response TEXT, created_at REAL,
+                PRIMARY KEY (function, ticker, curr_date, model)
+            )"""
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[tuple, Future] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "shared": 0,
+            "errors": 0,
+            "fetch_seconds": 0.0,
+            "max_fetch_seconds": 0.0,
+        }
+
+    def _lookup(self, key: tuple) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT response, created_at FROM responses "
+            "WHERE function = ? AND ticker = ? AND curr_date = ? AND model = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        response, created_at = row
+        if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+            return None
+        return response
+
+    def get_or_fetch(
+        self,
+        function: Annotated[str, "name of the tool function"],
+        ticker: Annotated[str, "ticker symbol, empty for market-wide tools"],
+        curr_date: Annotated[str, "date the tool is called for, yyyy-mm-dd"],
+        model: Annotated[str, "model answering the request"],
+        fetch: Annotated[Callable[[], str], "makes the request on a miss"],
+    ) -> str:
+        key = (function, ticker, curr_date, model)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self._stats["hits"] += 1
+                return cached
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats["shared"] += 1
+                owner = False
+            else:
+                self._stats["misses"] += 1
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        started = time.perf_counter()
+        try:
+            response = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, response, time.time()),
+            )
+            self._conn.commit()
+            self._stats["fetch_seconds"] += elapsed
+            self._stats["max_fetch_seconds"] = max(self._stats["max_fetch_seconds"], elapsed)
+            del self._in_flight[key]
+        future.set_result(response)
+        return response
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, calls that joined a request in flight, and request latency."""
+        with self._lock:
+            stats = dict(self._stats)
+        # failed requests are not timed
+        fetched = stats["misses"] - stats["errors"]
+        stats["mean_fetch_seconds"] = stats["fetch_seconds"] / fetched if fetched else 0.0
+        return stats
+
+    def clear(self):
+        """Drop every stored response and reset the stats."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            for name in self._stats:
+                self._stats[name] = 0 if isinstance(self._stats[name], int) else 0.0
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache in the configured data_cache_dir, with the configured TTL."""
+    config = get_config()
+    db_path = os.path.abspath(
+        os.path.join(config["data_cache_dir"], "openai_responses.db")
+    )
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = ResponseCache(db_path, config["openai_cache_ttl_seconds"])
+            _caches[db_path] = cache
+        cache.ttl_seconds = config["openai_cache_ttl_seconds"]
+        return cache
+
+
+def openai_cache_stats() -> Dict[str, float]:
+    """Stats of the process-wide OpenAI response cache."""
+    return get_response_cache().stats()
@@ -0,0 +1,262 @@
+"""
+Incremental cache of online daily bars.
+
+Each symbol has one CSV, ``{symbol}-YFin-data.csv``, in the data
+cache directory plus a small JSON sidecar with the last cached bar. The full
+history is downloaded once; later runs only fetch the bars after the last
+cached date. If the provider has re-adjusted history since (a split or
+dividend changes the adjusted close of the overlapping bar), the symbol is
+downloaded again in full.
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Annotated, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .price_store import PRICE_FILE_PATTERN as LEGACY_FILE_PATTERN
+
+
+class PriceSource(ABC):
+    """Where online daily bars come from."""
+
+    @abstractmethod
+    def download(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        start_date: Annotated[str, "first date to fetch, YYYY-mm-dd, inclusive"],
+        end_date: Annotated[str, "last date to fetch, YYYY-mm-dd, exclusive"],
+    ) -> pd.DataFrame:
+        """Return daily bars with a Date column followed by the price columns."""
+
+
+class YFinancePriceSource(PriceSource):
+    """Adjusted daily bars from Yahoo Finance."""
+
+    def download(self, symbol, start_date, end_date):
+        data = yf.download(
+            symbol,
+            start=start_date,
+            end=end_date,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        return data.reset_index()
+
+
+class OnlinePriceCache:
+    """Per-symbol cache of online daily bars, extended with the new bars of each day."""
+
+    def __init__(
+        self,
+        cache_dir: Annotated[str, "directory holding the cached CSVs"],
+        source: Optional[PriceSource] = None,
+        history_years: Annotated[int, "years of history fetched for a new symbol"] = 15,
+    ):
+        self.cache_dir = cache_dir
+        self.source = source or YFinancePriceSource()
+        self.history_years = history_years
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._checked: Dict[str, str] = {}  # symbol -> date it was last brought up to date
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}-YFin-data.csv")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}-YFin-data.json")
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _read_meta(self, symbol: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(symbol), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _tmp_path(path: str) -> str:
+        """Staging file next to path, private to this process and thread."""
+        return f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+    def _write_meta(self, symbol: str, meta: Dict):
+        tmp_path = self._tmp_path(self._meta_path(symbol))
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(symbol))
+
+    @staticmethod
+    def _last_bar(data: pd.DataFrame) -> Dict:
+        last = data.iloc[-1]
+        return {
+            "last_date": pd.to_datetime(last["Date"]).strftime("%Y-%m-%d"),
+            "last_close": float(last["Close"]),
+        }
+
+    def _download_full(self, symbol: str, today: pd.Timestamp) -> Dict:
+        start_date = (today - pd.DateOffset(years=self.history_years)).strftime("%Y-%m-%d")
+        data = self.source.download(symbol, start_date, today.strftime("%Y-%m-%d"))
+        if data.empty:
+            raise ValueError(f"No online price data found for {symbol}")
+
+        tmp_path = self._tmp_path(self.path(symbol))
+        data.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path(symbol))
+        return {"columns": list(data.columns), **self._last_bar(data)}
+
+    def _append_tail(self, symbol: str, meta: Dict, today: pd.Timestamp) -> Optional[Dict]:
+        """Fetch bars from the last cached date on; None if history was re-adjusted."""
+        tail = self.source.download(symbol, meta["last_date"], today.strftime("%Y-%m-%d"))
+        if tail.empty:
+            return meta
+
+        tail_dates = pd.to_datetime(tail["Date"]).dt.strftime("%Y-%m-%d")
+        overlap = tail[tail_dates == meta["last_date"]]
+        if not overlap.empty and not np.isclose(
+            float(overlap["Close"].iloc[0]), meta["last_close"], rtol=1e-6
+        ):
+            return None
+
+        new_rows = tail[tail_dates > meta["last_date"]]
+        if new_rows.empty:
+            return meta
+
+        # Rewrite the file as the rows up to last_date plus the new ones and swap it
+        # in, so rows appended by an update that died before writing the metadata,
+        # or by another process updating the same symbol, are never duplicated
+        tmp_path = self._tmp_path(self.path(symbol))
+        with open(self.path(symbol), "r") as src, open(tmp_path, "w") as dst:
+            dst.write(src.readline())
+            for line in src:
+                if line.strip() and line.split(",", 1)[0][:10] <= meta["last_date"]:
+                    dst.write(line)
+        new_rows[meta["columns"]].to_csv(tmp_path, mode="a", header=False, index=False)
+        os.replace(tmp_path, self.path(symbol))
+        return {**meta, **self._last_bar(new_rows)}
+
+    def update(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        today: Annotated[Optional[str], "date of the run, defaults to today"] = None,
+    ) -> str:
+        """Bring the symbol's cache up to date and return the path of its CSV."""
+        today = pd.Timestamp(today) if today else pd.Timestamp.today().normalize()
+        today_str = today.strftime("%Y-%m-%d")
+        if self._checked.get(symbol) == today_str and os.path.exists(self.path(symbol)):
+            return self.path(symbol)
+
+        with self._lock(symbol):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            meta = self._read_meta(symbol)
+            if meta is not None and not os.path.exists(self.path(symbol)):
+                meta = None
+
+            if meta is None:
+                meta = self._download_full(symbol, today)
+            elif meta["last_checked"] != today_str:
+                updated = self._append_tail(symbol, meta, today)
+                meta = updated if updated is not None else self._download_full(symbol, today)
+
+            meta["last_checked"] = today_str
+            meta["last_access"] = time.time()
+            self._write_meta(symbol, meta)
+            self._checked[symbol] = today_str
+            return self.path(symbol)
+
+    def compact(self) -> List[str]:
+        """
+        Fold the old date-stamped ``{symbol}-YFin-data-{start}-{end}.csv`` files
+        into the per-symbol cache: the newest one is adopted as the symbol's
+        history if it has none yet, and all of them are removed.
+        Returns the removed file names.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        legacy: Dict[str, List] = {}
+        for file_name in os.listdir(self.cache_dir):
+            match = LEGACY_FILE_PATTERN.match(file_name)
+            if match:
+                legacy.setdefault(match.group("symbol"), []).append(
+                    (match.group("end"), match.group("start"), file_name)
+                )
+
+        removed = []
+        for symbol, files in legacy.items():
+            files.sort()
+            with self._lock(symbol):
+                if not os.path.exists(self.path(symbol)):
+                    newest = os.path.join(self.cache_dir, files[-1][2])
+                    data = pd.read_csv(newest)
+                    if not data.empty:
+                        os.replace(newest, self.path(symbol))
+                        self._write_meta(
+                            symbol,
+                            {
+                                "columns": list(data.columns),
+                                **self._last_bar(data),
+                                "last_checked": files[-1][0],
+                                "last_access": time.time(),
+                            },
+                        )
+                for _, _, file_name in files:
+                    file_path = os.path.join(self.cache_dir, file_name)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                        removed.append(file_name)
+        return removed
+
+    def prune(
+        self,
+        max_age_days: Annotated[float, "drop symbols not used for this many days"],
+    ) -> List[str]:
+        """Remove cached symbols that have not been read recently. Returns the symbols removed."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        cutoff = time.time() - max_age_days * 24 * 3600
+        removed = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith("-YFin-data.json"):
+                continue
+            symbol = file_name[: -len("-YFin-data.json")]
+            with self._lock(symbol):
+                meta = self._read_meta(symbol)
+                if meta is None or meta.get("last_access", 0) < cutoff:
+                    for path in (self.path(symbol), self._meta_path(symbol)):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    self._checked.pop(symbol, None)
+                    removed.append(symbol)
+        return removed
+
+
+_caches: Dict[str, OnlinePriceCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_online_price_cache(cache_dir: Optional[str] = None) -> OnlinePriceCache:
+    """Process-wide OnlinePriceCache, by default in the configured data_cache_dir."""
+    cache_dir = os.path.abspath(cache_dir or get_config()["data_cache_dir"])
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = OnlinePriceCache(cache_dir)
+        return _caches[cache_dir]
+
+
+def prune_price_cache(max_age_days: float, cache_dir: Optional[str] = None) -> List[str]:
+    """Drop online price caches unused for max_age_days and fold in old date-stamped files."""
+    cache = get_online_price_cache(cache_dir)
+    cache.compact()
+    return cache.prune(max_age_days)
@@ -0,0 +1,312 @@
+"""
+Offline price store.
+
+Converts the Yahoo Finance CSV dumps under ``market_data/price_data`` into a
+per-symbol columnar layout (one ``.npy`` array per column plus an integer date
+index) that is memory-mapped on read. Range queries are answered by binary
+search on the date index, so the CSV is parsed once per source file instead of
+once per tool call.
+
+Layout of the store (by default next to the CSV directory)::
+
+    price_store/
+        AAPL/
+            meta.json     # source fingerprint, column names/dtypes, date range, build
+            build-.../    # one directory per build, meta.json names the current one
+                dates.npy     # int64 days since epoch, sorted ascending
+                rows.npy      # original CSV row numbers (used as DataFrame index)
+                col_0.npy     # one array per CSV column, in CSV column order
+                ...
+
+A rebuild writes a new build directory and then atomically replaces
+meta.json, so readers in other processes always find the build meta.json
+points at; the previous build is removed afterwards.
+"""
+
+import errno
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Annotated, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+PRICE_FILE_PATTERN = re.compile(
+    r"^(?P<symbol>.+)-YFin-data-(?P<start>\d{4}-\d{2}-\d{2})-(?P<end>\d{4}-\d{2}-\d{2})\.csv$"
+)
+
+_STORE_VERSION = 2
+
+
+def _to_day_index(date_str: str) -> int:
+    """Convert a YYYY-mm-dd string to days since epoch."""
+    return int(np.datetime64(date_str[:10], "D").astype(np.int64))
+
+
+def _from_day_index(day: int) -> str:
+    """Convert days since epoch back to a YYYY-mm-dd string."""
+    return str(np.datetime64(int(day), "D"))
+
+
+class PriceSeries:
+    """Memory-mapped columns of a single symbol."""
+
+    def __init__(self, symbol: str, path: str, meta: Dict):
+        self.symbol = symbol
+        self.meta = meta
+        self.columns = meta["columns"]
+        self.dates = np.load(os.path.join(path, "dates.npy"), mmap_mode="r")
+        self.rows = np.load(os.path.join(path, "rows.npy"), mmap_mode="r")
+        self._arrays = [
+            np.load(os.path.join(path, f"col_{i}.npy"), mmap_mode="r")
+            for i in range(len(self.columns))
+        ]
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def date_range(self) -> Tuple[str, str]:
+        """First and last trading date present in the data."""
+        return self.meta["first_date"], self.meta["last_date"]
+
+    def slice_bounds(self, start_date: str, end_date: str) -> Tuple[int, int]:
+        """Positions [lo, hi) of the rows whose date falls in [start_date, end_date]."""
+        lo = int(np.searchsorted(self.dates, _to_day_index(start_date), side="left"))
+        hi = int(np.searchsorted(self.dates, _to_day_index(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def has_date(self, date: str) -> bool:
+        """Whether the series has a row on the given date."""
+        day = _to_day_index(date)
+        pos = int(np.searchsorted(self.dates, day, side="left"))
+        return pos < len(self.dates) and int(self.dates[pos]) == day
+
+    def date_strings(self, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        """YYYY-mm-dd strings of the rows in [lo, hi)."""
+        return np.asarray(self.dates[lo:hi]).astype("datetime64[D]").astype(str)
+
+    def to_frame(self, lo: int = 0, hi: Optional[int] = None) -> pd.DataFrame:
+        """Rebuild the original CSV rows in [lo, hi) as a DataFrame."""
+        data = {}
+        for name, dtype, array in zip(
+            self.columns, self.meta["dtypes"], self._arrays
+        ):
+            values = np.asarray(array[lo:hi])
+            if dtype == "object":
+                values = values.astype(object)
+            data[name] = values
+        return pd.DataFrame(data, index=np.asarray(self.rows[lo:hi]))
+
+    def range_frame(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Rows whose date falls in [start_date, end_date], in date order."""
+        lo, hi = self.slice_bounds(start_date, end_date)
+        return self.to_frame(lo, hi)
+
+
+class PriceStore:
+    """Columnar, memory-mapped view over a directory of YFin price CSVs."""
+
+    def __init__(
+        self,
+        price_dir: Annotated[str, "directory holding {symbol}-YFin-data-*.csv files"],
+        store_dir: Annotated[
+            Optional[str], "where to write the columnar store, defaults to ../price_store"
+        ] = None,
+    ):
+        self.price_dir = price_dir
+        self.store_dir = store_dir or os.path.join(
+            os.path.dirname(os.path.normpath(price_dir)), "price_store"
+        )
+        self._series: Dict[str, Tuple[Tuple, PriceSeries]] = {}
+        self._lock = threading.RLock()
+        self._store_dir_checked = False
+
+    def find_source(self, symbol: str) -> str:
+        """Locate the CSV for a symbol, preferring the one covering the latest dates."""
+        candidates = []
+        for file_name in os.listdir(self.price_dir):
+            match = PRICE_FILE_PATTERN.match(file_name)
+            if match and match.group("symbol") == symbol:
+                candidates.append((match.group("end"), match.group("start"), file_name))
+        if not candidates:
+            raise FileNotFoundError(
+                f"No YFin price data for {symbol} in {self.price_dir}"
+            )
+        return os.path.join(self.price_dir, max(candidates)[2])
+
+    def symbols(self):
+        """All symbols that have a price CSV."""
+        found = set()
+        for file_name in os.listdir(self.price_dir):
+            match = PRICE_FILE_PATTERN.match(file_name)
+            if match:
+                found.add(match.group("symbol"))
+        return sorted(found)
+
+    @staticmethod
+    def _fingerprint(source: str) -> Tuple:
+        stat = os.stat(source)
+        return (os.path.basename(source), stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def _writable(directory: str) -> bool:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            probe = os.path.join(directory, f".write-test-{os.getpid()}-{threading.get_ident()}")
+            with open(probe, "w"):
+                pass
+            os.remove(probe)
+            return True
+        except OSError as e:
+            if isinstance(e, PermissionError) or e.errno == errno.EROFS:
+                return False
+            raise
+
+    def _check_store_dir(self):
+        """Once per store: keep the store in the cache dir if store_dir is read-only."""
+        if self._store_dir_checked:
+            return
+        if not self._writable(self.store_dir):
+            self.store_dir = os.path.join(get_config()["data_cache_dir"], "price_store")
+        self._store_dir_checked = True
+
+    def _read_meta(self, symbol: str) -> Optional[Dict]:
+        meta_path = os.path.join(self.store_dir, symbol, "meta.json")
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _current_meta(self, symbol: str, fingerprint: Tuple) -> Optional[Dict]:
+        """The stored metadata if it is of this store version and built from fingerprint."""
+        meta = self._read_meta(symbol)
+        if (
+            meta is None
+            or meta.get("version") != _STORE_VERSION
+            or tuple(meta["source"]) != fingerprint
+        ):
+            return None
+        return meta
+
+    def _build_dir(self, symbol: str, meta: Dict) -> str:
+        return os.path.join(self.store_dir, symbol, meta["build"])
+
+    def build(self, symbol: str, source: Optional[str] = None) -> Dict:
+        """Convert a symbol's CSV into the columnar layout and return its metadata."""
+        source = source or self.find_source(symbol)
+        fingerprint = self._fingerprint(source)
+        data = pd.read_csv(source)
+
+        day_index = (
+            pd.to_datetime(data["Date"].astype(str).str[:10])
+            .values.astype("datetime64[D]")
+            .astype(np.int64)
+        )
+        order = np.argsort(day_index, kind="stable")
+
+        meta = {
+            "version": _STORE_VERSION,
+            "symbol": symbol,
+            "source": list(fingerprint),
+            "columns": list(data.columns),
+            "dtypes": [],
+            "rows": int(len(data)),
+            "first_date": _from_day_index(day_index[order[0]]) if len(data) else None,
+            "last_date": _from_day_index(day_index[order[-1]]) if len(data) else None,
+        }
+
+        symbol_dir = os.path.join(self.store_dir, symbol)
+        meta["build"] = f"build-{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        staging = os.path.join(symbol_dir, meta["build"])
+        os.makedirs(staging)
+        np.save(os.path.join(staging, "dates.npy"), day_index[order])
+        np.save(os.path.join(staging, "rows.npy"), data.index.values[order])
+        for i, column in enumerate(data.columns):
+            values = data[column]
+            if values.dtype == object:
+                meta["dtypes"].append("object")
+                array = values.astype(str).values.astype(str)
+            else:
+                meta["dtypes"].append(str(values.dtype))
+                array = values.values
+            np.save(os.path.join(staging, f"col_{i}.npy"), array[order])
+
+        previous = self._read_meta(symbol)
+        meta_path = os.path.join(symbol_dir, "meta.json")
+        tmp_path = f"{meta_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+        if previous is not None and previous.get("build"):
+            shutil.rmtree(os.path.join(symbol_dir, previous["build"]), ignore_errors=True)
+        elif previous is not None:
+            # version 1 stores kept the arrays next to meta.json
+            for file_name in os.listdir(symbol_dir):
+                if file_name.endswith(".npy"):
+                    os.remove(os.path.join(symbol_dir, file_name))
+        return meta
+
+    def build_all(self):
+        """Convert every CSV in the price directory."""
+        for symbol in self.symbols():
+            self.series(symbol)
+
+    def series(self, symbol: str) -> PriceSeries:
+        """Memory-mapped series for a symbol, (re)building the store if the CSV changed."""
+        source = self.find_source(symbol)
+        fingerprint = self._fingerprint(source)
+
+        cached = self._series.get(symbol)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        with self._lock:
+            cached = self._series.get(symbol)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+            self._check_store_dir()
+            meta = self._current_meta(symbol, fingerprint) or self.build(symbol, source)
+            try:
+                series = PriceSeries(symbol, self._build_dir(symbol, meta), meta)
+            except FileNotFoundError:
+                # another process rebuilt the store and removed this build
+                # between reading meta.json and opening the arrays
+                meta = self._current_meta(symbol, fingerprint) or self.build(symbol, source)
+                series = PriceSeries(symbol, self._build_dir(symbol, meta), meta)
+            self._series[symbol] = (fingerprint, series)
+            return series
+
+    def date_range(self, symbol: str) -> Tuple[str, str]:
+        """First and last date actually present in the symbol's data."""
+        return self.series(symbol).date_range
+
+    def get_range(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Original CSV rows dated within [start_date, end_date]."""
+        return self.series(symbol).range_frame(start_date, end_date)
+
+    def get_frame(self, symbol: str) -> pd.DataFrame:
+        """The full price history of a symbol, as read from the CSV."""
+        return self.series(symbol).to_frame()
+
+
+_stores: Dict[str, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store(price_dir: str) -> PriceStore:
+    """Process-wide PriceStore for a price directory."""
+    key = os.path.abspath(price_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = PriceStore(price_dir)
+        return _stores[key]
@@ -0,0 +1,236 @@
+"""
+Per-day index over the Reddit ``.jsonl`` dumps.
+
+Each ``{category}/{subreddit}.jsonl`` file is scanned once to record, for
+every post, the UTC day it was created, the byte offset and length of its
+line and its upvotes. The index is saved as ``.index/{category}/{file}.npz``
+under the Reddit data folder (outside the category folder, whose entry count
+sets the per-subreddit limit) together with the size and mtime of the dump,
+and is rebuilt when the dump changes. A date-range query then only seeks to
+and parses the posts it returns.
+
+For company news the index also records which tickers each post mentions,
+as found by a mention matcher at ingest, so a company query is a lookup of
+the ticker's rows. The mentions are keyed by the matcher's mapping and
+rebuilt when tickers are added.
+"""
+
+import json
+import os
+import threading
+from datetime import date, datetime
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+_INDEX_VERSION = 1
+
+
+class RedditFileIndex:
+    """Post days, line offsets and upvotes of one subreddit dump, in file order."""
+
+    def __init__(self, path: str, index_path: str, matcher=None):
+        """
+        matcher, if given, is a TickerMentionMatcher (anything with key, tickers
+        and mentioned(parsed_line)) used to record the tickers each post mentions.
+        """
+        self.path = path
+        self.index_path = index_path
+        self.fingerprint = self._fingerprint()
+        self.mention_key: Optional[str] = None
+        self._mentions: Dict[str, np.ndarray] = {}
+        if not self._load(matcher):
+            self._build(matcher)
+            self._save()
+
+    def _fingerprint(self) -> np.ndarray:
+        stat = os.stat(self.path)
+        return np.array([_INDEX_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    def _load(self, matcher) -> bool:
+        try:
+            with np.load(self.index_path) as saved:
+                if not np.array_equal(saved["fingerprint"], self.fingerprint):
+                    return False
+                if "mention_key" in saved.files:
+                    self.mention_key = str(saved["mention_key"])
+                if matcher is not None and self.mention_key != matcher.key:
+                    return False
+                self.days = saved["days"]
+                self.offsets = saved["offsets"]
+                self.lengths = saved["lengths"]
+                self.ups = saved["ups"]
+                if self.mention_key is not None:
+                    self._set_mentions(
+                        saved["mention_tickers"], saved["mention_ptr"], saved["mention_rows"]
+                    )
+                return True
+        except (OSError, KeyError, ValueError):
+            return False
+
+    def _set_mentions(self, tickers: np.ndarray, ptr: np.ndarray, rows: np.ndarray):
+        self._mention_arrays = (tickers, ptr, rows)
+        self._mentions = {
+            str(ticker): rows[ptr[i] : ptr[i + 1]] for i, ticker in enumerate(tickers)
+        }
+
+    def _build(self, matcher):
+        days, offsets, lengths, ups = [], [], [], []
+        mentions = {ticker: [] for ticker in matcher.tickers} if matcher else None
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                # skip empty lines
+                if not line.strip():
+                    continue
+                # a malformed post is left out of the index instead of failing every query on the file
+                try:
+                    parsed_line = json.loads(line)
+                    post_date = datetime.utcfromtimestamp(parsed_line["created_utc"]).date()
+                except (ValueError, KeyError, TypeError, OverflowError, OSError):
+                    continue
+                days.append(post_date.toordinal())
+                offsets.append(line_offset)
+                lengths.append(len(line))
+                ups.append(parsed_line.get("ups") or 0)
+                if mentions is not None:
+                    for ticker in matcher.mentioned(parsed_line):
+                        mentions[ticker].append(len(days) - 1)
+
+        self.days = np.asarray(days, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.ups = np.asarray(ups, dtype=np.float64)
+
+        if mentions is not None:
+            self.mention_key = matcher.key
+            counts = [len(mentions[ticker]) for ticker in matcher.tickers]
+            self._set_mentions(
+                np.asarray(matcher.tickers, dtype=str),
+                np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+                np.asarray(
+                    [row for ticker in matcher.tickers for row in mentions[ticker]],
+                    dtype=np.int64,
+                ),
+            )
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            arrays = {
+                "fingerprint": self.fingerprint,
+                "days": self.days,
+                "offsets": self.offsets,
+                "lengths": self.lengths,
+                "ups": self.ups,
+            }
+            if self.mention_key is not None:
+                tickers, ptr, rows = self._mention_arrays
+                arrays.update(
+                    mention_key=np.asarray(self.mention_key),
+                    mention_tickers=tickers,
+                    mention_ptr=ptr,
+                    mention_rows=rows,
+                )
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # read-only data folder, keep the index in memory only
+            pass
+
+    def rows_between(self, start_date: str, end_date: str) -> np.ndarray:
+        """Rows of the posts created start_date..end_date inclusive, in file order."""
+        start = date.fromisoformat(start_date).toordinal()
+        end = date.fromisoformat(end_date).toordinal()
+        return np.flatnonzero((self.days >= start) & (self.days <= end))
+
+    def rows_mentioning(self, ticker: str) -> np.ndarray:
+        """Rows of the posts mentioning ticker, in file order. Needs a matcher at build time."""
+        if self.mention_key is None:
+            raise ValueError(f"{self.path} was indexed without mentions")
+        return self._mentions.get(ticker, np.empty(0, dtype=np.int64))
+
+    def top_per_day(
+        self, rows: np.ndarray, limit: int
+    ) -> Iterator[Tuple[str, np.ndarray]]:
+        """
+        (YYYY-mm-dd, rows) for each day among rows in date order, keeping the
+        limit most upvoted posts of the day; ties keep file order.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        for day in np.unique(self.days[rows]):
+            day_rows = rows[self.days[rows] == day]
+            order = np.argsort(-self.ups[day_rows], kind="stable")
+            yield date.fromordinal(int(day)).isoformat(), day_rows[order][:limit]
+
+    def read(self, rows: np.ndarray) -> List[Dict]:
+        """Parsed posts of the given rows, in the order given."""
+        posts = []
+        with open(self.path, "rb") as f:
+            for row in rows:
+                f.seek(int(self.offsets[row]))
+                posts.append(json.loads(f.read(int(self.lengths[row]))))
+        return posts
+
+
+class RedditIndex:
+    """Lazily built per-file indexes of a Reddit data folder."""
+
+    def __init__(self, data_path: Annotated[str, "Path to the reddit data folder."]):
+        self.data_path = data_path
+        self._files: Dict[str, RedditFileIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_current(index: Optional[RedditFileIndex], matcher) -> bool:
+        return (
+            index is not None
+            and np.array_equal(index.fingerprint, index._fingerprint())
+            and (matcher is None or index.mention_key == matcher.key)
+        )
+
+    def file(self, category: str, data_file: str, matcher=None) -> RedditFileIndex:
+        """
+        The index of one dump, rebuilt if the dump has changed or, when a
+        matcher is given, if its mentions were recorded for another mapping.
+        """
+        path = os.path.join(self.data_path, category, data_file)
+        index = self._files.get(path)
+        if self._is_current(index, matcher):
+            return index
+
+        with self._lock:
+            index = self._files.get(path)
+            if not self._is_current(index, matcher):
+                index_path = os.path.join(
+                    self.data_path, ".index", category, f"{data_file}.npz"
+                )
+                index = RedditFileIndex(path, index_path, matcher)
+                self._files[path] = index
+            return index
+
+    def ingest(self, category: str, matcher=None) -> int:
+        """Build or refresh the indexes of every dump in a category; returns the file count."""
+        count = 0
+        for data_file in os.listdir(os.path.join(self.data_path, category)):
+            if data_file.endswith(".jsonl"):
+                self.file(category, data_file, matcher)
+                count += 1
+        return count
+
+
+_indexes: Dict[str, RedditIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_reddit_index(data_path: str) -> RedditIndex:
+    """Process-wide RedditIndex for a Reddit data folder."""
+    key = os.path.abspath(data_path)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = RedditIndex(data_path)
+        return _indexes[key]
@@ -3,10 +3,16 @@ import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, List, Optional, Union
+import hashlib
 import os
 import re
 
+import numpy as np
+
+from .config import get_config
+from .reddit_index import get_reddit_index
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,6 +55,130 @@ ticker_to_company = {
 }
 
 
+def register_company(
+    ticker: Annotated[str, "ticker symbol of the company"],
+    names: Annotated[
+        Union[str, List[str]],
+        "company name(s), either a list or joined with ' OR ' like in ticker_to_company",
+    ],
+):
+    """Add a company (or replace its names) so company news can be searched for it."""
+    if not isinstance(names, str):
+        names = " OR ".join(names)
+    ticker_to_company[ticker] = names
+
+
+def ticker_mapping() -> Dict[str, str]:
+    """ticker_to_company extended with the reddit_ticker_to_company config entry."""
+    return {**ticker_to_company, **get_config().get("reddit_ticker_to_company", {})}
+
+
+def search_terms(query: str, names: str) -> List[str]:
+    """The patterns a post is searched for: each company name, then the ticker."""
+    if "OR" in names:
+        terms = names.split(" OR ")
+    else:
+        terms = [names]
+    return terms + [query]
+
+
+class TickerMentionMatcher:
+    """
+    Finds every ticker of a mapping mentioned in a post in one pass per field.
+
+    A post mentions a ticker when one of its search terms matches the title or
+    the content (case-insensitive, terms are regular expressions), like the
+    per-term re.search it replaces. A single combined pattern finds the
+    positions where any term matches, and only the terms starting with the
+    character at such a position are tried there.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.tickers = sorted(mapping)
+        self.key = hashlib.sha1(
+            json.dumps(sorted(mapping.items())).encode("utf-8")
+        ).hexdigest()
+
+        self._terms = []  # (ticker index, compiled term)
+        for i, ticker in enumerate(self.tickers):
+            for term in search_terms(ticker, mapping[ticker]):
+                self._terms.append((i, re.compile(term, re.IGNORECASE)))
+
+        self._combined = re.compile(
+            "(?=" + "|".join(f"(?:{term.pattern})" for _, term in self._terms) + ")",
+            re.IGNORECASE,
+        )
+
+        # terms starting with a plain letter or digit can only match at that character
+        self._by_first_char: Dict[str, List] = {}
+        self._anywhere = []
+        for i, term in self._terms:
+            first = term.pattern[:1]
+            if (
+                first.isascii()
+                and first.isalnum()
+                and "|" not in term.pattern
+                and term.pattern[1:2] not in ("?", "*", "{")
+            ):
+                self._by_first_char.setdefault(first.lower(), []).append((i, term))
+            else:
+                self._anywhere.append((i, term))
+
+    def _candidates(self, char: str) -> List:
+        if not char.isascii():
+            # non-ASCII characters can case-fold onto ASCII letters, try every term
+            return self._terms
+        return self._by_first_char.get(char.lower(), []) + self._anywhere
+
+    def mentioned(self, parsed_line: dict) -> List[str]:
+        """Tickers mentioned in the title or the content of a parsed post."""
+        found = set()
+        for text in (parsed_line.get("title") or "", parsed_line.get("selftext") or ""):
+            for match in self._combined.finditer(text):
+                pos = match.start()
+                candidates = self._candidates(text[pos]) if pos < len(text) else self._anywhere
+                for i, term in candidates:
+                    if i not in found and term.match(text, pos):
+                        found.add(i)
+            if len(found) == len(self.tickers):
+                break
+        return [self.tickers[i] for i in sorted(found)]
+
+
+_matchers: Dict[str, TickerMentionMatcher] = {}
+
+
+def get_mention_matcher(mapping: Optional[Dict[str, str]] = None) -> TickerMentionMatcher:
+    """Matcher over the given mapping, by default ticker_mapping(), compiled once per mapping."""
+    mapping = ticker_mapping() if mapping is None else mapping
+    key = json.dumps(sorted(mapping.items()))
+    if key not in _matchers:
+        _matchers[key] = TickerMentionMatcher(mapping)
+    return _matchers[key]
+
+
+def mentions_company(
+    parsed_line: Annotated[dict, "a parsed reddit post"],
+    query: Annotated[str, "ticker symbol of the company"],
+) -> bool:
+    """Whether the title or the content mentions the ticker or one of its company names."""
+    mapping = ticker_mapping()
+    if query not in mapping:
+        # unknown tickers are searched for by symbol only
+        mapping = {query: query}
+    return query in get_mention_matcher({query: mapping[query]}).mentioned(parsed_line)
+
+
+def _to_post(parsed_line: dict, post_date: str) -> dict:
+    return {
+        "title": parsed_line["title"],
+        "content": parsed_line["selftext"],
+        "url": parsed_line["url"],
+        "upvotes": parsed_line.get("ups", 0),
+        "posted_date": post_date,
+    }
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -98,34 +228,10 @@ def fetch_top_from_category(
 
                 # if is company_news, check that the title or the content has the company's name (query) mentioned
                 if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
+                    if not mentions_company(parsed_line, query):
                         continue
 
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+                all_content_curr_subreddit.append(_to_post(parsed_line, post_date))
 
         # sort all_content_curr_subreddit by upvote_ratio in descending order
         all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
@@ -133,3 +239,87 @@ def fetch_top_from_category(
         all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
     return all_content
+
+
+def build_reddit_index(
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+) -> int:
+    """
+    Ingest step: index every category of the Reddit data folder by day, and
+    record ticker mentions for the company categories. Returns the number of
+    files indexed. Queries build missing indexes lazily, this only does the
+    work up front.
+    """
+    index = get_reddit_index(data_path)
+    matcher = get_mention_matcher()
+    count = 0
+    for category in os.listdir(data_path):
+        if category.startswith(".") or not os.path.isdir(os.path.join(data_path, category)):
+            continue
+        count += index.ingest(category, matcher if "company" in category else None)
+    return count
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """
+    Same posts as calling fetch_top_from_category for every day from start_date
+    to end_date and concatenating the results, but each subreddit dump is read
+    through its per-day index, so only the posts that are returned are parsed.
+    Company queries for tickers in ticker_mapping() are answered from the
+    mention index; other tickers are matched against the posts of the range.
+    """
+    entries = os.listdir(os.path.join(data_path, category))
+
+    if max_limit < len(entries):
+        raise ValueError(
+            "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+        )
+
+    limit_per_subreddit = max_limit // len(entries)
+
+    company_query = "company" in category and query
+    # company news is looked up in the mention index, which covers the known tickers
+    matcher = get_mention_matcher() if company_query else None
+    indexed = matcher is not None and query in matcher.tickers
+
+    index = get_reddit_index(data_path)
+    posts_by_day = {}
+    for data_file in entries:
+        # check if data_file is a .jsonl file
+        if not data_file.endswith(".jsonl"):
+            continue
+
+        file_index = index.file(category, data_file, matcher if indexed else None)
+        rows = file_index.rows_between(start_date, end_date)
+        parsed = {}
+
+        # if is company_news, keep the posts where the company's name (query) is mentioned
+        if company_query and indexed:
+            rows = np.intersect1d(rows, file_index.rows_mentioning(query))
+        elif company_query:
+            parsed = dict(zip(rows, file_index.read(rows)))
+            rows = [row for row in rows if mentions_company(parsed[row], query)]
+
+        for post_date, top_rows in file_index.top_per_day(rows, limit_per_subreddit):
+            missing = [row for row in top_rows if row not in parsed]
+            parsed.update(zip(missing, file_index.read(missing)))
+            posts_by_day.setdefault(post_date, []).extend(
+                _to_post(parsed[row], post_date) for row in top_rows
+            )
+
+    return [post for day in sorted(posts_by_day) for post in posts_by_day[day]]
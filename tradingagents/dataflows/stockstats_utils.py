@@ -1,9 +1,104 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from collections import OrderedDict
+from typing import Annotated, Dict, List, Optional, Tuple
 import os
+import threading
 from .config import get_config
+from .price_cache import get_online_price_cache
+from .price_store import get_price_store
+
+NOT_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of computed indicator columns, bounded by memory size.
+
+    Keys are (symbol, indicator, fingerprint) where the fingerprint identifies
+    the exact price file the column was computed from (name, size, mtime), so
+    a rewritten file never serves stale values.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, dates: np.ndarray, values: np.ndarray):
+        size = dates.nbytes + values.nbytes
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (dates, values)
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted)
+            self.evictions += 1
+
+    def resize(self, max_bytes: int):
+        """Change the byte budget, evicting least recently used entries beyond it."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_indicator_cache: Optional[IndicatorCache] = None
+_indicator_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Process-wide indicator cache, sized by the current indicator_cache_max_bytes."""
+    global _indicator_cache
+    max_bytes = get_config()["indicator_cache_max_bytes"]
+    with _indicator_cache_lock:
+        if _indicator_cache is None:
+            _indicator_cache = IndicatorCache(max_bytes)
+        elif _indicator_cache.max_bytes != max_bytes:
+            _indicator_cache.resize(max_bytes)
+        return _indicator_cache
 
 
 class StockstatsUtils:
@@ -25,63 +120,104 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
+        return StockstatsUtils.get_stock_stats_window(
+            symbol, indicator, [curr_date], data_dir, online
+        )[curr_date]
 
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        dates: Annotated[List[str], "dates to look up, YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, object]:
+        """
+        Batch version of get_stock_stats: loads the price series and computes the
+        indicator once, then picks every requested date out by binary search.
+        Returns a dict of date -> value, with the same values get_stock_stats
+        would return for each date.
+        """
+        row_dates, values = StockstatsUtils._indicator_column(
+            symbol, indicator, data_dir, online
+        )
+        wanted = np.asarray(
+            [pd.to_datetime(date).strftime("%Y-%m-%d") for date in dates], dtype="U10"
+        )
+
+        positions = np.searchsorted(row_dates, wanted, side="left")
+        clipped = np.minimum(positions, max(len(row_dates) - 1, 0))
+        found = (positions < len(row_dates)) & (row_dates[clipped] == wanted)
+
+        return {
+            date: values[pos] if hit else NOT_TRADING_DAY
+            for date, pos, hit in zip(dates, clipped, found)
+        }
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Hit/miss counters and memory use of the process-wide indicator cache."""
+        return get_indicator_cache().stats()
+
+    @staticmethod
+    def clear_cache():
+        """Drop every cached indicator column and reset the counters."""
+        get_indicator_cache().clear()
+
+    @staticmethod
+    def _indicator_column(
+        symbol: str, indicator: str, data_dir: str, online: bool
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(row dates as YYYY-mm-dd, indicator values) over the full history, cached."""
+        source = StockstatsUtils._price_source(symbol, data_dir, online)
+        stat = os.stat(source)
+        key = (symbol, indicator, (source, stat.st_size, stat.st_mtime_ns))
+
+        cache = get_indicator_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        df = StockstatsUtils._load_stock_frame(symbol, data_dir, online, source)
+        values = np.asarray(df[indicator].values)
+        row_dates = df["Date"].astype(str).str[:10].values.astype("U10")
+        values.setflags(write=False)
+        row_dates.setflags(write=False)
+        cache.put(key, row_dates, values)
+        return row_dates, values
+
+    @staticmethod
+    def _price_source(symbol: str, data_dir: str, online: bool) -> str:
+        """Path of the price file the indicators are computed from."""
+        if not online:
+            try:
+                return get_price_store(data_dir).find_source(symbol)
+            except FileNotFoundError:
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+
+        return get_online_price_cache().update(symbol)
+
+    @staticmethod
+    def _load_stock_frame(symbol: str, data_dir: str, online: bool, source: str):
+        """Price history wrapped for stockstats, with Date as YYYY-mm-dd strings when online."""
         if not online:
             try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
+                data = get_price_store(data_dir).get_frame(symbol)
+                return wrap(data)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
-
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+
+        data = pd.read_csv(source)
+        data["Date"] = pd.to_datetime(data["Date"])
+
+        df = wrap(data)
+        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+        return df
@@ -0,0 +1,185 @@
+"""
+Exchange session calendar answered by binary search.
+
+The session dates of an exchange are built once from pandas_market_calendars
+for a span of years, cached as a ``.npy`` file in the data cache directory,
+and kept in memory as a sorted datetime64[D] array. Previous / next session,
+is-session and sessions-between queries (and their batch versions over arrays
+of dates) are then searchsorted calls instead of a fresh schedule per call.
+"""
+
+import os
+import threading
+from datetime import date, datetime
+from typing import Annotated, Dict, List, Optional, Union
+
+import numpy as np
+import pandas_market_calendars as mcal
+
+from .config import get_config
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    return np.datetime64(value, "D") if not isinstance(value, str) else np.datetime64(value[:10], "D")
+
+
+def _to_days(values) -> np.ndarray:
+    array = np.asarray(values)
+    if np.issubdtype(array.dtype, np.datetime64):
+        return array.astype("datetime64[D]")
+    return np.array([_to_day(value) for value in array.tolist()], dtype="datetime64[D]")
+
+
+def _to_strings(days: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(days, unit="D")
+
+
+class TradingCalendar:
+    """Sorted session dates of an exchange over [first_day, last_day]."""
+
+    def __init__(
+        self,
+        sessions: Annotated[np.ndarray, "sorted session dates, datetime64[D]"],
+        first_day: Annotated[DateLike, "first day the calendar covers"],
+        last_day: Annotated[DateLike, "last day the calendar covers"],
+    ):
+        self.sessions = np.asarray(sessions, dtype="datetime64[D]")
+        self.first_day = _to_day(first_day)
+        self.last_day = _to_day(last_day)
+
+    @classmethod
+    def from_sessions(cls, sessions) -> "TradingCalendar":
+        """Calendar over exactly the given session dates, e.g. the rows of a price file."""
+        days = np.unique(_to_days(sessions))
+        if len(days) == 0:
+            raise ValueError("A trading calendar needs at least one session")
+        return cls(days, days[0], days[-1])
+
+    def covers(self, first: DateLike, last: DateLike) -> bool:
+        return self.first_day <= _to_day(first) and _to_day(last) <= self.last_day
+
+    def _check_span(self, days: np.ndarray):
+        if len(days) and (days.min() < self.first_day or days.max() > self.last_day):
+            raise ValueError(
+                f"Dates outside of the trading calendar span {self.first_day} to {self.last_day}"
+            )
+
+    def previous_many(self, dates) -> np.ndarray:
+        """Latest session strictly before each date, as YYYY-mm-dd strings ('' if none)."""
+        days = _to_days(dates)
+        self._check_span(days)
+        pos = np.searchsorted(self.sessions, days, side="left") - 1
+        found = pos >= 0
+        result = np.full(len(days), "", dtype="U10")
+        result[found] = _to_strings(self.sessions[pos[found]])
+        return result
+
+    def next_many(self, dates) -> np.ndarray:
+        """Earliest session strictly after each date, as YYYY-mm-dd strings ('' if none)."""
+        days = _to_days(dates)
+        self._check_span(days)
+        pos = np.searchsorted(self.sessions, days, side="right")
+        found = pos < len(self.sessions)
+        result = np.full(len(days), "", dtype="U10")
+        result[found] = _to_strings(self.sessions[pos[found]])
+        return result
+
+    def is_session_many(self, dates) -> np.ndarray:
+        """Whether each date is a session."""
+        days = _to_days(dates)
+        self._check_span(days)
+        pos = np.searchsorted(self.sessions, days, side="left")
+        clipped = np.minimum(pos, len(self.sessions) - 1)
+        return (pos < len(self.sessions)) & (self.sessions[clipped] == days)
+
+    def previous(self, value: DateLike) -> str:
+        result = self.previous_many([value])[0]
+        if not result:
+            raise ValueError("No previous open market day found")
+        return str(result)
+
+    def next(self, value: DateLike) -> str:
+        result = self.next_many([value])[0]
+        if not result:
+            raise ValueError("No next open market day found")
+        return str(result)
+
+    def is_session(self, value: DateLike) -> bool:
+        return bool(self.is_session_many([value])[0])
+
+    def session_bounds(self, start: DateLike, end: DateLike):
+        """(lo, hi) such that sessions[lo:hi] are the sessions from start to end inclusive."""
+        lo = int(np.searchsorted(self.sessions, _to_day(start), side="left"))
+        hi = int(np.searchsorted(self.sessions, _to_day(end), side="right"))
+        return lo, max(lo, hi)
+
+    def sessions_between(self, start: DateLike, end: DateLike) -> List[str]:
+        """Sessions from start to end inclusive, oldest first, as YYYY-mm-dd strings."""
+        lo, hi = self.session_bounds(start, end)
+        return list(_to_strings(self.sessions[lo:hi]))
+
+
+def _build_sessions(name: str, first_day: str, last_day: str) -> np.ndarray:
+    schedule = mcal.get_calendar(name).schedule(start_date=first_day, end_date=last_day)
+    return schedule.index.values.astype("datetime64[D]")
+
+
+def load_exchange_calendar(
+    name: Annotated[str, "pandas_market_calendars exchange name"],
+    first_year: int,
+    last_year: int,
+    cache_dir: Optional[str] = None,
+) -> TradingCalendar:
+    """Sessions from Jan 1 of first_year to Dec 31 of last_year, from the disk cache if present."""
+    first_day, last_day = f"{first_year}-01-01", f"{last_year}-12-31"
+    cache_dir = cache_dir or os.path.join(get_config()["data_cache_dir"], "trading_calendar")
+    cache_path = os.path.join(cache_dir, f"{name}-{first_day}-{last_day}.npy")
+    try:
+        sessions = np.load(cache_path)
+    except (OSError, ValueError):
+        sessions = _build_sessions(name, first_day, last_day)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp-{os.getpid()}-{threading.get_ident()}.npy"
+            np.save(tmp_path, sessions)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return TradingCalendar(sessions, first_day, last_day)
+
+
+_calendars: Dict[str, TradingCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_trading_calendar(
+    name: Annotated[str, "pandas_market_calendars exchange name"] = "NYSE",
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+) -> TradingCalendar:
+    """
+    Process-wide calendar for an exchange. It spans trading_calendar_start_year
+    to trading_calendar_years_ahead years after the current one, widened to
+    whole years around start / end when a query needs more.
+    """
+    with _calendars_lock:
+        calendar = _calendars.get(name)
+        if calendar is not None and calendar.covers(start or calendar.first_day, end or calendar.last_day):
+            return calendar
+
+        config = get_config()
+        first_year = config["trading_calendar_start_year"]
+        last_year = date.today().year + config["trading_calendar_years_ahead"]
+        if calendar is not None:
+            first_year = min(first_year, int(str(calendar.first_day)[:4]))
+            last_year = max(last_year, int(str(calendar.last_day)[:4]))
+        if start is not None:
+            first_year = min(first_year, int(str(_to_day(start))[:4]))
+        if end is not None:
+            last_year = max(last_year, int(str(_to_day(end))[:4]))
+
+        calendar = load_exchange_calendar(name, first_year, last_year)
+        _calendars[name] = calendar
+        return calendar
@@ -12,10 +12,50 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # llm_provider "fake": scripted offline answers, [(regex, response template), ...],
+    # a fixed BUY/SELL/HOLD (None picks one per ticker and date), and latency specs
+    # such as {"distribution": "lognormal", "median": 2.0, "sigma": 0.5}
+    "fake_llm_script": [],
+    "fake_llm_signal": None,
+    "fake_llm_seed": 0,
+    "fake_deep_llm_latency": None,
+    "fake_quick_llm_latency": None,
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Chat model response cache: None (off), "record", "replay" or "passthrough"
+    "llm_cache_mode": None,
+    "llm_cache_path": None,  # defaults to data_cache_dir/llm_responses.db
+    "llm_cache_max_bytes": 512 * 1024 * 1024,
+    # Run the analysts side by side instead of one after another
+    "parallel_analysts": False,
+    # propagate_many: analyses run at a time, retries of a failing one and the first retry's delay
+    "batch_max_concurrency": 4,
+    "batch_retries": 1,
+    "batch_retry_delay": 1.0,
+    # Backtester: sessions a decision's position is held before its return is realized
+    "backtest_holding_period": 5,
+    # Per-node and per-tool timings, tokens and tool traffic of every run, attached to
+    # the final state as run_metrics and written to run_metrics.json next to full_states_log.json.
+    # Off by default: the timings make the final state differ from run to run
+    "run_metrics": False,
+    # Prometheus text file of the metrics summed over all runs, rewritten after each run
+    "prometheus_metrics_path": None,
     # Tool settings
     "online_tools": True,
+    "tool_max_concurrency": 4,  # tool calls of one analyst turn run at the same time
+    # Google News scraping: requests per second, pages fetched at a time (0 = one by one)
+    "google_news_rate": 0.5,
+    "google_news_concurrency": 4,
+    "google_news_base_url": "https://www.google.com/search",
+    # Extra tickers for Reddit company news, ticker -> "Name OR Other Name"
+    "reddit_ticker_to_company": {},
+    # Cache settings
+    "indicator_cache_max_bytes": 256 * 1024 * 1024,
+    "openai_cache_ttl_seconds": 7 * 24 * 3600,  # None keeps responses forever
+    "profile_cache_ttl_seconds": 24 * 3600,  # company profiles of the earnings screen
+    # Exchange session calendar span, cached in data_cache_dir/trading_calendar
+    "trading_calendar_start_year": 1990,
+    "trading_calendar_years_ahead": 1,
 }
@@ -6,6 +6,12 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .tool_node import ConcurrentToolNode
+from .batch import PropagationBatch
+from .backtest import Backtester
+from .fake_llm import FakeChatModel
+from .llm_cache import CachedChatModel, LLMCacheMiss, LLMResponseStore
+from .instrumentation import MetricsRegistry, RunMetrics
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +20,13 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "ConcurrentToolNode",
+    "PropagationBatch",
+    "Backtester",
+    "FakeChatModel",
+    "CachedChatModel",
+    "LLMCacheMiss",
+    "LLMResponseStore",
+    "MetricsRegistry",
+    "RunMetrics",
 ]
@@ -0,0 +1,360 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.price_store import PriceStore, get_price_store
+
+MEMORY_NAMES = (
+    "bull_memory",
+    "bear_memory",
+    "trader_memory",
+    "invest_judge_memory",
+    "risk_manager_memory",
+)
+POSITIONS = {"BUY": 1, "SELL": -1, "HOLD": 0}
+TRADING_DAYS_PER_YEAR = 252
+
+_CHECKPOINT_VERSION = 1
+
+
+def signal_position(decision: Optional[str]) -> int:
+    """Position a processed signal stands for: 1 long, -1 short, 0 flat."""
+    text = (decision or "").strip().upper()
+    if text in POSITIONS:
+        return POSITIONS[text]
+    for signal, position in POSITIONS.items():
+        if signal in text:
+            return position
+    return 0
+
+
+def realized_returns(dates: np.ndarray, closes: np.ndarray, trade_dates: Sequence[str], holding_period: int):
+    """Exit dates and returns of positions opened at the close of each trade date.
+
+    dates are the sorted days since epoch of a symbol's price rows and closes
+    its closing prices. A position is closed holding_period rows later; where
+    the trade date has no row or the exit lies past the data, the exit date is
+    None and the return NaN.
+    """
+    days = np.array(
+        [np.datetime64(d[:10], "D").astype(np.int64) for d in trade_dates], dtype=np.int64
+    )
+    exit_dates = [None] * len(days)
+    returns = np.full(len(days), np.nan)
+    if not len(dates) or not len(days):
+        return exit_dates, returns
+    pos = np.searchsorted(dates, days, side="left")
+    found = (pos < len(dates)) & (dates[np.minimum(pos, len(dates) - 1)] == days)
+    exit_pos = pos + holding_period
+    ok = found & (exit_pos < len(dates))
+    entry = closes[pos[ok]]
+    returns[ok] = closes[exit_pos[ok]] / entry - 1.0
+    for i, day in zip(np.flatnonzero(ok), dates[exit_pos[ok]]):
+        exit_dates[i] = str(np.datetime64(int(day), "D"))
+    return exit_dates, returns
+
+
+class Backtester:
+    """Walk-forward backtest of a TradingAgentsGraph over a date range.
+
+    Every trading day in [start_date, end_date] (the days the tickers have
+    price rows for) the graph analyses every ticker through propagate_many.
+    A decision opens a position at that day's close: BUY long, SELL short,
+    HOLD flat, closed holding_period sessions later, and its realized return
+    comes from the local price data. Before each day's analyses, the
+    decisions whose exit close is already known are reflected on with
+    reflect_and_remember, oldest exit first, so the agents only remember
+    outcomes they could have seen.
+
+    With a checkpoint_path the records, the states still waiting to be
+    reflected on and the agents' memories are saved after every day, and a
+    later run with the same arguments resumes after the last finished day.
+    """
+
+    def __init__(
+        self,
+        graph,
+        tickers: Union[str, Sequence[str]],
+        start_date: str,
+        end_date: str,
+        holding_period: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        price_store: Optional[PriceStore] = None,
+    ):
+        self.graph = graph
+        self.tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.holding_period = holding_period or graph.config.get("backtest_holding_period", 5)
+        self.checkpoint_path = checkpoint_path
+        self.max_concurrency = max_concurrency
+        self.price_store = price_store or get_price_store(
+            os.path.join(get_config()["data_dir"], "market_data", "price_data")
+        )
+
+        self.records: List[Dict[str, Any]] = []  # one per ticker and day, in run order
+        self.days: List[Dict[str, Any]] = []  # runtime of every simulated day
+        self._states: Dict[str, Dict[str, Any]] = {}  # record key to state awaiting reflection
+        self._prices: Dict[str, tuple] = {}
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {
+            "tickers": self.tickers,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "holding_period": self.holding_period,
+        }
+
+    @staticmethod
+    def _key(ticker: str, trade_date: str) -> str:
+        return f"{ticker}|{trade_date}"
+
+    def _price_arrays(self, ticker: str):
+        """Sorted day index and closing prices of a ticker, Adj Close where present."""
+        if ticker not in self._prices:
+            try:
+                series = self.price_store.series(ticker)
+            except FileNotFoundError:
+                # no local prices: its decisions are recorded but never realized
+                self._prices[ticker] = (np.empty(0, dtype=np.int64), np.empty(0))
+                return self._prices[ticker]
+            frame = series.to_frame()
+            column = "Adj Close" if "Adj Close" in frame.columns else "Close"
+            self._prices[ticker] = (
+                np.asarray(series.dates, dtype=np.int64),
+                frame[column].to_numpy(dtype=float),
+            )
+        return self._prices[ticker]
+
+    def trading_days(self) -> List[str]:
+        """Days in [start_date, end_date] on which any of the tickers has a price row."""
+        lo = np.datetime64(self.start_date[:10], "D").astype(np.int64)
+        hi = np.datetime64(self.end_date[:10], "D").astype(np.int64)
+        days = np.unique(np.concatenate([self._price_arrays(t)[0] for t in self.tickers]))
+        days = days[(days >= lo) & (days <= hi)]
+        return list(days.astype("datetime64[D]").astype(str))
+
+    def _record(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        ticker, trade_date = result["ticker"], result["trade_date"]
+        dates, closes = self._price_arrays(ticker)
+        exit_dates, returns = realized_returns(dates, closes, [trade_date], self.holding_period)
+        position = signal_position(result["decision"]) if result["error"] is None else 0
+        realized = not math.isnan(returns[0])
+        record = {
+            "ticker": ticker,
+            "trade_date": trade_date,
+            "decision": result["decision"],
+            "position": position,
+            "exit_date": exit_dates[0],
+            "return": float(returns[0]) if realized else None,
+            "position_return": position * float(returns[0]) if realized else None,
+            "reflected": False,
+            "error": result["error"],
+            "attempts": result["attempts"],
+            "seconds": result["seconds"],
+        }
+        if result["final_state"] is not None:
+            self._states[self._key(ticker, trade_date)] = {
+                key: value for key, value in result["final_state"].items() if key != "messages"
+            }
+        return record
+
+    def _reflect_due(self, before_date: Optional[str]) -> int:
+        """Reflect on every realized decision with an exit before before_date (all if None)."""
+        due = [
+            record
+            for record in self.records
+            if not record["reflected"]
+            and record["exit_date"] is not None
+            and (before_date is None or record["exit_date"] < before_date)
+            and self._key(record["ticker"], record["trade_date"]) in self._states
+        ]
+        due.sort(key=lambda r: (r["exit_date"], r["trade_date"], self.tickers.index(r["ticker"])))
+        for record in due:
+            state = self._states.pop(self._key(record["ticker"], record["trade_date"]))
+            self.graph.reflect_and_remember(record["position_return"], state=state)
+            record["reflected"] = True
+        return len(due)
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            "version": _CHECKPOINT_VERSION,
+            "params": self.params,
+            "records": self.records,
+            "days": self.days,
+            "states": self._states,
+            "memories": {name: getattr(self.graph, name).export() for name in MEMORY_NAMES},
+        }
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        staging = f"{self.checkpoint_path}.tmp-{os.getpid()}"
+        with open(staging, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(staging, self.checkpoint_path)
+
+    def _load_checkpoint(self) -> bool:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, "r") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("version") != _CHECKPOINT_VERSION or checkpoint["params"] != self.params:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was written for a different backtest: "
+                f"{checkpoint.get('params')}"
+            )
+        self.records = checkpoint["records"]
+        self.days = checkpoint["days"]
+        self._states = checkpoint["states"]
+        for name in MEMORY_NAMES:
+            getattr(self.graph, name).load(checkpoint["memories"][name])
+        return True
+
+    def run(self) -> Dict[str, Any]:
+        """Walk the date range, resuming from the checkpoint if there is one.
+
+        Returns the decision records, the runtime of every simulated day, the
+        equity curve and the summary stats.
+        """
+        self._load_checkpoint()
+        finished = {day["date"] for day in self.days}
+
+        for trade_date in self.trading_days():
+            if trade_date in finished:
+                continue
+            started = time.perf_counter()
+            reflections = self._reflect_due(trade_date)
+            reflect_seconds = time.perf_counter() - started
+
+            batch = self.graph.propagate_many(
+                self.tickers, trade_date, max_concurrency=self.max_concurrency
+            )
+            day_records = [self._record(result) for result in batch]
+            day_records.sort(key=lambda r: self.tickers.index(r["ticker"]))
+            self.records.extend(day_records)
+
+            seconds = time.perf_counter() - started
+            self.days.append(
+                {
+                    "date": trade_date,
+                    "seconds": seconds,
+                    "reflect_seconds": reflect_seconds,
+                    "reflections": reflections,
+                    "decisions": len(day_records),
+                    "failed": sum(r["error"] is not None for r in day_records),
+                    "decisions_per_second": len(day_records) / seconds if seconds else 0.0,
+                }
+            )
+            self._save_checkpoint()
+
+        # the exits after the last day are in the price data too
+        self._reflect_due(None)
+        self._save_checkpoint()
+
+        return {
+            "records": pd.DataFrame(self.records),
+            "days": pd.DataFrame(self.days),
+            "equity_curve": self.equity_curve(),
+            "summary": self.summary(),
+        }
+
+    def equity_curve(self) -> pd.DataFrame:
+        """Daily returns, equity, drawdown and gross exposure of the decisions.
+
+        Capital is split evenly across the tickers, and each ticker's capital
+        into holding_period tranches, one per decision still open, so a
+        decision moves its ticker's exposure by 1/holding_period for the
+        sessions it is held.
+        """
+        columns = ["return", "equity", "drawdown", "exposure"]
+        if not self.records:
+            return pd.DataFrame(columns=columns)
+
+        first = min(r["trade_date"] for r in self.records)
+        last = max([r["trade_date"] for r in self.records] + [r["exit_date"] for r in self.records if r["exit_date"]])
+        closes = {}
+        for ticker in self.tickers:
+            dates, prices = self._price_arrays(ticker)
+            closes[ticker] = pd.Series(prices, index=dates.astype("datetime64[D]").astype(str))
+        closes = pd.DataFrame(closes)
+        closes = closes.loc[(closes.index >= first) & (closes.index <= last)].sort_index().ffill()
+
+        daily = closes.pct_change(fill_method=None).fillna(0.0)
+        records = pd.DataFrame(self.records)
+        positions = (
+            records.pivot_table(index="trade_date", columns="ticker", values="position", aggfunc="last")
+            .reindex(index=closes.index, columns=closes.columns)
+            .fillna(0.0)
+        )
+        exposure = positions.shift(1).fillna(0.0).rolling(self.holding_period, min_periods=1).sum()
+        exposure /= self.holding_period
+
+        returns = (exposure * daily).mean(axis=1)
+        equity = (1.0 + returns).cumprod()
+        return pd.DataFrame(
+            {
+                "return": returns,
+                "equity": equity,
+                "drawdown": equity / equity.cummax() - 1.0,
+                "exposure": exposure.abs().mean(axis=1),
+            },
+            columns=columns,
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """Performance of the equity curve, decision counts and runtime per simulated day."""
+        curve = self.equity_curve()
+        returns = curve["return"].to_numpy(dtype=float)
+        periods = len(returns)
+        total_return = float(curve["equity"].iloc[-1] - 1.0) if periods else 0.0
+        volatility = float(returns.std()) if periods else 0.0
+
+        directional = [
+            r for r in self.records if r["position"] != 0 and r["position_return"] is not None
+        ]
+        decisions = {signal: 0 for signal in POSITIONS}
+        for record in self.records:
+            if record["error"] is None:
+                signal = next(
+                    (s for s, p in POSITIONS.items() if p == record["position"]), "HOLD"
+                )
+                decisions[signal] += 1
+
+        runtime = sum(day["seconds"] for day in self.days)
+        decision_count = sum(day["decisions"] for day in self.days)
+        return {
+            "days": len(self.days),
+            "decisions": decisions,
+            "failed": sum(r["error"] is not None for r in self.records),
+            "reflected": sum(r["reflected"] for r in self.records),
+            "total_return": total_return,
+            "annualized_return": (
+                (1.0 + total_return) ** (TRADING_DAYS_PER_YEAR / periods) - 1.0 if periods else 0.0
+            ),
+            "annualized_volatility": volatility * math.sqrt(TRADING_DAYS_PER_YEAR),
+            "sharpe": (
+                float(returns.mean()) / volatility * math.sqrt(TRADING_DAYS_PER_YEAR)
+                if volatility
+                else 0.0
+            ),
+            "max_drawdown": float(curve["drawdown"].min()) if periods else 0.0,
+            "hit_rate": (
+                sum(r["position_return"] > 0 for r in directional) / len(directional)
+                if directional
+                else None
+            ),
+            "runtime_seconds": runtime,
+            "seconds_per_day": runtime / len(self.days) if self.days else 0.0,
+            "decisions_per_second": decision_count / runtime if runtime else 0.0,
+        }
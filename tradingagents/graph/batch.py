@@ -0,0 +1,145 @@
+# TradingAgents/graph/batch.py
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+
+class PropagationBatch:
+    """A ticker x date grid of analyses run on a worker pool.
+
+    Iterating the batch schedules the jobs, at most max_concurrency at a time,
+    and yields one result dict per job as it completes (not in grid order):
+
+        ticker, trade_date  the job
+        final_state         the graph's final state, None if the job failed
+        decision            the processed signal, None if the job failed
+        error               repr of the last exception, None on success
+        attempts            how many times the job ran
+        seconds             wall time of the job, retries included
+
+    A failing job is retried up to retries times, retry_delay seconds apart
+    (doubling each time), and then recorded as failed; the rest of the batch
+    carries on. stats() can be read at any time, also from another thread.
+    """
+
+    def __init__(
+        self,
+        run_job: Callable[[str, str], Tuple[Dict[str, Any], str]],
+        tickers: Union[str, Sequence[str]],
+        dates: Union[str, Sequence[str]],
+        max_concurrency: int = 4,
+        retries: int = 1,
+        retry_delay: float = 1.0,
+    ):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        dates = [dates] if isinstance(dates, str) else list(dates)
+        # date-major, so the earlier dates of a universe finish first
+        self.jobs: List[Tuple[str, str]] = [(ticker, str(d)) for d in dates for ticker in tickers]
+        self.run_job = run_job
+        self.max_concurrency = max(1, max_concurrency)
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._stats = {
+            "total": len(self.jobs),
+            "completed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "running": 0,
+            "retries": 0,
+            "job_seconds": 0.0,
+        }
+        self._started = None
+        self._finished = None
+
+    def _update(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self._stats[key] += delta
+
+    def _run(self, ticker: str, trade_date: str) -> Dict[str, Any]:
+        self._update(running=1)
+        started = time.perf_counter()
+        result = {
+            "ticker": ticker,
+            "trade_date": trade_date,
+            "final_state": None,
+            "decision": None,
+            "error": None,
+            "attempts": 0,
+        }
+        delay = self.retry_delay
+        while True:
+            result["attempts"] += 1
+            try:
+                result["final_state"], result["decision"] = self.run_job(ticker, trade_date)
+                result["error"] = None
+                break
+            except Exception as e:
+                result["error"] = repr(e)
+                if result["attempts"] > self.retries:
+                    break
+                self._update(retries=1)
+                time.sleep(delay)
+                delay *= 2
+        result["seconds"] = time.perf_counter() - started
+        failed = result["error"] is not None
+        self._update(
+            running=-1,
+            completed=1,
+            succeeded=int(not failed),
+            failed=int(failed),
+            job_seconds=result["seconds"],
+        )
+        return result
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._started = time.perf_counter()
+        self._finished = None
+        pending_jobs = iter(self.jobs)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            # keep at most max_concurrency jobs submitted, so stopping early
+            # leaves nothing queued behind
+            running = set()
+            for ticker, trade_date in pending_jobs:
+                running.add(executor.submit(self._run, ticker, trade_date))
+                if len(running) == self.max_concurrency:
+                    break
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    next_job = next(pending_jobs, None)
+                    if next_job is not None:
+                        running.add(executor.submit(self._run, *next_job))
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True)
+            self._finished = time.perf_counter()
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Run the whole batch and return the results in grid order."""
+        order = {job: i for i, job in enumerate(self.jobs)}
+        return sorted(self, key=lambda result: order[(result["ticker"], result["trade_date"])])
+
+    def stats(self) -> Dict[str, Any]:
+        """Progress and throughput of the batch so far."""
+        with self._lock:
+            stats = dict(self._stats)
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        stats["elapsed_seconds"] = elapsed
+        stats["progress"] = stats["completed"] / stats["total"] if stats["total"] else 1.0
+        stats["jobs_per_second"] = stats["completed"] / elapsed if elapsed else 0.0
+        stats["mean_job_seconds"] = (
+            stats["job_seconds"] / stats["completed"] if stats["completed"] else 0.0
+        )
+        remaining = stats["total"] - stats["completed"]
+        stats["eta_seconds"] = (
+            remaining / stats["jobs_per_second"] if stats["jobs_per_second"] else None
+        )
+        return stats
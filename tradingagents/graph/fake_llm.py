@@ -0,0 +1,222 @@
+# TradingAgents/graph/fake_llm.py
+
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import BaseTool
+
+SIGNALS = ("BUY", "SELL", "HOLD")
+
+# where the ticker and date of a run show up in the agents' prompts
+TICKER_PATTERNS = [
+    re.compile(r"(?:want to look at is|want to analyze is|looking at the company) ([A-Za-z0-9.\-^]+)"),
+    re.compile(r"tailored for ([A-Za-z0-9.\-^]+)\."),
+    re.compile(r"on ([A-Za-z0-9.\-^]+) as of \d{4}-\d{2}-\d{2}"),
+]
+DATE_PATTERNS = [
+    re.compile(r"current date is (\d{4}-\d{2}-\d{2})"),
+    re.compile(r"on [A-Za-z0-9.\-^]+ as of (\d{4}-\d{2}-\d{2})"),
+]
+PROPOSAL_PATTERN = re.compile(r"FINAL TRANSACTION PROPOSAL: \*\*(BUY|SELL|HOLD)\*\*")
+EXTRACTION_PROMPT = "extract the investment decision"
+
+# default answers, formatted with ticker, date, signal and tools; "on {ticker} as of
+# {date}" lets the agents that only see earlier answers find the run's ticker and date
+REPORT_TEMPLATE = (
+    "## Analyst report on {ticker} as of {date}\n\n"
+    "Gathered data with {tools}.\n\n"
+    "| Item | Reading |\n|---|---|\n| Outlook | {signal} |\n"
+)
+RESPONSE_TEMPLATE = (
+    "Having weighed the reports on {ticker} as of {date}, the balance of evidence "
+    "points to {signal}. FINAL TRANSACTION PROPOSAL: **{signal}**"
+)
+
+
+def sample_latency(spec: Optional[Dict[str, Any]], rng: random.Random) -> float:
+    """Seconds to wait for one call, drawn from a latency spec.
+
+        {"distribution": "constant", "seconds": s}
+        {"distribution": "uniform", "low": a, "high": b}
+        {"distribution": "normal", "mean": m, "std": s}            clipped at 0
+        {"distribution": "lognormal", "median": m, "sigma": s}
+    """
+    if not spec:
+        return 0.0
+    distribution = spec.get("distribution", "constant")
+    if distribution == "constant":
+        return float(spec.get("seconds", 0.0))
+    if distribution == "uniform":
+        return rng.uniform(spec.get("low", 0.0), spec["high"])
+    if distribution == "normal":
+        return max(0.0, rng.gauss(spec["mean"], spec.get("std", 0.0)))
+    if distribution == "lognormal":
+        return spec["median"] * rng.lognormvariate(0.0, spec.get("sigma", 0.0))
+    raise ValueError(f"Unsupported latency distribution: {distribution}")
+
+
+def _messages(input) -> List:
+    if isinstance(input, PromptValue):
+        return input.to_messages()
+    if isinstance(input, str):
+        return [HumanMessage(content=input)]
+    return convert_to_messages(input)
+
+
+def _search(patterns, text) -> Optional[str]:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def tool_call_args(tool: BaseTool, ticker: str, date: str) -> Dict[str, Any]:
+    """Well-formed arguments for a tool, filled in from its schema and the run's ticker and date."""
+    start = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=30)).strftime("%Y-%m-%d")
+    args = {}
+    for name, schema in tool.args.items():
+        kind = schema.get("type")
+        if name in ("symbol", "ticker", "company", "query"):
+            args[name] = ticker
+        elif "date" in name:
+            args[name] = start if "start" in name else date
+        elif name == "indicator":
+            args[name] = "rsi"
+        elif name == "freq":
+            args[name] = "quarterly"
+        elif "default" in schema:
+            args[name] = schema["default"]
+        elif kind == "integer":
+            args[name] = 7
+        elif kind == "number":
+            args[name] = 1.0
+        elif kind == "boolean":
+            args[name] = False
+        else:
+            args[name] = ticker
+    return args
+
+
+class FakeChatModel(RunnableLambda):
+    """Offline chat model for llm_provider "fake".
+
+    Answers from scripts and templates instead of a model, so the graph runs
+    without network access and gives the same answers for the same inputs:
+
+    - with tools bound (the analysts), the first turn calls every bound tool
+      once with arguments built from its schema, and the turn after the tool
+      results writes a report;
+    - the signal extraction prompt gets the bare BUY / SELL / HOLD of the
+      FINAL TRANSACTION PROPOSAL it is shown;
+    - any other prompt gets the first script entry whose pattern matches it,
+      or a template ending in a FINAL TRANSACTION PROPOSAL.
+
+    The signal of a run is signal if given, else picked by a hash of the
+    ticker and date found in the prompts. Templates and script responses are
+    formatted with {ticker}, {date}, {signal} and {tools}. Every call waits
+    for a latency drawn from the latency spec (see sample_latency) with a
+    seeded generator.
+    """
+
+    def __init__(
+        self,
+        model: str = "fake",
+        latency: Optional[Dict[str, Any]] = None,
+        script: Sequence[Tuple[str, str]] = (),
+        signal: Optional[str] = None,
+        seed: int = 0,
+        tools: Sequence[BaseTool] = (),
+        _shared: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(self._func, afunc=self._afunc, name=model)
+        self.model = model
+        self.latency = latency
+        self.script = [(re.compile(pattern), response) for pattern, response in script]
+        self.signal = signal
+        self.tools = list(tools)
+        # one generator and call count across the bound copies
+        self._shared = _shared or {"rng": random.Random(seed), "lock": threading.Lock(), "calls": 0}
+
+    def bind_tools(self, tools, **kwargs) -> "FakeChatModel":
+        return FakeChatModel(
+            self.model, self.latency, self.script, self.signal, tools=tools, _shared=self._shared
+        )
+
+    @property
+    def calls(self) -> int:
+        return self._shared["calls"]
+
+    def _next_latency(self) -> float:
+        with self._shared["lock"]:
+            self._shared["calls"] += 1
+            return sample_latency(self.latency, self._shared["rng"])
+
+    def _run_signal(self, ticker: str, date: str) -> str:
+        if self.signal:
+            return self.signal
+        digest = hashlib.sha256(f"{ticker}|{date}".encode("utf-8")).digest()
+        return SIGNALS[digest[0] % len(SIGNALS)]
+
+    def _respond(self, input) -> AIMessage:
+        messages = _messages(input)
+        text = "\n".join(str(m.content) for m in messages)
+        ticker = _search(TICKER_PATTERNS, text) or "UNKNOWN"
+        date = _search(DATE_PATTERNS, text) or "1970-01-01"
+        values = {
+            "ticker": ticker,
+            "date": date,
+            "signal": self._run_signal(ticker, date),
+            "tools": ", ".join(tool.name for tool in self.tools) or "no tools",
+        }
+
+        if self.tools:
+            if not isinstance(messages[-1], ToolMessage):
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": tool.name,
+                            "args": tool_call_args(tool, ticker, date),
+                            "id": f"call_{i}_{tool.name}",
+                        }
+                        for i, tool in enumerate(self.tools)
+                    ],
+                )
+            content = REPORT_TEMPLATE.format(**values)
+        elif EXTRACTION_PROMPT in text:
+            proposal = PROPOSAL_PATTERN.search(str(messages[-1].content))
+            content = proposal.group(1) if proposal else values["signal"]
+        else:
+            content = next(
+                (response for pattern, response in self.script if pattern.search(text)),
+                RESPONSE_TEMPLATE,
+            ).format(**values)
+
+        words = len(text.split())
+        output_words = len(content.split())
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": words,
+                "output_tokens": output_words,
+                "total_tokens": words + output_words,
+            },
+        )
+
+    def _func(self, input, config: RunnableConfig):
+        time.sleep(self._next_latency())
+        return self._respond(input)
+
+    async def _afunc(self, input, config: RunnableConfig):
+        await asyncio.sleep(self._next_latency())
+        return self._respond(input)
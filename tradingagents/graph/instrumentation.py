@@ -0,0 +1,294 @@
+# TradingAgents/graph/instrumentation.py
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.base import coerce_to_runnable
+from langchain_core.tools import BaseTool, StructuredTool
+
+# the run and node being executed; LangGraph, the tool node's pool and asyncio
+# tasks carry them over to the threads and tasks the run's work ends up on
+_current_run: ContextVar[Optional["RunMetrics"]] = ContextVar("tradingagents_run", default=None)
+_current_node: ContextVar[Optional[str]] = ContextVar("tradingagents_node", default=None)
+
+NODE_FIELDS = (
+    "calls",
+    "seconds",
+    "max_seconds",
+    "llm_calls",
+    "input_tokens",
+    "output_tokens",
+    "tool_round_trips",
+    "tool_calls",
+    "tool_output_bytes",
+)
+TOOL_FIELDS = ("calls", "errors", "seconds", "max_seconds", "output_bytes")
+
+
+def _output_bytes(output) -> int:
+    return len(str(output).encode("utf-8"))
+
+
+class RunMetrics:
+    """Per-node and per-tool timings, token counts and tool traffic of one graph run.
+
+    Filled in by the instrumented nodes, chat models and tools while the run
+    is current (see track), from whichever thread or task they run on.
+    """
+
+    def __init__(self, ticker: str, trade_date: str):
+        self.ticker = ticker
+        self.trade_date = str(trade_date)
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        self.tools: Dict[str, Dict[str, float]] = {}
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _node(self, name: str) -> Dict[str, float]:
+        return self.nodes.setdefault(name, dict.fromkeys(NODE_FIELDS, 0))
+
+    def _tool(self, name: str) -> Dict[str, float]:
+        return self.tools.setdefault(name, dict.fromkeys(TOOL_FIELDS, 0))
+
+    def add_node_call(self, name: str, seconds: float, round_trip_of: Optional[str] = None):
+        with self._lock:
+            node = self._node(name)
+            node["calls"] += 1
+            node["seconds"] += seconds
+            node["max_seconds"] = max(node["max_seconds"], seconds)
+            if round_trip_of is not None:
+                self._node(round_trip_of)["tool_round_trips"] += 1
+
+    def add_llm_call(self, node: Optional[str], usage: Optional[Dict[str, int]]):
+        usage = usage or {}
+        with self._lock:
+            record = self._node(node or "other")
+            record["llm_calls"] += 1
+            record["input_tokens"] += usage.get("input_tokens", 0)
+            record["output_tokens"] += usage.get("output_tokens", 0)
+
+    def add_tool_call(self, node: Optional[str], tool: str, seconds: float, output_bytes: int, failed: bool):
+        with self._lock:
+            record = self._tool(tool)
+            record["calls"] += 1
+            record["errors"] += int(failed)
+            record["seconds"] += seconds
+            record["max_seconds"] = max(record["max_seconds"], seconds)
+            record["output_bytes"] += output_bytes
+            node_record = self._node(node or "other")
+            node_record["tool_calls"] += 1
+            node_record["tool_output_bytes"] += output_bytes
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            nodes = list(self.nodes.values())
+            tools = list(self.tools.values())
+        return {
+            "llm_calls": sum(node["llm_calls"] for node in nodes),
+            "input_tokens": sum(node["input_tokens"] for node in nodes),
+            "output_tokens": sum(node["output_tokens"] for node in nodes),
+            "tool_round_trips": sum(node["tool_round_trips"] for node in nodes),
+            "tool_calls": sum(tool["calls"] for tool in tools),
+            "tool_errors": sum(tool["errors"] for tool in tools),
+            "tool_seconds": sum(tool["seconds"] for tool in tools),
+            "tool_output_bytes": sum(tool["output_bytes"] for tool in tools),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot, nodes and tools in the order they first ran."""
+        totals = self.totals()
+        with self._lock:
+            return {
+                "ticker": self.ticker,
+                "trade_date": self.trade_date,
+                "wall_seconds": self.wall_seconds,
+                "totals": totals,
+                "nodes": {name: dict(node) for name, node in self.nodes.items()},
+                "tools": {name: dict(tool) for name, tool in self.tools.items()},
+            }
+
+
+@contextmanager
+def track(ticker: str, trade_date: str) -> Iterator[RunMetrics]:
+    """Make a new RunMetrics the current run for the duration of the block."""
+    metrics = RunMetrics(ticker, trade_date)
+    token = _current_run.set(metrics)
+    started = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_seconds = time.perf_counter() - started
+        _current_run.reset(token)
+
+
+class InstrumentedNode(RunnableLambda):
+    """Graph node wrapper that times the node and makes it the current node.
+
+    LLM calls and tool calls made while it runs are credited to it. A tool
+    node passes round_trip_of, the analyst node whose tool round trips it
+    counts.
+    """
+
+    def __init__(self, name: str, node, round_trip_of: Optional[str] = None):
+        super().__init__(self._func, afunc=self._afunc, name=name)
+        self.node = coerce_to_runnable(node)
+        self.node_name = name
+        self.round_trip_of = round_trip_of
+
+    def _record(self, started: float):
+        metrics = _current_run.get()
+        if metrics is not None:
+            metrics.add_node_call(self.node_name, time.perf_counter() - started, self.round_trip_of)
+
+    def _func(self, state, config: RunnableConfig):
+        token = _current_node.set(self.node_name)
+        started = time.perf_counter()
+        try:
+            return self.node.invoke(state, config)
+        finally:
+            self._record(started)
+            _current_node.reset(token)
+
+    async def _afunc(self, state, config: RunnableConfig):
+        token = _current_node.set(self.node_name)
+        started = time.perf_counter()
+        try:
+            return await self.node.ainvoke(state, config)
+        finally:
+            self._record(started)
+            _current_node.reset(token)
+
+
+class MeteredChatModel(RunnableLambda):
+    """Chat model wrapper that credits each call's usage_metadata tokens to the current node."""
+
+    def __init__(self, llm):
+        super().__init__(self._func, afunc=self._afunc, name=getattr(llm, "name", None) or "metered_llm")
+        self.llm = llm
+
+    def bind_tools(self, tools, **kwargs) -> "MeteredChatModel":
+        return MeteredChatModel(self.llm.bind_tools(tools, **kwargs))
+
+    @staticmethod
+    def _record(response):
+        metrics = _current_run.get()
+        if metrics is not None:
+            metrics.add_llm_call(_current_node.get(), getattr(response, "usage_metadata", None))
+        return response
+
+    # the wrapped model picks up config (callbacks, tags) from the context
+    def _func(self, input, config: RunnableConfig):
+        return self._record(self.llm.invoke(input))
+
+    async def _afunc(self, input, config: RunnableConfig):
+        return self._record(await self.llm.ainvoke(input))
+
+
+def instrument_tool(tool: BaseTool) -> BaseTool:
+    """Copy of a Toolkit tool that records its latency, errors and output size in the current run."""
+
+    @functools.wraps(tool.func)
+    def recorded(*args, **kwargs):
+        metrics = _current_run.get()
+        started = time.perf_counter()
+        failed = True
+        output = ""
+        try:
+            output = tool.func(*args, **kwargs)
+            failed = False
+            return output
+        finally:
+            if metrics is not None:
+                metrics.add_tool_call(
+                    _current_node.get(),
+                    tool.name,
+                    time.perf_counter() - started,
+                    _output_bytes(output),
+                    failed,
+                )
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=recorded,
+        return_direct=tool.return_direct,
+        handle_tool_error=tool.handle_tool_error,
+        handle_validation_error=tool.handle_validation_error,
+    )
+
+
+PROMETHEUS_PREFIX = "tradingagents"
+PROMETHEUS_METRICS = [
+    # (name, help, label, section, field)
+    ("runs_total", "Graph runs completed.", None, None, "runs"),
+    ("run_seconds_total", "Wall time of the graph runs.", None, None, "wall_seconds"),
+    ("node_calls_total", "Calls of each graph node.", "node", "nodes", "calls"),
+    ("node_seconds_total", "Wall time spent in each graph node.", "node", "nodes", "seconds"),
+    ("node_llm_calls_total", "Chat model calls made by each graph node.", "node", "nodes", "llm_calls"),
+    ("node_input_tokens_total", "Chat model input tokens of each graph node.", "node", "nodes", "input_tokens"),
+    ("node_output_tokens_total", "Chat model output tokens of each graph node.", "node", "nodes", "output_tokens"),
+    ("node_tool_round_trips_total", "Tool round trips of each analyst node.", "node", "nodes", "tool_round_trips"),
+    ("tool_calls_total", "Calls of each tool.", "tool", "tools", "calls"),
+    ("tool_errors_total", "Calls of each tool that raised.", "tool", "tools", "errors"),
+    ("tool_seconds_total", "Time spent in each tool.", "tool", "tools", "seconds"),
+    ("tool_output_bytes_total", "Bytes of output of each tool.", "tool", "tools", "output_bytes"),
+]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Counters summed over every run of a graph, exported in the Prometheus text format.
+
+    For long-running services: serve prometheus_text() from a /metrics
+    endpoint, or write_prometheus() to a file for node_exporter's textfile
+    collector.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {"runs": 0, "wall_seconds": 0.0}
+        self._sections: Dict[str, Dict[str, Dict[str, float]]] = {"nodes": {}, "tools": {}}
+
+    def add(self, run_metrics: Dict[str, Any]):
+        """Add one run's RunMetrics.to_dict()."""
+        with self._lock:
+            self._totals["runs"] += 1
+            self._totals["wall_seconds"] += run_metrics["wall_seconds"]
+            for section in ("nodes", "tools"):
+                for name, values in run_metrics[section].items():
+                    summed = self._sections[section].setdefault(name, {})
+                    for field, value in values.items():
+                        if field != "max_seconds":
+                            summed[field] = summed.get(field, 0) + value
+
+    def prometheus_text(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, help_text, label, section, field in PROMETHEUS_METRICS:
+                metric = f"{PROMETHEUS_PREFIX}_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                if section is None:
+                    lines.append(f"{metric} {self._totals[field]}")
+                    continue
+                for key, values in sorted(self._sections[section].items()):
+                    lines.append(f'{metric}{{{label}="{_escape_label(key)}"}} {values.get(field, 0)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically replace path with the current prometheus_text()."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
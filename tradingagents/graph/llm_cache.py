@@ -0,0 +1,286 @@
+# TradingAgents/graph/llm_cache.py
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    convert_to_messages,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from tradingagents.dataflows.config import get_config
+
+CACHE_MODES = ("record", "replay", "passthrough")
+
+# parts of tool output that change from run to run without changing the data
+VOLATILE_PATTERNS = [
+    re.compile(r"^# Data retrieved on: .*$", re.MULTILINE),
+]
+
+
+class LLMCacheMiss(LookupError):
+    """A replay-mode call whose request was never recorded."""
+
+
+def normalize_messages(input) -> List[Dict[str, Any]]:
+    """The parts of a chat model input that decide its answer, without ids."""
+    if isinstance(input, PromptValue):
+        messages = input.to_messages()
+    elif isinstance(input, str):
+        messages = [HumanMessage(content=input)]
+    else:
+        messages = convert_to_messages(input)
+
+    normalized = []
+    for message in messages:
+        content = message.content
+        if isinstance(content, str):
+            for pattern in VOLATILE_PATTERNS:
+                content = pattern.sub("", content)
+            content = content.strip()
+        entry = {"type": message.type, "content": content}
+        if isinstance(message, AIMessage) and message.tool_calls:
+            entry["tool_calls"] = [
+                {"name": call["name"], "args": call["args"]} for call in message.tool_calls
+            ]
+        if message.type == "tool":
+            entry["name"] = message.name
+        normalized.append(entry)
+    return normalized
+
+
+def request_key(provider: str, model: str, input, tools: Sequence[Dict[str, Any]] = ()) -> str:
+    """Hash of provider, model, bound tool schemas and normalized messages."""
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "tools": list(tools),
+            "messages": normalize_messages(input),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseStore:
+    """SQLite file of recorded chat model responses, evicting least recently used past max_bytes."""
+
+    def __init__(self, db_path: str, max_bytes: Optional[int] = None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, provider TEXT, model TEXT,
+                response TEXT, size INTEGER, latency REAL,
+                created_at REAL, last_access REAL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        """(response message, seconds it took when recorded), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, latency FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        response, latency = row
+        return messages_from_dict([json.loads(response)])[0], latency
+
+    def put(self, key: str, provider: str, model: str, response: BaseMessage, latency: float):
+        blob = json.dumps(message_to_dict(response))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, blob, len(blob), latency, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def size_bytes(self) -> int:
+        """Total size of the stored responses."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        """Drop every recorded response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class CachedChatModel(RunnableLambda):
+    """Chat model wrapper that records and replays responses.
+
+    Stands in for the chat model anywhere the agents use it: invoke,
+    ainvoke, bind_tools, and as the last step of a prompt | llm chain.
+    Requests are keyed by provider, model, the schemas of the bound tools
+    and the normalized messages, so a rerun of the same ticker and date
+    with the same config asks the same questions.
+
+        record       answer from the store, call the model and store on a miss
+        replay       answer from the store only, LLMCacheMiss on a miss
+        passthrough  always call the model, never read or write the store
+    """
+
+    def __init__(
+        self,
+        llm,
+        store: LLMResponseStore,
+        provider: str,
+        model: str,
+        mode: str = "record",
+        tools: Sequence[Dict[str, Any]] = (),
+        _shared: Optional[Dict[str, Any]] = None,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported LLM cache mode: {mode}, expected one of {CACHE_MODES}")
+        super().__init__(self._func, afunc=self._afunc, name=f"cached_{model}")
+        self.llm = llm
+        self.store = store
+        self.provider = provider
+        self.model = model
+        self.mode = mode
+        self.tools = list(tools)
+        # shared with the bound copies, so stats() covers every use of the model
+        self._shared = _shared or {
+            "lock": threading.Lock(),
+            "stats": {
+                "hits": 0,
+                "misses": 0,
+                "calls": 0,
+                "call_seconds": 0.0,
+                "saved_seconds": 0.0,
+            },
+        }
+
+    def bind_tools(self, tools, **kwargs) -> "CachedChatModel":
+        """The wrapped model's bind_tools, cached under the tools' schemas as well."""
+        return CachedChatModel(
+            self.llm.bind_tools(tools, **kwargs),
+            self.store,
+            self.provider,
+            self.model,
+            self.mode,
+            tools=[convert_to_openai_tool(tool) for tool in tools],
+            _shared=self._shared,
+        )
+
+    def _count(self, **deltas):
+        with self._shared["lock"]:
+            for name, delta in deltas.items():
+                self._shared["stats"][name] += delta
+
+    def _lookup(self, input) -> tuple:
+        """(key, cached response or None); the key is None in passthrough mode."""
+        if self.mode == "passthrough":
+            return None, None
+        key = request_key(self.provider, self.model, input, self.tools)
+        cached = self.store.get(key)
+        if cached is not None:
+            self._count(hits=1, saved_seconds=cached[1])
+            return key, cached[0]
+        if self.mode == "replay":
+            raise LLMCacheMiss(
+                f"No recorded {self.provider}/{self.model} response for this request, "
+                "run it in record mode first"
+            )
+        self._count(misses=1)
+        return key, None
+
+    def _store(self, key, response, seconds):
+        self._count(calls=1, call_seconds=seconds)
+        if key is not None:
+            self.store.put(key, self.provider, self.model, response, seconds)
+
+    def _func(self, input, config: RunnableConfig):
+        key, response = self._lookup(input)
+        if response is not None:
+            return response
+        started = time.perf_counter()
+        response = self.llm.invoke(input, config)
+        self._store(key, response, time.perf_counter() - started)
+        return response
+
+    async def _afunc(self, input, config: RunnableConfig):
+        key, response = self._lookup(input)
+        if response is not None:
+            return response
+        started = time.perf_counter()
+        response = await self.llm.ainvoke(input, config)
+        self._store(key, response, time.perf_counter() - started)
+        return response
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, model calls and their latency, and the latency the hits saved."""
+        with self._shared["lock"]:
+            return dict(self._shared["stats"])
+
+
+_stores: Dict[str, LLMResponseStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_llm_response_store(db_path: Optional[str] = None) -> LLMResponseStore:
+    """Process-wide store at db_path, by default llm_responses.db in the data_cache_dir."""
+    config = get_config()
+    db_path = os.path.abspath(
+        db_path or os.path.join(config["data_cache_dir"], "llm_responses.db")
+    )
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = LLMResponseStore(db_path, config.get("llm_cache_max_bytes"))
+            _stores[db_path] = store
+        store.max_bytes = config.get("llm_cache_max_bytes")
+        return store
@@ -1,6 +1,8 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -10,6 +12,15 @@ from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
 
 from .conditional_logic import ConditionalLogic
+from .instrumentation import InstrumentedNode, MeteredChatModel
+
+# state key each analyst writes its report to
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
 
 
 class GraphSetup:
@@ -27,8 +38,17 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        instrumented: bool = False,
     ):
-        """Initialize with required components."""
+        """Initialize with required components.
+
+        With instrumented, every node is wrapped in an InstrumentedNode and
+        the agents' chat models in a MeteredChatModel, which record timings
+        and tokens into the current run's RunMetrics.
+        """
+        if instrumented:
+            quick_thinking_llm = MeteredChatModel(quick_thinking_llm)
+            deep_thinking_llm = MeteredChatModel(deep_thinking_llm)
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
         self.toolkit = toolkit
@@ -39,9 +59,63 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.instrumented = instrumented
+
+    def _node(self, name, node, round_trip_of=None):
+        """node, wrapped in an InstrumentedNode called name if instrumented."""
+        if not self.instrumented:
+            return node
+        return InstrumentedNode(name, node, round_trip_of)
+
+    def _analyst_branch(self, analyst_type, analyst_node, tool_node, after_clear=False):
+        """Run one analyst's LLM/tool loop as a subgraph with its own message channel.
+
+        The branch starts from the messages the analyst would see in the
+        sequential topology: the parent's messages for the first analyst,
+        the "Continue" placeholder of the previous Msg Clear (after_clear)
+        for the others. It loops between the analyst and its tools like the
+        sequential topology does, and only hands the analyst's report back
+        to the parent state.
+        """
+        name = analyst_type.capitalize()
+        report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+        branch = StateGraph(AgentState)
+        branch.add_node(f"{name} Analyst", self._node(f"{name} Analyst", analyst_node))
+        branch.add_node(
+            f"tools_{analyst_type}",
+            self._node(f"tools_{analyst_type}", tool_node, round_trip_of=f"{name} Analyst"),
+        )
+        branch.add_edge(START, f"{name} Analyst")
+        branch.add_conditional_edges(
+            f"{name} Analyst",
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {f"tools_{analyst_type}": f"tools_{analyst_type}", f"Msg Clear {name}": END},
+        )
+        branch.add_edge(f"tools_{analyst_type}", f"{name} Analyst")
+        subgraph = branch.compile()
+
+        def branch_input(state):
+            return {
+                "messages": [HumanMessage(content="Continue")] if after_clear else state["messages"],
+                "company_of_interest": state["company_of_interest"],
+                "trade_date": state["trade_date"],
+            }
+
+        def analyst_branch_node(state, config: RunnableConfig):
+            result = subgraph.invoke(branch_input(state), config)
+            return {report_key: result[report_key]}
+
+        async def aanalyst_branch_node(state, config: RunnableConfig):
+            result = await subgraph.ainvoke(branch_input(state), config)
+            return {report_key: result[report_key]}
+
+        return RunnableLambda(analyst_branch_node, afunc=aanalyst_branch_node)
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +125,11 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts side by side, each in its
+                own branch, and join their reports before the Bull Researcher
+                instead of running them one after another. Each branch starts
+                from the messages its analyst sees in the sequential order, so
+                both topologies send the same prompts.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -112,48 +191,87 @@ class GraphSetup:
         workflow = StateGraph(AgentState)
 
         # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+        if parallel_analysts:
+            for i, analyst_type in enumerate(selected_analysts):
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._analyst_branch(
+                        analyst_type,
+                        analyst_nodes[analyst_type],
+                        tool_nodes[analyst_type],
+                        after_clear=i > 0,
+                    ),
+                )
+            # one clear after all branches, leaving the same messages as the last sequential clear
             workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                "Msg Clear Analysts", self._node("Msg Clear Analysts", create_msg_delete())
             )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        else:
+            for analyst_type, node in analyst_nodes.items():
+                name = analyst_type.capitalize()
+                workflow.add_node(f"{name} Analyst", self._node(f"{name} Analyst", node))
+                workflow.add_node(
+                    f"Msg Clear {name}",
+                    self._node(f"Msg Clear {name}", delete_nodes[analyst_type]),
+                )
+                workflow.add_node(
+                    f"tools_{analyst_type}",
+                    self._node(
+                        f"tools_{analyst_type}",
+                        tool_nodes[analyst_type],
+                        round_trip_of=f"{name} Analyst",
+                    ),
+                )
 
         # Add other nodes
-        workflow.add_node("Bull Researcher", bull_researcher_node)
-        workflow.add_node("Bear Researcher", bear_researcher_node)
-        workflow.add_node("Research Manager", research_manager_node)
-        workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
-        workflow.add_node("Risk Judge", risk_manager_node)
+        other_nodes = {
+            "Bull Researcher": bull_researcher_node,
+            "Bear Researcher": bear_researcher_node,
+            "Research Manager": research_manager_node,
+            "Trader": trader_node,
+            "Risky Analyst": risky_analyst,
+            "Neutral Analyst": neutral_analyst,
+            "Safe Analyst": safe_analyst,
+            "Risk Judge": risk_manager_node,
+        }
+        for name, node in other_nodes.items():
+            workflow.add_node(name, self._node(name, node))
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        if parallel_analysts:
+            # Fan out to every analyst and wait for all of them
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst" for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, "Msg Clear Analysts")
+            workflow.add_edge("Msg Clear Analysts", "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
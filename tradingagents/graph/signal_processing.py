@@ -20,12 +20,19 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        return self.quick_thinking_llm.invoke(self._messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async version of process_signal."""
+        response = await self.quick_thinking_llm.ainvoke(self._messages(full_signal))
+        return response.content
+
+    @staticmethod
+    def _messages(full_signal: str):
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
@@ -0,0 +1,144 @@
+# TradingAgents/graph/tool_node.py
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+from langchain_core.tools import BaseTool
+
+TOOL_CALL_ERROR_TEMPLATE = "Error: {error}\n Please fix your mistakes."
+INVALID_TOOL_NAME_ERROR_TEMPLATE = (
+    "Error: {requested_tool} is not a valid tool, try one of [{available_tools}]."
+)
+
+
+class ConcurrentToolNode(RunnableLambda):
+    """Tool node that runs the tool calls of one LLM turn side by side.
+
+    The calls of the last AI message are independent of each other, so they
+    run on a thread pool (or as thread-offloaded coroutines under ainvoke) of
+    at most max_concurrency at a time. The tool messages come back in call
+    order, like ToolNode's, and a failing call becomes an error message for
+    the LLM instead of failing the turn. Every call's latency is recorded.
+    """
+
+    def __init__(self, tools: Sequence[BaseTool], max_concurrency: int = 4, name: str = "tools"):
+        super().__init__(self._func, afunc=self._afunc, name=name)
+        self.tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.max_concurrency = max(1, max_concurrency)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @staticmethod
+    def _tool_calls(state) -> List[Dict[str, Any]]:
+        messages = state["messages"] if isinstance(state, dict) else state
+        message = messages[-1]
+        if not isinstance(message, AIMessage):
+            raise ValueError("No AIMessage found in input")
+        return message.tool_calls
+
+    def _invalid_tool(self, call) -> ToolMessage:
+        content = INVALID_TOOL_NAME_ERROR_TEMPLATE.format(
+            requested_tool=call["name"], available_tools=", ".join(self.tools_by_name)
+        )
+        return ToolMessage(content, name=call["name"], tool_call_id=call["id"], status="error")
+
+    @staticmethod
+    def _error(call, error: Exception) -> ToolMessage:
+        content = TOOL_CALL_ERROR_TEMPLATE.format(error=repr(error))
+        return ToolMessage(content, name=call["name"], tool_call_id=call["id"], status="error")
+
+    def _record(self, name: str, seconds: float, failed: bool):
+        with self._lock:
+            tool_stats = self._per_tool.setdefault(
+                name, {"calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            tool_stats["calls"] += 1
+            tool_stats["errors"] += int(failed)
+            tool_stats["seconds"] += seconds
+            tool_stats["max_seconds"] = max(tool_stats["max_seconds"], seconds)
+            self._stats["calls"] += 1
+            self._stats["errors"] += int(failed)
+            self._stats["call_seconds"] += seconds
+
+    def _record_batch(self, seconds: float):
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["wall_seconds"] += seconds
+
+    def _run_one(self, call, config: RunnableConfig) -> ToolMessage:
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            return self._invalid_tool(call)
+        started = time.perf_counter()
+        try:
+            message = tool.invoke({**call, "type": "tool_call"}, config)
+        except Exception as e:
+            message = self._error(call, e)
+        self._record(call["name"], time.perf_counter() - started, message.status == "error")
+        return message
+
+    async def _arun_one(self, call, config: RunnableConfig, semaphore: asyncio.Semaphore) -> ToolMessage:
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            return self._invalid_tool(call)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                # tools without a coroutine run in a worker thread
+                message = await tool.ainvoke({**call, "type": "tool_call"}, config)
+            except Exception as e:
+                message = self._error(call, e)
+            self._record(call["name"], time.perf_counter() - started, message.status == "error")
+        return message
+
+    def _func(self, state, config: RunnableConfig):
+        tool_calls = self._tool_calls(state)
+        started = time.perf_counter()
+        if len(tool_calls) <= 1 or self.max_concurrency == 1:
+            messages = [self._run_one(call, config) for call in tool_calls]
+        else:
+            # the workers see the caller's context variables, like the graph's own executor
+            with ContextThreadPoolExecutor(max_workers=min(self.max_concurrency, len(tool_calls))) as executor:
+                messages = list(executor.map(lambda call: self._run_one(call, config), tool_calls))
+        self._record_batch(time.perf_counter() - started)
+        return {"messages": messages}
+
+    async def _afunc(self, state, config: RunnableConfig):
+        tool_calls = self._tool_calls(state)
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        messages = await asyncio.gather(
+            *(self._arun_one(call, config, semaphore) for call in tool_calls)
+        )
+        self._record_batch(time.perf_counter() - started)
+        return {"messages": list(messages)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts and latency, in total and per tool.
+
+        speedup is the summed latency of the calls over the wall time of the
+        turns they ran in, i.e. how much running them side by side saved.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["tools"] = {name: dict(tool_stats) for name, tool_stats in self._per_tool.items()}
+        stats["speedup"] = (
+            stats["call_seconds"] / stats["wall_seconds"] if stats["wall_seconds"] else 1.0
+        )
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {
+                "batches": 0,
+                "calls": 0,
+                "errors": 0,
+                "call_seconds": 0.0,
+                "wall_seconds": 0.0,
+            }
+            self._per_tool: Dict[str, Dict[str, float]] = {}
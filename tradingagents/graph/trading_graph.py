@@ -1,6 +1,7 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import threading
 from pathlib import Path
 import json
 from datetime import date
@@ -10,8 +11,6 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from langgraph.prebuilt import ToolNode
-
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
@@ -22,11 +21,16 @@ from tradingagents.agents.utils.agent_states import (
 )
 from tradingagents.dataflows.interface import set_config
 
+from .batch import PropagationBatch
 from .conditional_logic import ConditionalLogic
+from .fake_llm import FakeChatModel
+from .instrumentation import MetricsRegistry, instrument_tool, track
+from .llm_cache import CachedChatModel, get_llm_response_store
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .tool_node import ConcurrentToolNode
 
 
 class TradingAgentsGraph:
@@ -67,9 +71,34 @@ class TradingAgentsGraph:
         elif self.config["llm_provider"].lower() == "google":
             self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
             self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+        elif self.config["llm_provider"].lower() == "fake":
+            # scripted offline answers, for measuring the framework itself
+            fake_args = dict(
+                script=self.config.get("fake_llm_script", ()),
+                signal=self.config.get("fake_llm_signal"),
+                seed=self.config.get("fake_llm_seed", 0),
+            )
+            self.deep_thinking_llm = FakeChatModel(
+                self.config["deep_think_llm"], self.config.get("fake_deep_llm_latency"), **fake_args
+            )
+            self.quick_thinking_llm = FakeChatModel(
+                self.config["quick_think_llm"], self.config.get("fake_quick_llm_latency"), **fake_args
+            )
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
+
+        # Record / replay the chat models' responses
+        cache_mode = self.config.get("llm_cache_mode")
+        if cache_mode:
+            store = get_llm_response_store(self.config.get("llm_cache_path"))
+            provider = self.config["llm_provider"].lower()
+            self.deep_thinking_llm = CachedChatModel(
+                self.deep_thinking_llm, store, provider, self.config["deep_think_llm"], cache_mode
+            )
+            self.quick_thinking_llm = CachedChatModel(
+                self.quick_thinking_llm, store, provider, self.config["quick_think_llm"], cache_mode
+            )
+
         self.toolkit = Toolkit(config=self.config)
 
         # Initialize memories
@@ -79,6 +108,10 @@ class TradingAgentsGraph:
         self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
 
+        # Per-node and per-tool metrics of each run, summed up in metrics_registry
+        self.instrumented = self.config.get("run_metrics", False)
+        self.metrics_registry = MetricsRegistry()
+
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
@@ -95,6 +128,7 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            instrumented=self.instrumented,
         )
 
         self.propagator = Propagator()
@@ -105,53 +139,63 @@ class TradingAgentsGraph:
         self.curr_state = None
         self.ticker = None
         self.log_states_dict = {}  # date to full state dict
+        self._ticker_logs = {}  # ticker to its own date to full state dict
+        self._ticker_metrics = {}  # ticker to its own date to run metrics
+        self._log_lock = threading.Lock()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts, self.config.get("parallel_analysts", False)
+        )
+
+    def _create_tool_nodes(self) -> Dict[str, ConcurrentToolNode]:
+        """Create tool nodes for different data sources.
 
-    def _create_tool_nodes(self) -> Dict[str, ToolNode]:
-        """Create tool nodes for different data sources."""
+        The tool calls of one analyst turn run concurrently, at most
+        tool_max_concurrency at a time. When instrumented, the nodes run
+        copies of the Toolkit tools that record their calls in run_metrics.
+        """
+        max_concurrency = self.config.get("tool_max_concurrency", 4)
+        tools = {
+            "market": [
+                # online tools
+                self.toolkit.get_YFin_data_online,
+                self.toolkit.get_stockstats_indicators_report_online,
+                # offline tools
+                self.toolkit.get_YFin_data,
+                self.toolkit.get_stockstats_indicators_report,
+            ],
+            "social": [
+                # online tools
+                self.toolkit.get_stock_news_openai,
+                # offline tools
+                self.toolkit.get_reddit_stock_info,
+            ],
+            "news": [
+                # online tools
+                self.toolkit.get_global_news_openai,
+                self.toolkit.get_google_news,
+                # offline tools
+                self.toolkit.get_finnhub_news,
+                self.toolkit.get_reddit_news,
+            ],
+            "fundamentals": [
+                # online tools
+                self.toolkit.get_fundamentals_openai,
+                # offline tools
+                self.toolkit.get_finnhub_company_insider_sentiment,
+                self.toolkit.get_finnhub_company_insider_transactions,
+                self.toolkit.get_simfin_balance_sheet,
+                self.toolkit.get_simfin_cashflow,
+                self.toolkit.get_simfin_income_stmt,
+            ],
+        }
+        wrap = instrument_tool if self.instrumented else (lambda tool: tool)
         return {
-            "market": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_YFin_data_online,
-                    self.toolkit.get_stockstats_indicators_report_online,
-                    # offline tools
-                    self.toolkit.get_YFin_data,
-                    self.toolkit.get_stockstats_indicators_report,
-                ]
-            ),
-            "social": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_stock_news_openai,
-                    # offline tools
-                    self.toolkit.get_reddit_stock_info,
-                ]
-            ),
-            "news": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_global_news_openai,
-                    self.toolkit.get_google_news,
-                    # offline tools
-                    self.toolkit.get_finnhub_news,
-                    self.toolkit.get_reddit_news,
-                ]
-            ),
-            "fundamentals": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_fundamentals_openai,
-                    # offline tools
-                    self.toolkit.get_finnhub_company_insider_sentiment,
-                    self.toolkit.get_finnhub_company_insider_transactions,
-                    self.toolkit.get_simfin_balance_sheet,
-                    self.toolkit.get_simfin_cashflow,
-                    self.toolkit.get_simfin_income_stmt,
-                ]
-            ),
+            analyst: ConcurrentToolNode(
+                [wrap(tool) for tool in analyst_tools], max_concurrency=max_concurrency
+            )
+            for analyst, analyst_tools in tools.items()
         }
 
     def propagate(self, company_name, trade_date):
@@ -159,39 +203,135 @@ class TradingAgentsGraph:
 
         self.ticker = company_name
 
+        final_state = self._run_graph(company_name, trade_date)
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Log state
+        self._log_state(trade_date, final_state)
+
+        # Return decision and processed signal
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    def _run_graph(self, company_name, trade_date):
+        """Run the graph for one company and date and return its final state."""
+
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
         args = self.propagator.get_graph_args()
 
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        with track(company_name, trade_date) as run_metrics:
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+
+        return self._attach_metrics(final_state, run_metrics)
+
+    def _run_job(self, company_name, trade_date):
+        """One job of propagate_many: like propagate, without touching ticker or curr_state."""
+        final_state = self._run_graph(company_name, trade_date)
+        self._log_state(trade_date, final_state)
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    def propagate_many(
+        self, tickers, dates, max_concurrency=None, retries=None
+    ) -> PropagationBatch:
+        """Run the graph for every ticker on every date on a worker pool.
+
+        Returns a PropagationBatch: iterate it to run the jobs and get their
+        results as they complete, and call its stats() for progress and
+        throughput. The jobs share this graph's LLMs, memories and the
+        process-wide data caches, but each runs on its own state and leaves
+        ticker and curr_state alone; pass a result's final_state to
+        reflect_and_remember to reflect on it. A job that still fails after
+        its retries is recorded with its error and the batch carries on.
+        """
+        return PropagationBatch(
+            self._run_job,
+            tickers,
+            dates,
+            max_concurrency=max_concurrency or self.config.get("batch_max_concurrency", 4),
+            retries=self.config.get("batch_retries", 1) if retries is None else retries,
+            retry_delay=self.config.get("batch_retry_delay", 1.0),
+        )
+
+    async def apropagate(self, company_name, trade_date):
+        """Async version of propagate.
+
+        The graph runs with ainvoke / astream and every agent awaits its LLM
+        and memory calls, so one event loop can drive many analyses at once,
+        e.g. with asyncio.gather. The state used by reflect_and_remember is
+        the one of the analysis that finished last.
+        """
+
+        # Initialize state
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+
+        with track(company_name, trade_date) as run_metrics:
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                async for chunk in self.graph.astream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = await self.graph.ainvoke(init_agent_state, **args)
+        final_state = self._attach_metrics(final_state, run_metrics)
 
         # Store current state for reflection
+        self.ticker = company_name
         self.curr_state = final_state
 
         # Log state
         self._log_state(trade_date, final_state)
 
         # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state, await self.signal_processor.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+
+    def _attach_metrics(self, final_state, run_metrics):
+        """Add the run's metrics to its final state and to the registry."""
+        if not self.instrumented:
+            return final_state
+        final_state["run_metrics"] = run_metrics.to_dict()
+        self.metrics_registry.add(final_state["run_metrics"])
+        prometheus_path = self.config.get("prometheus_metrics_path")
+        if prometheus_path:
+            self.metrics_registry.write_prometheus(prometheus_path)
+        return final_state
+
+    def prometheus_metrics(self) -> str:
+        """The metrics of every run so far, in the Prometheus text format."""
+        return self.metrics_registry.prometheus_text()
 
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Log the final state to the JSON file of its ticker."""
+        ticker = final_state["company_of_interest"]
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -220,33 +360,49 @@ class TradingAgentsGraph:
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
         }
+        self.log_states_dict[str(trade_date)] = entry
+
+        with self._log_lock:
+            ticker_log = self._ticker_logs.setdefault(ticker, {})
+            ticker_log[str(trade_date)] = entry
+
+            # Save to file
+            directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+            directory.mkdir(parents=True, exist_ok=True)
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log.json",
+                "w",
+            ) as f:
+                json.dump(ticker_log, f, indent=4)
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            if "run_metrics" in final_state:
+                ticker_metrics = self._ticker_metrics.setdefault(ticker, {})
+                ticker_metrics[str(trade_date)] = final_state["run_metrics"]
+                with open(directory / "run_metrics.json", "w") as f:
+                    json.dump(ticker_metrics, f, indent=4)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
+    def reflect_and_remember(self, returns_losses, state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        Reflects on state if given (e.g. a propagate_many result's
+        final_state), otherwise on the state of the last propagate.
+        """
+        state = state if state is not None else self.curr_state
         self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
+            state, returns_losses, self.bull_memory
         )
         self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
+            state, returns_losses, self.bear_memory
         )
         self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
+            state, returns_losses, self.trader_memory
         )
         self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
+            state, returns_losses, self.invest_judge_memory
         )
         self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+            state, returns_losses, self.risk_manager_memory
         )
 
     def process_signal(self, full_signal):